@@ -0,0 +1,114 @@
+"""Compare the rolling window tracker with the previous tuple-deque version.
+
+Reports per-event latency (record plus compute at 100 events/sec) and memory
+per stored event, plus the bucketed tracker's fixed footprint for a 7-day
+window. Run from the repository root::
+
+    python -m benchmarks.bench_rolling_window
+"""
+
+from __future__ import annotations
+
+import time
+import tracemalloc
+from collections import deque
+from datetime import UTC, datetime, timedelta
+
+from custom_components.mindml.rolling_window import (
+    BucketedRollingWindowTracker,
+    RollingWindowTracker,
+)
+
+EVENTS_PER_SECOND = 100
+WINDOW_HOURS = 1.0
+MEASURED_EVENTS = 2000
+LONG_WINDOW_HOURS = 168.0
+BUCKET_SECONDS = 60.0
+
+
+class _DequeTracker:
+    """The previous strategy: datetime tuples in a deque, walked per compute."""
+
+    def __init__(self, *, window_hours: float) -> None:
+        self._window = timedelta(hours=window_hours)
+        self._events: deque[tuple[datetime, str, str]] = deque()
+
+    def record_event(self, entity_id: str, state: str, timestamp: datetime | None = None) -> None:
+        self._events.append((timestamp or datetime.now(UTC), entity_id, state))
+
+    def compute_features(self, required_features: list[str]) -> dict[str, float]:
+        cutoff = datetime.now(UTC) - self._window
+        while self._events and self._events[0][0] < cutoff:
+            self._events.popleft()
+        event_count = len(self._events)
+        on_count = sum(1 for _, _, state in self._events if state == "on")
+        return {
+            "event_count": float(event_count),
+            "on_ratio": float(on_count / event_count) if event_count else 0.0,
+        }
+
+
+def _timestamps() -> list[datetime]:
+    """Almost a full window of events; the margin keeps the benchmark from pruning."""
+    count = int((WINDOW_HOURS * 3600 - 60) * EVENTS_PER_SECOND)
+    start = datetime.now(UTC) - timedelta(hours=WINDOW_HOURS, seconds=-60)
+    step = timedelta(seconds=1 / EVENTS_PER_SECOND)
+    return [start + step * index for index in range(count)]
+
+
+def _fill(tracker, timestamps: list[datetime]) -> int:
+    """Record one event per timestamp; returns the traced bytes allocated."""
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    for index, timestamp in enumerate(timestamps):
+        # Each stored datetime is a fresh object, as with datetime.now().
+        timestamp = timestamp + timedelta(0)
+        tracker.record_event("binary_sensor.motion", "on" if index % 2 else "off", timestamp)
+    used = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return used
+
+
+def _us_per_event(tracker) -> float:
+    start = time.perf_counter()
+    for index in range(MEASURED_EVENTS):
+        tracker.record_event("binary_sensor.motion", "on" if index % 2 else "off")
+        tracker.compute_features(["event_count", "on_ratio"])
+    return (time.perf_counter() - start) * 1_000_000 / MEASURED_EVENTS
+
+
+def main() -> None:
+    tracker = RollingWindowTracker(window_hours=WINDOW_HOURS)
+    legacy = _DequeTracker(window_hours=WINDOW_HOURS)
+    timestamps = _timestamps()
+    tracker_bytes = _fill(tracker, timestamps)
+    legacy_bytes = _fill(legacy, timestamps)
+    events = tracker.event_count
+    print(f"events_per_second={EVENTS_PER_SECOND} window_events={events}")
+    assert tracker.compute_features([]) == legacy.compute_features([])
+    running_us = _us_per_event(tracker)
+    walk_us = _us_per_event(legacy)
+    print(
+        f"running_us={running_us:.2f} full_walk_us={walk_us:.2f} "
+        f"speedup={walk_us / running_us:.1f}x"
+    )
+    print(
+        f"bytes_per_event={tracker_bytes / events:.1f} "
+        f"deque_bytes_per_event={legacy_bytes / events:.1f}"
+    )
+    bucketed = BucketedRollingWindowTracker(
+        window_hours=LONG_WINDOW_HOURS, bucket_seconds=BUCKET_SECONDS
+    )
+    bucketed_bytes = _fill(bucketed, timestamps)
+    ring_bytes = bucketed._totals.itemsize * len(bucketed._totals) * 2
+    print(
+        f"bucketed_{LONG_WINDOW_HOURS:g}h_ring_bytes={ring_bytes} "
+        f"fill_growth_bytes={bucketed_bytes} "
+        f"exact_{LONG_WINDOW_HOURS:g}h_estimate_bytes="
+        f"{tracker_bytes / events * EVENTS_PER_SECOND * LONG_WINDOW_HOURS * 3600:.0f} "
+        f"bucketed_us={_us_per_event(bucketed):.2f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""Compare the filtered snapshot query with a full scan of the snapshot view.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_snapshot_query
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import tempfile
+import time
+from pathlib import Path
+
+from custom_components.mindml.db_connections import close_connection_manager
+from custom_components.mindml.feature_provider import SqliteSnapshotFeatureProvider
+from custom_components.mindml.model import parse_float
+
+NUM_SNAPSHOT_ROWS = 100_000
+REQUIRED_FEATURE_COUNTS = (20, 2000)
+REPEATS = 20
+
+
+def _create_snapshot_db(db_path: Path) -> None:
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executescript(
+            """
+            CREATE TABLE features (
+                feature_name TEXT PRIMARY KEY,
+                feature_value TEXT NOT NULL
+            );
+            CREATE VIEW vw_latest_feature_snapshot AS
+            SELECT feature_name, feature_value FROM features;
+            """
+        )
+        conn.executemany(
+            "INSERT INTO features(feature_name, feature_value) VALUES (?, ?)",
+            ((f"feature_{index}", str(index * 0.5)) for index in range(NUM_SNAPSHOT_ROWS)),
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def _full_scan(db_path: Path, required_features: list[str]) -> dict[str, float]:
+    """The previous strategy: read and parse every row, then pick the required ones."""
+    conn = sqlite3.connect(db_path)
+    try:
+        rows = conn.execute(
+            "SELECT feature_name, feature_value FROM vw_latest_feature_snapshot"
+        ).fetchall()
+    finally:
+        conn.close()
+    values_by_name: dict[str, float] = {}
+    for feature_name, feature_value in rows:
+        parsed = parse_float(feature_value)
+        if parsed is not None:
+            values_by_name[str(feature_name)] = parsed
+    return {name: values_by_name[name] for name in required_features if name in values_by_name}
+
+
+def _uncached_load(provider: SqliteSnapshotFeatureProvider) -> None:
+    """Forget the last seen data_version so the shared coordinator re-queries."""
+    provider._coordinator._watcher.close()
+    provider.load()
+
+
+def _ms_per_call(fn) -> float:
+    start = time.perf_counter()
+    for _ in range(REPEATS):
+        fn()
+    return (time.perf_counter() - start) * 1000.0 / REPEATS
+
+
+def main() -> None:
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        db_path = Path(tmp_dir) / "snapshot.db"
+        _create_snapshot_db(db_path)
+        print(f"snapshot_rows={NUM_SNAPSHOT_ROWS}")
+        for count in REQUIRED_FEATURE_COUNTS:
+            step = NUM_SNAPSHOT_ROWS // count
+            required = [f"feature_{index}" for index in range(0, NUM_SNAPSHOT_ROWS, step)][:count]
+            provider = SqliteSnapshotFeatureProvider(
+                db_path=str(db_path),
+                snapshot_view="vw_latest_feature_snapshot",
+                required_features=required,
+            )
+            assert provider.load().feature_values == _full_scan(db_path, required)
+            cached_ms = _ms_per_call(provider.load)
+            filtered_ms = _ms_per_call(lambda: _uncached_load(provider))
+            full_ms = _ms_per_call(lambda: _full_scan(db_path, required))
+            provider.close()
+            print(
+                f"required={count}: filtered_ms={filtered_ms:.2f} "
+                f"full_scan_ms={full_ms:.2f} speedup={full_ms / filtered_ms:.1f}x "
+                f"unchanged_db_ms={cached_ms:.3f}"
+            )
+        close_connection_manager(str(db_path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""Compare the native tree evaluator with lightgbm.Booster on a synthetic model.
+
+Run from the repository root::
+
+    python -m benchmarks.bench_tree_ensemble
+"""
+
+from __future__ import annotations
+
+import time
+
+import lightgbm
+import numpy as np
+
+from custom_components.mindml.tree_ensemble import TreeEnsemble
+
+NUM_FEATURES = 40
+NUM_TREES = 500
+NUM_ROWS = 200
+
+
+def _train_model() -> lightgbm.Booster:
+    rng = np.random.default_rng(0)
+    features = rng.normal(size=(5000, NUM_FEATURES))
+    features[rng.random(features.shape) < 0.05] = np.nan
+    labels = (np.nan_to_num(features[:, :5]).sum(axis=1) > 0).astype(int)
+    return lightgbm.train(
+        {"objective": "binary", "num_leaves": 31, "verbose": -1},
+        lightgbm.Dataset(features, labels),
+        num_boost_round=NUM_TREES,
+    )
+
+
+def _per_row_ms(fn, rows) -> float:
+    start = time.perf_counter()
+    for row in rows:
+        fn(row)
+    return (time.perf_counter() - start) * 1000.0 / len(rows)
+
+
+def main() -> None:
+    booster = _train_model()
+    model_str = booster.model_to_string()
+    start = time.perf_counter()
+    ensemble = TreeEnsemble.from_model_str(model_str=model_str)
+    parse_ms = (time.perf_counter() - start) * 1000.0
+
+    rows = np.random.default_rng(1).normal(size=(NUM_ROWS, NUM_FEATURES))
+    row_lists = rows.tolist()
+
+    max_error = max(
+        abs(ensemble.predict_raw_row(row) - expected)
+        for row, expected in zip(row_lists, booster.predict(rows, raw_score=True))
+    )
+    assert max_error < 1e-9, max_error
+
+    print(f"trees={ensemble.num_trees} features={NUM_FEATURES} parse_ms={parse_ms:.1f}")
+    print(f"max_abs_raw_error={max_error:.3e}")
+    print(
+        "raw_score per-row ms: "
+        f"booster={_per_row_ms(lambda row: booster.predict([row], raw_score=True), row_lists):.3f} "
+        f"native={_per_row_ms(ensemble.predict_raw_row, row_lists):.3f}"
+    )
+    contrib_rows = row_lists[:20]
+    print(
+        "pred_contrib per-row ms: "
+        f"booster={_per_row_ms(lambda row: booster.predict([row], pred_contrib=True), contrib_rows):.3f} "
+        f"native={_per_row_ms(ensemble.predict_contrib_row, contrib_rows):.3f}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,7 @@ if TYPE_CHECKING:
     from homeassistant.core import HomeAssistant
 
 from .const import DOMAIN, PLATFORMS
+from .db_connections import close_connection_manager
 
 
 async def async_setup(hass: Any, config: dict) -> bool:
@@ -28,5 +29,13 @@ async def async_unload_entry(hass: Any, entry: Any) -> bool:
     """Unload an entry."""
     unloaded = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
     if unloaded:
-        hass.data.get(DOMAIN, {}).pop(entry.entry_id, None)
+        domain_data = hass.data.get(DOMAIN, {})
+        entry_data = domain_data.pop(entry.entry_id, None)
+        db_path = entry_data.get("ml_db_path") if isinstance(entry_data, dict) else None
+        still_used = any(
+            isinstance(other, dict) and other.get("ml_db_path") == db_path
+            for other in domain_data.values()
+        )
+        if db_path and not still_used:
+            close_connection_manager(db_path)
     return unloaded
@@ -13,6 +13,9 @@ from homeassistant.helpers import selector
 
 from .const import (
     CONF_BED_PRESENCE_ENTITY,
+    CONF_CONTRIBUTIONS_EVERY_N,
+    CONF_CONTRIBUTIONS_MIN_INTERVAL,
+    CONF_ROLLING_WINDOW_BUCKET_SECONDS,
     CONF_ROLLING_WINDOW_HOURS,
     CONF_FEATURE_TYPES,
     CONF_FEATURE_STATES,
@@ -25,7 +28,10 @@ from .const import (
     CONF_REQUIRED_FEATURES,
     CONF_STATE_MAPPINGS,
     CONF_THRESHOLD,
+    DEFAULT_CONTRIBUTIONS_EVERY_N,
+    DEFAULT_CONTRIBUTIONS_MIN_INTERVAL,
     DEFAULT_GOAL,
+    DEFAULT_ROLLING_WINDOW_BUCKET_SECONDS,
     DEFAULT_ROLLING_WINDOW_HOURS,
     DEFAULT_ML_ARTIFACT_VIEW,
     DEFAULT_ML_FEATURE_SOURCE,
@@ -339,6 +345,11 @@ class ClrOptionsFlow(config_entries.OptionsFlow):
             CONF_ROLLING_WINDOW_HOURS: float(
                 self._existing_value(CONF_ROLLING_WINDOW_HOURS, DEFAULT_ROLLING_WINDOW_HOURS)
             ),
+            CONF_ROLLING_WINDOW_BUCKET_SECONDS: float(
+                self._existing_value(
+                    CONF_ROLLING_WINDOW_BUCKET_SECONDS, DEFAULT_ROLLING_WINDOW_BUCKET_SECONDS
+                )
+            ),
         }
         merged.update(dict(self._config_entry.options))
         merged.update(updates)
@@ -467,6 +478,18 @@ class ClrOptionsFlow(config_entries.OptionsFlow):
                         CONF_ROLLING_WINDOW_HOURS: float(
                             user_input.get(CONF_ROLLING_WINDOW_HOURS, DEFAULT_ROLLING_WINDOW_HOURS)
                         ),
+                        CONF_ROLLING_WINDOW_BUCKET_SECONDS: max(
+                            float(
+                                user_input.get(
+                                    CONF_ROLLING_WINDOW_BUCKET_SECONDS,
+                                    self._existing_value(
+                                        CONF_ROLLING_WINDOW_BUCKET_SECONDS,
+                                        DEFAULT_ROLLING_WINDOW_BUCKET_SECONDS,
+                                    ),
+                                )
+                            ),
+                            0.0,
+                        ),
                     }
                 ),
             )
@@ -505,6 +528,14 @@ class ClrOptionsFlow(config_entries.OptionsFlow):
                         CONF_ROLLING_WINDOW_HOURS,
                         default=float(self._existing_value(CONF_ROLLING_WINDOW_HOURS, DEFAULT_ROLLING_WINDOW_HOURS)),
                     ): vol.Coerce(float),
+                    vol.Optional(
+                        CONF_ROLLING_WINDOW_BUCKET_SECONDS,
+                        default=float(
+                            self._existing_value(
+                                CONF_ROLLING_WINDOW_BUCKET_SECONDS, DEFAULT_ROLLING_WINDOW_BUCKET_SECONDS
+                            )
+                        ),
+                    ): vol.Coerce(float),
                 }
             ),
         )
@@ -513,7 +544,25 @@ class ClrOptionsFlow(config_entries.OptionsFlow):
         if user_input is not None:
             return self.async_create_entry(
                 title="",
-                data=self._merged_options({CONF_THRESHOLD: float(user_input[CONF_THRESHOLD])}),
+                data=self._merged_options(
+                    {
+                        CONF_THRESHOLD: float(user_input[CONF_THRESHOLD]),
+                        CONF_CONTRIBUTIONS_EVERY_N: int(
+                            user_input.get(
+                                CONF_CONTRIBUTIONS_EVERY_N,
+                                self._existing_value(CONF_CONTRIBUTIONS_EVERY_N, DEFAULT_CONTRIBUTIONS_EVERY_N),
+                            )
+                        ),
+                        CONF_CONTRIBUTIONS_MIN_INTERVAL: float(
+                            user_input.get(
+                                CONF_CONTRIBUTIONS_MIN_INTERVAL,
+                                self._existing_value(
+                                    CONF_CONTRIBUTIONS_MIN_INTERVAL, DEFAULT_CONTRIBUTIONS_MIN_INTERVAL
+                                ),
+                            )
+                        ),
+                    }
+                ),
             )
 
         default_threshold = self._config_entry.options.get(
@@ -522,7 +571,25 @@ class ClrOptionsFlow(config_entries.OptionsFlow):
         )
         return self.async_show_form(
             step_id="decision",
-            data_schema=vol.Schema({vol.Required(CONF_THRESHOLD, default=default_threshold): vol.Coerce(float)}),
+            data_schema=vol.Schema(
+                {
+                    vol.Required(CONF_THRESHOLD, default=default_threshold): vol.Coerce(float),
+                    vol.Optional(
+                        CONF_CONTRIBUTIONS_EVERY_N,
+                        default=int(
+                            self._existing_value(CONF_CONTRIBUTIONS_EVERY_N, DEFAULT_CONTRIBUTIONS_EVERY_N)
+                        ),
+                    ): vol.All(vol.Coerce(int), vol.Range(min=0)),
+                    vol.Optional(
+                        CONF_CONTRIBUTIONS_MIN_INTERVAL,
+                        default=float(
+                            self._existing_value(
+                                CONF_CONTRIBUTIONS_MIN_INTERVAL, DEFAULT_CONTRIBUTIONS_MIN_INTERVAL
+                            )
+                        ),
+                    ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                }
+            ),
         )
 
     async def async_step_features(self, user_input: dict[str, Any] | None = None) -> FlowResult:
@@ -18,6 +18,9 @@ CONF_ML_FEATURE_SOURCE = "ml_feature_source"
 CONF_ML_FEATURE_VIEW = "ml_feature_view"
 CONF_BED_PRESENCE_ENTITY = "bed_presence_entity"
 CONF_ROLLING_WINDOW_HOURS = "rolling_window_hours"
+CONF_ROLLING_WINDOW_BUCKET_SECONDS = "rolling_window_bucket_seconds"
+CONF_CONTRIBUTIONS_EVERY_N = "contributions_every_n"
+CONF_CONTRIBUTIONS_MIN_INTERVAL = "contributions_min_interval_seconds"
 
 DEFAULT_ML_ARTIFACT_VIEW = "vw_lightgbm_latest_model_artifact"
 DEFAULT_ML_FEATURE_SOURCE = "hass_state"
@@ -28,3 +31,13 @@ DEFAULT_ML_DB_PATH = "/config/appdaemon/ha_ml_data_layer.db"
 DEFAULT_GOAL = "risk"
 DEFAULT_THRESHOLD = 50.0
 DEFAULT_ROLLING_WINDOW_HOURS = 7.0
+# 0 keeps every event; a positive value counts events in buckets of that size.
+DEFAULT_ROLLING_WINDOW_BUCKET_SECONDS = 0.0
+DEFAULT_CONTRIBUTIONS_EVERY_N = 0
+DEFAULT_CONTRIBUTIONS_MIN_INTERVAL = 60.0
+
+MODEL_RELOAD_CHECK_INTERVAL_SECONDS = 60
+SNAPSHOT_WATCH_DEBOUNCE_SECONDS = 0.5
+ROLLING_WINDOW_STORAGE_VERSION = 1
+ROLLING_WINDOW_CHECKPOINT_SECONDS = 300
+ENTITY_TIMING_REFRESH_SECONDS = 60
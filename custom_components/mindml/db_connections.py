@@ -0,0 +1,158 @@
+"""Shared long-lived SQLite connections for the ML data-layer database."""
+
+from __future__ import annotations
+
+import os
+import sqlite3
+import threading
+from collections.abc import Iterator
+from contextlib import contextmanager
+from pathlib import Path
+from urllib.parse import quote
+
+_MMAP_SIZE_BYTES = 256 * 1024 * 1024
+_MAX_IDLE_READERS = 4
+
+
+def open_readonly_connection(db_path: str) -> sqlite3.Connection:
+    """Open a read-only connection; never creates the database file."""
+    conn = sqlite3.connect(
+        f"file:{quote(db_path)}?mode=ro",
+        uri=True,
+        check_same_thread=False,
+    )
+    conn.row_factory = sqlite3.Row
+    conn.execute(f"PRAGMA mmap_size = {_MMAP_SIZE_BYTES}")
+    conn.execute("PRAGMA query_only = ON")
+    return conn
+
+
+class DataVersionWatcher:
+    """Report whether another connection committed since the previous check.
+
+    ``PRAGMA data_version`` is only meaningful per connection, so the watcher
+    keeps its own long-lived read-only connection outside the pool.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self._db_path = db_path
+        self._conn: sqlite3.Connection | None = None
+        self._data_version: int | None = None
+
+    def changed(self) -> bool:
+        """Return ``True`` on the first call, after commits, and when unsure."""
+        try:
+            if self._conn is None:
+                self._conn = open_readonly_connection(self._db_path)
+            data_version = int(self._conn.execute("PRAGMA data_version").fetchone()[0])
+        except sqlite3.Error:
+            self.close()
+            return True
+        changed = data_version != self._data_version
+        self._data_version = data_version
+        return changed
+
+    def close(self) -> None:
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+        self._data_version = None
+
+
+class SqliteConnectionManager:
+    """Pool of read-only connections plus one serialized writer for a database.
+
+    Connections are opened lazily and reused across executor threads, so the
+    schema is parsed once per connection rather than once per query. A
+    checked-out reader is used by one thread at a time.
+    """
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self._lock = threading.Lock()
+        self._idle_readers: list[sqlite3.Connection] = []
+        self._writer: sqlite3.Connection | None = None
+        self._writer_lock = threading.Lock()
+        self._generation = 0
+
+    @contextmanager
+    def read(self) -> Iterator[sqlite3.Connection]:
+        """Check out a read-only connection for the duration of the block."""
+        with self._lock:
+            conn = self._idle_readers.pop() if self._idle_readers else None
+            generation = self._generation
+        if conn is None:
+            conn = open_readonly_connection(self.db_path)
+        try:
+            yield conn
+        finally:
+            self._release_reader(conn, generation)
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """Run the block on the single writer connection and commit it."""
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = sqlite3.connect(
+                    f"file:{quote(self.db_path)}?mode=rw",
+                    uri=True,
+                    check_same_thread=False,
+                )
+            conn = self._writer
+            try:
+                yield conn
+                conn.commit()
+            except BaseException:
+                conn.rollback()
+                raise
+
+    def close(self) -> None:
+        """Close idle readers and the writer; checked-out readers close on return."""
+        with self._lock:
+            readers, self._idle_readers = self._idle_readers, []
+            self._generation += 1
+        for conn in readers:
+            conn.close()
+        with self._writer_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def _release_reader(self, conn: sqlite3.Connection, generation: int) -> None:
+        with self._lock:
+            if generation == self._generation and len(self._idle_readers) < _MAX_IDLE_READERS:
+                self._idle_readers.append(conn)
+                return
+        conn.close()
+
+
+_MANAGERS: dict[str, SqliteConnectionManager] = {}
+_MANAGERS_LOCK = threading.Lock()
+
+
+def _resolve(db_path: str) -> str:
+    return os.path.realpath(db_path)
+
+
+def get_connection_manager(db_path: str) -> SqliteConnectionManager:
+    """Return the process-wide connection manager for ``db_path``.
+
+    Raises ``FileNotFoundError`` when the database does not exist, so callers
+    keep their existing missing-database handling.
+    """
+    if not Path(db_path).exists():
+        raise FileNotFoundError(db_path)
+    key = _resolve(db_path)
+    with _MANAGERS_LOCK:
+        manager = _MANAGERS.get(key)
+        if manager is None:
+            manager = _MANAGERS[key] = SqliteConnectionManager(key)
+        return manager
+
+
+def close_connection_manager(db_path: str) -> None:
+    """Close and forget the connections held for ``db_path``."""
+    with _MANAGERS_LOCK:
+        manager = _MANAGERS.pop(_resolve(db_path), None)
+    if manager is not None:
+        manager.close()
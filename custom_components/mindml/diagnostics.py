@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from dataclasses import asdict
 from typing import Any
 
 try:
@@ -10,6 +11,7 @@ except Exception:  # pragma: no cover - unit-test fallback
     async_redact_data = None
 
 from .const import CONF_ML_DB_PATH, DOMAIN
+from .lightgbm_inference import booster_cache_stats
 
 REDACTED = "**REDACTED**"
 SENSITIVE_KEYS = {CONF_ML_DB_PATH}
@@ -53,5 +55,6 @@ async def async_get_config_entry_diagnostics(hass: Any, config_entry: Any) -> di
             "options": options_data,
         },
         "runtime": runtime_data,
+        "booster_cache": asdict(booster_cache_stats()),
         "integration_data_keys": sorted(entry_store.keys()),
     }
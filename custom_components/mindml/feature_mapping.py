@@ -3,7 +3,8 @@
 from __future__ import annotations
 
 import json
-from typing import Final
+import sys
+from typing import Callable, Final
 
 from .model import parse_float
 
@@ -22,6 +23,12 @@ _KNOWN_STATE_MAPPINGS: Final[dict[str, dict[str, float]]] = {
     "open": {"open": 1.0, "closed": 0.0},
     "closed": {"open": 1.0, "closed": 0.0},
 }
+_KNOWN_STATE_VALUES: Final[dict[str, float]] = {
+    state: mapping[state] for state, mapping in _KNOWN_STATE_MAPPINGS.items()
+}
+_ENCODER_MEMO_SIZE: Final = 256
+
+StateEncoder = Callable[[str], tuple[float | None, str | None]]
 
 
 def parse_required_features(raw: object) -> list[str]:
@@ -162,3 +169,47 @@ def infer_state_mappings_from_states(
         if normalized in _KNOWN_STATE_MAPPINGS:
             mappings[entity_id] = dict(_KNOWN_STATE_MAPPINGS[normalized])
     return mappings
+
+
+def compile_state_encoder(
+    feature_type: str,
+    state_mapping: dict[str, float] | None = None,
+) -> StateEncoder:
+    """Build the encoder for one entity's raw state strings.
+
+    The encoder returns ``(encoded, mapped_from)`` exactly like the former
+    per-call path: numeric text always parses, categorical states go through
+    the entity's table and then the known on/off style defaults. Results are
+    memoized by raw state, so a repeated state costs one dict lookup.
+    """
+    memo: dict[str, tuple[float | None, str | None]] = {}
+
+    if feature_type != FEATURE_TYPE_CATEGORICAL:
+        def _encode_uncached(raw_state: str) -> tuple[float | None, str | None]:
+            return parse_float(raw_state), None
+    else:
+        table = {
+            str(name).casefold(): float(value) for name, value in (state_mapping or {}).items()
+        }
+        lookup = {**_KNOWN_STATE_VALUES, **table}
+
+        def _encode_uncached(raw_state: str) -> tuple[float | None, str | None]:
+            parsed = parse_float(raw_state)
+            if parsed is not None:
+                return parsed, None
+            encoded = lookup.get(raw_state.casefold())
+            if encoded is None:
+                return None, None
+            return encoded, raw_state
+
+    def _encode(raw_state: str) -> tuple[float | None, str | None]:
+        cached = memo.get(raw_state)
+        if cached is not None:
+            return cached
+        result = _encode_uncached(raw_state)
+        if len(memo) >= _ENCODER_MEMO_SIZE:
+            memo.clear()
+        memo[sys.intern(raw_state)] = result
+        return result
+
+    return _encode
@@ -2,14 +2,15 @@
 
 from __future__ import annotations
 
-import sqlite3
+from array import array
 from dataclasses import dataclass
 from pathlib import Path
 import re
-from typing import Any, Callable
+import threading
+from typing import Any, Callable, Collection, Mapping
 
-from .feature_mapping import FEATURE_TYPE_CATEGORICAL, infer_state_mappings_from_states
-from .model import parse_float
+from .feature_mapping import FEATURE_TYPE_NUMERIC, StateEncoder, compile_state_encoder
+from .snapshot_coordinator import acquire_snapshot_coordinator, release_snapshot_coordinator
 
 
 @dataclass(slots=True)
@@ -19,6 +20,41 @@ class FeatureVectorResult:
     feature_values: dict[str, float]
     missing_features: list[str]
     mapped_state_values: dict[str, str]
+    ordered_row: array | None = None
+
+
+class FeaturePlan:
+    """Column layout compiled once per model for building the ordered input row.
+
+    Providers write encoded values straight into the preallocated ``row``
+    buffer by column index, so inference never re-resolves feature names.
+    Columns the providers do not write stay at ``0.0``, matching the
+    inference default for absent features.
+    """
+
+    __slots__ = ("feature_names", "_columns", "_zeros", "row")
+
+    def __init__(self, feature_names: list[str]) -> None:
+        self.feature_names = tuple(feature_names)
+        columns: dict[str, list[int]] = {}
+        for index, feature_name in enumerate(self.feature_names):
+            columns.setdefault(feature_name, []).append(index)
+        self._columns = {name: tuple(indexes) for name, indexes in columns.items()}
+        self._zeros = array("d", bytes(8 * len(self.feature_names)))
+        self.row = array("d", self._zeros)
+
+    def reset(self) -> array:
+        """Zero the row buffer in place and return it."""
+        self.row[:] = self._zeros
+        return self.row
+
+    def columns(self, feature_name: str) -> tuple[int, ...]:
+        return self._columns.get(feature_name, ())
+
+    def write(self, feature_name: str, value: float) -> None:
+        row = self.row
+        for index in self._columns.get(feature_name, ()):
+            row[index] = value
 
 
 class HassStateFeatureProvider:
@@ -31,59 +67,88 @@ class HassStateFeatureProvider:
         required_features: list[str],
         feature_types: dict[str, str],
         state_mappings: dict[str, dict[str, float]],
+        feature_plan: FeaturePlan | None = None,
     ) -> None:
         self._hass = hass
+        self._feature_plan = feature_plan
         self._required_features = list(required_features)
-        self._feature_types = dict(feature_types)
-        self._state_mappings = {
-            entity_id: {str(name).casefold(): float(value) for name, value in mapping.items()}
-            for entity_id, mapping in state_mappings.items()
+        self._encoders: dict[str, StateEncoder] = {
+            entity_id: compile_state_encoder(
+                feature_types.get(entity_id, FEATURE_TYPE_NUMERIC),
+                state_mappings.get(entity_id),
+            )
+            for entity_id in self._required_features
         }
+        self._required_set = frozenset(self._required_features)
+        self._feature_values: dict[str, float] = {}
+        self._mapped_state_values: dict[str, str] = {}
+        self._missing_set: set[str] = set()
+        self._missing: list[str] = []
+        self._primed = False
 
-    def _encoded_feature_value(self, entity_id: str, raw_state: str) -> tuple[float | None, str | None]:
-        parsed = parse_float(raw_state)
-        if parsed is not None:
-            return parsed, None
-
-        feature_type = self._feature_types.get(entity_id, "numeric")
-        if feature_type != FEATURE_TYPE_CATEGORICAL:
-            return None, None
+    def load(self, changed_features: Collection[str] | None = None) -> FeatureVectorResult:
+        """Return the encoded vector, re-reading only ``changed_features`` when given.
 
-        normalized_state = raw_state.casefold()
-        encoded = self._state_mappings.get(entity_id, {}).get(normalized_state)
-        if encoded is not None:
-            return encoded, raw_state
+        The encoded values, mapped states and missing set persist between
+        loads; ``None`` re-reads every required entity.
+        """
+        if changed_features is None or not self._primed:
+            self._load_all()
+        else:
+            missing_changed = False
+            for entity_id in changed_features:
+                if entity_id in self._required_set:
+                    missing_changed |= self._update_feature(entity_id)
+            if missing_changed:
+                self._missing = [
+                    feature for feature in self._required_features if feature in self._missing_set
+                ]
 
-        inferred = infer_state_mappings_from_states({entity_id: raw_state})
-        inferred_encoded = inferred.get(entity_id, {}).get(normalized_state)
-        if inferred_encoded is None:
-            return None, None
-        return inferred_encoded, raw_state
-
-    def load(self) -> FeatureVectorResult:
-        feature_values: dict[str, float] = {}
-        missing: list[str] = []
-        mapped_state_values: dict[str, str] = {}
+        return FeatureVectorResult(
+            feature_values=self._feature_values,
+            missing_features=self._missing,
+            mapped_state_values=self._mapped_state_values,
+            ordered_row=self._feature_plan.row if self._feature_plan is not None else None,
+        )
 
+    def _load_all(self) -> None:
+        self._feature_values = {}
+        self._mapped_state_values = {}
+        self._missing_set = set()
+        if self._feature_plan is not None:
+            self._feature_plan.reset()
         for entity_id in self._required_features:
-            state = self._hass.states.get(entity_id)
-            if state is None:
-                missing.append(entity_id)
-                continue
-
-            encoded, mapped_from = self._encoded_feature_value(entity_id, state.state)
-            if encoded is None:
-                missing.append(entity_id)
-                continue
-            feature_values[entity_id] = encoded
-            if mapped_from is not None:
-                mapped_state_values[entity_id] = mapped_from
+            self._update_feature(entity_id)
+        self._missing = [
+            feature for feature in self._required_features if feature in self._missing_set
+        ]
+        self._primed = True
 
-        return FeatureVectorResult(
-            feature_values=feature_values,
-            missing_features=missing,
-            mapped_state_values=mapped_state_values,
+    def _update_feature(self, entity_id: str) -> bool:
+        """Re-encode one entity; returns whether its missing status flipped."""
+        state = self._hass.states.get(entity_id)
+        encoded, mapped_from = (
+            (None, None) if state is None else self._encoders[entity_id](state.state)
         )
+        plan = self._feature_plan
+        was_missing = entity_id in self._missing_set
+        if encoded is None:
+            self._feature_values.pop(entity_id, None)
+            self._mapped_state_values.pop(entity_id, None)
+            self._missing_set.add(entity_id)
+            if plan is not None:
+                plan.write(entity_id, 0.0)
+            return not was_missing
+
+        self._feature_values[entity_id] = encoded
+        if mapped_from is None:
+            self._mapped_state_values.pop(entity_id, None)
+        else:
+            self._mapped_state_values[entity_id] = mapped_from
+        self._missing_set.discard(entity_id)
+        if plan is not None:
+            plan.write(entity_id, encoded)
+        return was_missing
 
 
 class SqliteSnapshotFeatureProvider:
@@ -95,12 +160,22 @@ class SqliteSnapshotFeatureProvider:
         db_path: str,
         snapshot_view: str,
         required_features: list[str],
+        feature_plan: FeaturePlan | None = None,
     ) -> None:
         self._db_path = db_path
         self._snapshot_view = snapshot_view
         self._required_features = list(required_features)
+        self._feature_plan = feature_plan
+        self._coordinator = acquire_snapshot_coordinator(
+            db_path, snapshot_view, self._required_features
+        )
+        self._last_values: Mapping[str, float] | None = None
+        self._last_result: FeatureVectorResult | None = None
+        # Polls and file-watch refreshes may overlap in the executor.
+        self._lock = threading.Lock()
 
     def load(self) -> FeatureVectorResult:
+        """Return the snapshot vector; the same object while the DB is unchanged."""
         if not self._db_path:
             raise ValueError("ml_db_path is required")
         if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", self._snapshot_view):
@@ -110,36 +185,44 @@ class SqliteSnapshotFeatureProvider:
         if not db_file.exists():
             raise FileNotFoundError(self._db_path)
 
-        conn = sqlite3.connect(db_file)
-        conn.row_factory = sqlite3.Row
-        try:
-            rows = conn.execute(
-                f"SELECT feature_name, feature_value FROM {self._snapshot_view}"
-            ).fetchall()
-        finally:
-            conn.close()
-
-        values_by_name: dict[str, float] = {}
-        for row in rows:
-            feature_name = str(row["feature_name"])
-            parsed = parse_float(row["feature_value"])
-            if parsed is not None:
-                values_by_name[feature_name] = parsed
+        with self._lock:
+            if self._coordinator is None:
+                raise RuntimeError("Snapshot feature provider is closed")
+            return self._build_vector(self._coordinator.snapshot())
+
+    def _build_vector(self, values_by_name: Mapping[str, float]) -> FeatureVectorResult:
+        if values_by_name is self._last_values and self._last_result is not None:
+            return self._last_result
 
         feature_values: dict[str, float] = {}
         missing: list[str] = []
+        plan = self._feature_plan
+        row = plan.reset() if plan is not None else None
         for feature in self._required_features:
             value = values_by_name.get(feature)
             if value is None:
                 missing.append(feature)
                 continue
             feature_values[feature] = value
+            if plan is not None:
+                plan.write(feature, value)
 
-        return FeatureVectorResult(
+        self._last_values = values_by_name
+        self._last_result = FeatureVectorResult(
             feature_values=feature_values,
             missing_features=missing,
             mapped_state_values={},
+            # The plan's buffer is refilled by the next load while the event
+            # loop may still be scoring this one, so each result owns a copy.
+            ordered_row=array("d", row) if row is not None else None,
         )
+        return self._last_result
+
+    def close(self) -> None:
+        with self._lock:
+            if self._coordinator is not None:
+                release_snapshot_coordinator(self._coordinator, self._required_features)
+                self._coordinator = None
 
 
 class RealtimeHistoryFeatureProvider:
@@ -153,25 +236,35 @@ class RealtimeHistoryFeatureProvider:
         feature_types: dict[str, str],
         state_mappings: dict[str, dict[str, float]],
         history_feature_loader: Callable[[list[str]], dict[str, float]],
+        feature_plan: FeaturePlan | None = None,
     ) -> None:
         self._state_provider = HassStateFeatureProvider(
             hass=hass,
             required_features=required_features,
             feature_types=feature_types,
             state_mappings=state_mappings,
+            feature_plan=feature_plan,
         )
         self._required_features = list(required_features)
         self._history_feature_loader = history_feature_loader
+        self._feature_plan = feature_plan
 
-    def load(self) -> FeatureVectorResult:
-        base = self._state_provider.load()
+    def load(self, changed_features: Collection[str] | None = None) -> FeatureVectorResult:
+        base = self._state_provider.load(changed_features)
         history_values = self._history_feature_loader(self._required_features)
-        merged_values = dict(base.feature_values)
-        merged_values.update({key: float(value) for key, value in history_values.items()})
+        # History values are rewritten on every load, so they can live in the
+        # state provider's persistent vector alongside the entity values.
+        merged_values = base.feature_values
+        plan = self._feature_plan
+        for key, value in history_values.items():
+            merged_values[key] = float(value)
+            if plan is not None:
+                plan.write(key, merged_values[key])
 
-        missing = [feature for feature in self._required_features if feature not in merged_values]
+        missing = [feature for feature in base.missing_features if feature not in merged_values]
         return FeatureVectorResult(
             feature_values=merged_values,
             missing_features=missing,
-            mapped_state_values=dict(base.mapped_state_values),
+            mapped_state_values=base.mapped_state_values,
+            ordered_row=base.ordered_row,
         )
@@ -0,0 +1,253 @@
+"""Incremental scorers that update a cached model score from changed features."""
+
+from __future__ import annotations
+
+from typing import Collection, Mapping, Union
+
+from .lightgbm_inference import LightGBMModelSpec, native_tree_ensemble
+from .tree_ensemble import OutputTransform, TreeEnsemble
+
+DEFAULT_FULL_RECOMPUTE_EVERY = 1000
+
+
+class IncrementalLinearScorer:
+    """Keep a legacy ``weights``/``intercept`` score current under feature deltas.
+
+    A single feature change costs ``delta = w * (new - old)``. Every
+    ``full_recompute_every`` delta updates the score is rebuilt from scratch in
+    the same order as ``run_lightgbm_inference`` to bound floating-point drift.
+    """
+
+    def __init__(
+        self,
+        *,
+        feature_names: list[str],
+        weights: list[float],
+        intercept: float,
+        full_recompute_every: int = DEFAULT_FULL_RECOMPUTE_EVERY,
+    ) -> None:
+        self._feature_names = list(feature_names)
+        self._weights = [
+            float(weights[index]) if index < len(weights) else 0.0
+            for index in range(len(self._feature_names))
+        ]
+        self._intercept = float(intercept)
+        self._full_recompute_every = max(int(full_recompute_every), 1)
+        self._columns: dict[str, list[int]] = {}
+        for index, feature_name in enumerate(self._feature_names):
+            self._columns.setdefault(feature_name, []).append(index)
+        self._values = [0.0] * len(self._feature_names)
+        self._column_contributions = [0.0] * len(self._feature_names)
+        self._contributions: dict[str, float] = {}
+        self._score = self._intercept
+        self._updates_since_full = 0
+        self._primed = False
+
+    @classmethod
+    def from_model(
+        cls,
+        model: LightGBMModelSpec,
+        *,
+        full_recompute_every: int = DEFAULT_FULL_RECOMPUTE_EVERY,
+    ) -> IncrementalLinearScorer | None:
+        """Build a scorer for linear payloads; tree payloads return ``None``."""
+        payload = model.model_payload
+        booster_model_str = payload.get("booster_model_str")
+        if isinstance(booster_model_str, str) and booster_model_str.strip():
+            return None
+        if "weights" not in payload and "intercept" not in payload:
+            return None
+        return cls(
+            feature_names=model.feature_names,
+            weights=[float(weight) for weight in list(payload.get("weights", []))],
+            intercept=float(payload.get("intercept", 0.0)),
+            full_recompute_every=full_recompute_every,
+        )
+
+    @property
+    def contributions(self) -> dict[str, float]:
+        """Per-feature contributions as of the last ``score`` call (not a copy)."""
+        return self._contributions
+
+    def invalidate(self) -> None:
+        """Force the next ``score`` call to recompute every feature."""
+        self._primed = False
+
+    def score(
+        self,
+        feature_values: Mapping[str, float],
+        changed_features: Collection[str] | None = None,
+    ) -> float:
+        """Return the linear score, touching only ``changed_features`` when primed."""
+        if (
+            not self._primed
+            or changed_features is None
+            or self._updates_since_full >= self._full_recompute_every
+        ):
+            return self._recompute(feature_values)
+
+        weights = self._weights
+        values = self._values
+        column_contributions = self._column_contributions
+        for feature_name in changed_features:
+            columns = self._columns.get(feature_name)
+            if columns is None:
+                continue
+            new_value = float(feature_values.get(feature_name, 0.0))
+            if new_value != new_value or self._score != self._score:
+                # NaN does not cancel out of a running sum, so rebuild it.
+                return self._recompute(feature_values)
+            for index in columns:
+                delta = weights[index] * (new_value - values[index])
+                values[index] = new_value
+                column_contributions[index] += delta
+                self._score += delta
+            self._contributions[feature_name] = column_contributions[columns[-1]]
+            self._updates_since_full += 1
+        return self._score
+
+    def _recompute(self, feature_values: Mapping[str, float]) -> float:
+        score = self._intercept
+        contributions: dict[str, float] = {}
+        for index, feature_name in enumerate(self._feature_names):
+            value = float(feature_values.get(feature_name, 0.0))
+            contribution = self._weights[index] * value
+            self._values[index] = value
+            self._column_contributions[index] = contribution
+            contributions[feature_name] = contribution
+            score += contribution
+        self._contributions = contributions
+        self._score = score
+        self._updates_since_full = 0
+        self._primed = True
+        return score
+
+
+class IncrementalTreeScorer:
+    """Keep a tree-ensemble raw score current by re-walking only affected trees.
+
+    The scorer indexes which trees split on each feature and caches every
+    tree's leaf output. A changed feature re-walks just the trees that reference
+    it and applies their output deltas to the cached raw score; a full resum
+    runs every ``full_recompute_every`` updates to bound drift.
+    """
+
+    def __init__(
+        self,
+        *,
+        ensemble: TreeEnsemble,
+        feature_names: list[str],
+        full_recompute_every: int = DEFAULT_FULL_RECOMPUTE_EVERY,
+    ) -> None:
+        self._ensemble = ensemble
+        self._feature_names = list(feature_names)
+        self._full_recompute_every = max(int(full_recompute_every), 1)
+        trees_by_column = ensemble.trees_by_feature()
+        self._columns: dict[str, list[int]] = {}
+        self._trees_by_feature: dict[str, tuple[int, ...]] = {}
+        for index, feature_name in enumerate(self._feature_names):
+            self._columns.setdefault(feature_name, []).append(index)
+        for feature_name, columns in self._columns.items():
+            trees: set[int] = set()
+            for index in columns:
+                if index < len(trees_by_column):
+                    trees.update(trees_by_column[index])
+            self._trees_by_feature[feature_name] = tuple(sorted(trees))
+        self._row = [0.0] * max(len(self._feature_names), ensemble.num_features)
+        self._tree_outputs = [0.0] * ensemble.num_trees
+        self._score = 0.0
+        self._updates_since_full = 0
+        self._primed = False
+
+    @classmethod
+    def from_model(
+        cls,
+        model: LightGBMModelSpec,
+        *,
+        full_recompute_every: int = DEFAULT_FULL_RECOMPUTE_EVERY,
+    ) -> IncrementalTreeScorer | None:
+        """Build a scorer for tree payloads the native evaluator can parse."""
+        booster_model_str = model.model_payload.get("booster_model_str")
+        if not isinstance(booster_model_str, str) or not booster_model_str.strip():
+            return None
+        try:
+            ensemble = native_tree_ensemble(
+                booster_model_str, model.booster_digest(booster_model_str)
+            )
+        except ValueError:
+            return None
+        return cls(
+            ensemble=ensemble,
+            feature_names=model.feature_names,
+            full_recompute_every=full_recompute_every,
+        )
+
+    @property
+    def transform(self) -> OutputTransform:
+        return self._ensemble.transform
+
+    def invalidate(self) -> None:
+        """Force the next ``score`` call to re-walk every tree."""
+        self._primed = False
+
+    def score(
+        self,
+        feature_values: Mapping[str, float],
+        changed_features: Collection[str] | None = None,
+    ) -> float:
+        """Return the raw score, re-walking only trees that split on changed features."""
+        if (
+            not self._primed
+            or changed_features is None
+            or self._updates_since_full >= self._full_recompute_every
+        ):
+            return self._recompute(feature_values)
+
+        row = self._row
+        affected: set[int] = set()
+        for feature_name in changed_features:
+            columns = self._columns.get(feature_name)
+            if columns is None:
+                continue
+            new_value = float(feature_values.get(feature_name, 0.0))
+            for index in columns:
+                row[index] = new_value
+            affected.update(self._trees_by_feature[feature_name])
+            self._updates_since_full += 1
+
+        ensemble = self._ensemble
+        tree_outputs = self._tree_outputs
+        for tree in affected:
+            output = ensemble.tree_output(tree, row)
+            self._score += output - tree_outputs[tree]
+            tree_outputs[tree] = output
+        return self._score
+
+    def _recompute(self, feature_values: Mapping[str, float]) -> float:
+        row = self._row
+        for index, feature_name in enumerate(self._feature_names):
+            row[index] = float(feature_values.get(feature_name, 0.0))
+        ensemble = self._ensemble
+        score = 0.0
+        for tree in range(ensemble.num_trees):
+            output = ensemble.tree_output(tree, row)
+            self._tree_outputs[tree] = output
+            score += output
+        self._score = score
+        self._updates_since_full = 0
+        self._primed = True
+        return score
+
+
+IncrementalScorer = Union[IncrementalLinearScorer, IncrementalTreeScorer]
+
+
+def build_incremental_scorer(
+    model: LightGBMModelSpec,
+    *,
+    full_recompute_every: int = DEFAULT_FULL_RECOMPUTE_EVERY,
+) -> IncrementalScorer | None:
+    """Return the incremental scorer matching ``model``'s payload, if any."""
+    return IncrementalTreeScorer.from_model(
+        model, full_recompute_every=full_recompute_every
+    ) or IncrementalLinearScorer.from_model(model, full_recompute_every=full_recompute_every)
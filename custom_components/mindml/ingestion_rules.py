@@ -2,9 +2,10 @@
 
 from __future__ import annotations
 
-import sqlite3
 from datetime import UTC, datetime
 
+from .db_connections import get_connection_manager
+
 
 def sync_ingestion_rules(
     *,
@@ -18,8 +19,7 @@ def sync_ingestion_rules(
     if not source:
         raise ValueError("source is required")
 
-    conn = sqlite3.connect(db_path)
-    try:
+    with get_connection_manager(db_path).write() as conn:
         now_utc = datetime.now(UTC).replace(microsecond=0).isoformat()
         conn.execute("DELETE FROM ingestion_rules WHERE source = ?", (source,))
         rows = [
@@ -35,7 +35,4 @@ def sync_ingestion_rules(
                 """,
                 rows,
             )
-        conn.commit()
         return len(rows)
-    finally:
-        conn.close()
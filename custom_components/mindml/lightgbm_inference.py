@@ -2,11 +2,27 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import hashlib
+import math
+import operator
+import threading
+from array import array
+from collections import OrderedDict
+from dataclasses import dataclass, field
 from importlib import import_module
-from typing import Any
+from typing import TYPE_CHECKING, Any, Callable, Collection, Hashable, Sequence
 
 from .model import safe_sigmoid
+from .tree_ensemble import OutputTransform, TreeEnsemble
+
+if TYPE_CHECKING:
+    from .incremental import IncrementalScorer
+
+INFERENCE_BACKEND_AUTO = "auto"
+INFERENCE_BACKEND_LIGHTGBM = "lightgbm"
+INFERENCE_BACKEND_NATIVE = "native"
+
+_BOOSTER_CACHE_MAX_BYTES = 64 * 1024 * 1024
 
 
 @dataclass(slots=True)
@@ -23,12 +39,289 @@ class InferenceResult:
     decision: str | None
 
 
+@dataclass(slots=True)
+class BatchInferenceResult:
+    """Column-oriented inference output for many feature rows."""
+
+    probabilities: array
+    raw_scores: array
+    decisions: list[str]
+
+
 @dataclass(slots=True)
 class LightGBMModelSpec:
     """Model payload and ordered feature names used for inference."""
 
     feature_names: list[str]
     model_payload: dict[str, Any]
+    # (model text, SHA-256) so the text is hashed once per spec, not per score.
+    _digest_memo: tuple[str, str] | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def booster_digest(self, model_str: str) -> str:
+        """Content hash of ``model_str``, the payload's booster text."""
+        memo = self._digest_memo
+        if memo is None or memo[0] is not model_str:
+            memo = self._digest_memo = (model_str, model_str_digest(model_str))
+        return memo[1]
+
+    def predict_batch(
+        self,
+        rows: Sequence[Sequence[float]],
+        *,
+        threshold: float,
+        backend: str = INFERENCE_BACKEND_AUTO,
+    ) -> BatchInferenceResult:
+        """Score a 2-D block of rows ordered like ``feature_names`` in one call.
+
+        Rows may be nested sequences or a NumPy array. When NumPy is available
+        both model kinds are scored with a single vectorized operation;
+        otherwise the linear path falls back to tight Python loops. Raises
+        ``ValueError`` carrying the usual unavailable reason when the payload
+        cannot be scored.
+        """
+        numpy = _optional_numpy()
+        width = len(self.feature_names)
+        matrix: Any = rows
+        if numpy is not None:
+            matrix = numpy.asarray(rows, dtype=numpy.float64)
+            if matrix.size == 0:
+                matrix = matrix.reshape(0, width)
+            if matrix.ndim != 2 or matrix.shape[1] != width:
+                raise ValueError(f"expected rows of {width} features")
+        elif any(len(row) != width for row in rows):
+            raise ValueError(f"expected rows of {width} features")
+
+        booster_model_str = self.model_payload.get("booster_model_str")
+        if isinstance(booster_model_str, str) and booster_model_str.strip():
+            tree_model, unavailable_reason = _resolve_tree_model(
+                booster_model_str, backend, self.booster_digest(booster_model_str)
+            )
+            if tree_model is None:
+                raise ValueError(unavailable_reason)
+            raw_scores = tree_model.predict(matrix, raw_score=True)
+            transform = tree_model.transform
+        elif "weights" in self.model_payload or "intercept" in self.model_payload:
+            intercept = float(self.model_payload.get("intercept", 0.0))
+            weights = [float(weight) for weight in list(self.model_payload.get("weights", []))[:width]]
+            weights.extend([0.0] * (width - len(weights)))
+            if numpy is not None:
+                raw_scores = matrix @ numpy.asarray(weights, dtype=numpy.float64) + intercept
+            else:
+                raw_scores = [intercept + math.fsum(map(operator.mul, row, weights)) for row in matrix]
+            transform = OutputTransform()
+        else:
+            raise ValueError("model_payload_missing")
+
+        if numpy is not None:
+            raw_array = numpy.asarray(raw_scores, dtype=numpy.float64)
+            probability_array = transform.apply_many(raw_array)
+            raw_column = array("d", raw_array.tobytes())
+            probability_column = array("d", probability_array.tobytes())
+        else:
+            raw_column = array("d", raw_scores)
+            probability_column = array("d", map(transform, raw_column))
+
+        decisions = [
+            "positive" if probability * 100.0 >= threshold else "negative"
+            for probability in probability_column
+        ]
+        return BatchInferenceResult(
+            probabilities=probability_column,
+            raw_scores=raw_column,
+            decisions=decisions,
+        )
+
+
+@dataclass(slots=True)
+class BoosterCacheStats:
+    """Point-in-time counters for the process-wide booster cache."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+    max_bytes: int
+
+
+class BoosterCache:
+    """LRU cache of compiled boosters keyed by a content hash of the model text.
+
+    Entries are sized by the length of their model string, which tracks the
+    parsed booster's footprint closely enough to bound memory. The most recently
+    used entry is never evicted, so a single oversized model still parses once.
+    """
+
+    def __init__(self, *, max_bytes: int) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[tuple[Any, str], tuple[Any, int]] = OrderedDict()
+        self._size_bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._lock = threading.Lock()
+
+    def get_or_build(
+        self,
+        model_str: str,
+        builder: Callable[..., Any],
+        *,
+        namespace: Hashable | None = None,
+        digest: str | None = None,
+    ) -> Any:
+        """Return the cached compiled model or build it via ``builder(model_str=...)``.
+
+        Entries are keyed by ``namespace`` (defaulting to ``builder``) plus the
+        content hash, so different compilers of the same text do not collide.
+        Pass ``digest`` when the caller already holds the hash, e.g. from
+        ``LightGBMModelSpec.booster_digest``, to skip rehashing the text.
+        """
+        if digest is None:
+            digest = model_str_digest(model_str)
+        with self._lock:
+            key = (builder if namespace is None else namespace, digest)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self._hits += 1
+                return entry[0]
+            self._misses += 1
+
+        compiled = builder(model_str=model_str)
+        size = len(model_str)
+        with self._lock:
+            if key not in self._entries:
+                self._entries[key] = (compiled, size)
+                self._size_bytes += size
+            self._entries.move_to_end(key)
+            while self._size_bytes > self._max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self._size_bytes -= evicted_size
+                self._evictions += 1
+        return compiled
+
+    def stats(self) -> BoosterCacheStats:
+        with self._lock:
+            return BoosterCacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                entries=len(self._entries),
+                size_bytes=self._size_bytes,
+                max_bytes=self._max_bytes,
+            )
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size_bytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+
+class BoosterTreeModel:
+    """``lightgbm.Booster`` paired with the output transform from its header."""
+
+    __slots__ = ("booster", "transform")
+
+    def __init__(self, booster: Any, model_str: str) -> None:
+        self.booster = booster
+        self.transform = OutputTransform.from_model_str(model_str)
+
+    def predict(
+        self,
+        rows: Sequence[Sequence[float]],
+        raw_score: bool = False,
+        pred_contrib: bool = False,
+    ) -> Any:
+        return self.booster.predict(rows, raw_score=raw_score, pred_contrib=pred_contrib)
+
+
+_BOOSTER_CACHE = BoosterCache(max_bytes=_BOOSTER_CACHE_MAX_BYTES)
+
+
+def booster_cache_stats() -> BoosterCacheStats:
+    """Return counters for the process-wide booster cache."""
+    return _BOOSTER_CACHE.stats()
+
+
+def clear_booster_cache() -> None:
+    """Drop all cached boosters and reset counters."""
+    _BOOSTER_CACHE.clear()
+
+
+def _optional_numpy() -> Any | None:
+    try:
+        return import_module("numpy")
+    except ModuleNotFoundError:
+        return None
+
+
+def model_str_digest(model_str: str) -> str:
+    """SHA-256 hex digest of a booster model text."""
+    return hashlib.sha256(model_str.encode("utf-8")).hexdigest()
+
+
+def _resolve_tree_model(
+    model_str: str,
+    backend: str,
+    digest: str | None = None,
+) -> tuple[Any | None, str | None]:
+    """Return a cached compiled tree model for ``backend`` or an unavailable reason."""
+    builder: Callable[..., Any] = TreeEnsemble.from_model_str
+    namespace: Hashable | None = None
+    lightgbm_missing = False
+    if backend != INFERENCE_BACKEND_NATIVE:
+        try:
+            booster_cls = import_module("lightgbm").Booster
+        except ModuleNotFoundError:
+            lightgbm_missing = True
+        else:
+
+            def _build_booster(*, model_str: str) -> BoosterTreeModel:
+                return BoosterTreeModel(booster_cls(model_str=model_str), model_str)
+
+            builder = _build_booster
+            namespace = booster_cls
+
+    if lightgbm_missing and backend == INFERENCE_BACKEND_LIGHTGBM:
+        return None, "lightgbm_not_installed"
+    try:
+        return (
+            _BOOSTER_CACHE.get_or_build(model_str, builder, namespace=namespace, digest=digest),
+            None,
+        )
+    except Exception:
+        return None, "lightgbm_not_installed" if lightgbm_missing else "lightgbm_inference_error"
+
+
+def compile_tree_model(
+    model: LightGBMModelSpec,
+    backend: str = INFERENCE_BACKEND_AUTO,
+) -> str | None:
+    """Compile ``model``'s tree payload into the booster cache ahead of scoring.
+
+    Returns the unavailable reason when the payload cannot be compiled and
+    ``None`` otherwise, including for linear payloads that need no compiling.
+    """
+    booster_model_str = model.model_payload.get("booster_model_str")
+    if not isinstance(booster_model_str, str) or not booster_model_str.strip():
+        return None
+    digest = model.booster_digest(booster_model_str)
+    return _resolve_tree_model(booster_model_str, backend, digest)[1]
+
+
+def native_tree_ensemble(model_str: str, digest: str | None = None) -> TreeEnsemble:
+    """Return the cached ``TreeEnsemble`` for ``model_str``; raise ``ValueError``."""
+    tree_model, unavailable_reason = _resolve_tree_model(
+        model_str, INFERENCE_BACKEND_NATIVE, digest
+    )
+    if tree_model is None:
+        raise ValueError(unavailable_reason)
+    return tree_model
 
 
 def run_lightgbm_inference(
@@ -37,9 +330,34 @@ def run_lightgbm_inference(
     missing_features: list[str],
     model: LightGBMModelSpec,
     threshold: float,
+    backend: str = INFERENCE_BACKEND_AUTO,
+    compute_contributions: bool = True,
+    incremental_scorer: IncrementalScorer | None = None,
+    changed_features: Collection[str] | None = None,
+    ordered_row: Sequence[float] | None = None,
 ) -> InferenceResult:
-    """Compute a probability using a LightGBM-like payload contract."""
+    """Compute a probability using a LightGBM-like payload contract.
+
+    Tree payloads are scored by the ``lightgbm`` wheel or by the bundled
+    ``TreeEnsemble`` evaluator. ``auto`` prefers the wheel and falls back to
+    the native evaluator when it is not installed. With
+    ``compute_contributions=False`` tree models skip the SHAP pass and only
+    compute the raw score; linear contributions are free and always returned.
+
+    An ``incremental_scorer`` built for ``model`` together with the
+    ``changed_features`` since the previous call updates the cached score in
+    O(changed) instead of re-multiplying every weight or re-walking every
+    tree. Tree scorers only cover the raw score; contribution passes still
+    run the full model.
+
+    ``ordered_row`` is the model-ordered input row prebuilt by a
+    ``FeaturePlan``; when given, ``feature_values`` is not re-resolved by name.
+    Linear results from an incremental scorer share its contributions dict,
+    which the next call updates in place.
+    """
     if missing_features:
+        if incremental_scorer is not None:
+            incremental_scorer.invalidate()
         return InferenceResult(
             available=False,
             native_value=None,
@@ -51,26 +369,60 @@ def run_lightgbm_inference(
             decision=None,
         )
 
-    ordered_row = [[float(feature_values.get(name, 0.0)) for name in model.feature_names]]
     booster_model_str = model.model_payload.get("booster_model_str")
+    if (
+        isinstance(booster_model_str, str)
+        and booster_model_str.strip()
+        and incremental_scorer is not None
+        and not compute_contributions
+    ):
+        linear_score = incremental_scorer.score(feature_values, changed_features)
+        raw_probability = float(incremental_scorer.transform(linear_score))
+        native_value = raw_probability * 100.0
+        is_above_threshold = native_value >= threshold
+        return InferenceResult(
+            available=True,
+            native_value=native_value,
+            raw_probability=raw_probability,
+            linear_score=linear_score,
+            feature_contributions={},
+            unavailable_reason=None,
+            is_above_threshold=is_above_threshold,
+            decision="positive" if is_above_threshold else "negative",
+        )
+
     if isinstance(booster_model_str, str) and booster_model_str.strip():
-        try:
-            lightgbm = import_module("lightgbm")
-        except ModuleNotFoundError:
+        rows = [
+            ordered_row
+            if ordered_row is not None
+            else [float(feature_values.get(name, 0.0)) for name in model.feature_names]
+        ]
+        tree_model, unavailable_reason = _resolve_tree_model(
+            booster_model_str, backend, model.booster_digest(booster_model_str)
+        )
+        if tree_model is None:
             return InferenceResult(
                 available=False,
                 native_value=None,
                 raw_probability=None,
                 linear_score=None,
                 feature_contributions={},
-                unavailable_reason="lightgbm_not_installed",
+                unavailable_reason=unavailable_reason,
                 is_above_threshold=None,
                 decision=None,
             )
+        # One contribution pass yields everything: the contributions (bias in
+        # the last column) sum to the raw score, which maps to the probability.
         try:
-            booster = lightgbm.Booster(model_str=booster_model_str)
-            raw_probability = float(booster.predict(ordered_row)[0])
-            linear_score = float(booster.predict(ordered_row, raw_score=True)[0])
+            if compute_contributions:
+                contributions = [
+                    float(value) for value in tree_model.predict(rows, pred_contrib=True)[0]
+                ]
+                linear_score = math.fsum(contributions)
+            else:
+                contributions = []
+                linear_score = float(tree_model.predict(rows, raw_score=True)[0])
+            raw_probability = float(tree_model.transform(linear_score))
         except Exception:
             return InferenceResult(
                 available=False,
@@ -83,14 +435,11 @@ def run_lightgbm_inference(
                 decision=None,
             )
 
-        feature_contributions: dict[str, float] = {}
-        try:
-            contributions = booster.predict(ordered_row, pred_contrib=True)[0]
-            for index, feature_name in enumerate(model.feature_names):
-                if index < len(contributions):
-                    feature_contributions[feature_name] = float(contributions[index])
-        except Exception:
-            feature_contributions = {}
+        feature_contributions = {
+            feature_name: contributions[index]
+            for index, feature_name in enumerate(model.feature_names)
+            if index < len(contributions) - 1
+        }
 
         native_value = raw_probability * 100.0
         is_above_threshold = native_value >= threshold
@@ -118,17 +467,38 @@ def run_lightgbm_inference(
             decision=None,
         )
 
-    intercept = float(model.model_payload.get("intercept", 0.0))
-    raw_weights = list(model.model_payload.get("weights", []))
-    linear_score = intercept
-    feature_contributions: dict[str, float] = {}
-
-    for index, feature_name in enumerate(model.feature_names):
-        value = float(feature_values.get(feature_name, 0.0))
-        weight = float(raw_weights[index]) if index < len(raw_weights) else 0.0
-        contribution = weight * value
-        feature_contributions[feature_name] = contribution
-        linear_score += contribution
+    if incremental_scorer is not None:
+        linear_score = incremental_scorer.score(feature_values, changed_features)
+        # The scorer's own dict, not a copy: copying is O(features) per event.
+        feature_contributions = incremental_scorer.contributions
+    else:
+        intercept = float(model.model_payload.get("intercept", 0.0))
+        raw_weights = list(model.model_payload.get("weights", []))
+        linear_score = intercept
+        feature_contributions = {}
+
+        for index, feature_name in enumerate(model.feature_names):
+            if ordered_row is not None:
+                value = ordered_row[index]
+            else:
+                value = float(feature_values.get(feature_name, 0.0))
+            weight = float(raw_weights[index]) if index < len(raw_weights) else 0.0
+            contribution = weight * value
+            feature_contributions[feature_name] = contribution
+            linear_score += contribution
+
+    if linear_score != linear_score:
+        # A NaN input, such as a timing feature not seen yet, has no linear weight.
+        return InferenceResult(
+            available=False,
+            native_value=None,
+            raw_probability=None,
+            linear_score=None,
+            feature_contributions={},
+            unavailable_reason="missing_or_unmapped_features",
+            is_above_threshold=None,
+            decision=None,
+        )
 
     raw_probability = safe_sigmoid(linear_score)
     native_value = raw_probability * 100.0
@@ -9,6 +9,7 @@ from pathlib import Path
 import re
 
 from .const import DEFAULT_ML_ARTIFACT_VIEW
+from .db_connections import DataVersionWatcher, get_connection_manager
 
 
 @dataclass(slots=True)
@@ -37,14 +38,10 @@ def _load_latest_artifact_row(
     if not db_file.exists():
         raise FileNotFoundError(db_path)
 
-    conn = sqlite3.connect(db_file)
-    conn.row_factory = sqlite3.Row
-    try:
+    with get_connection_manager(str(db_file)).read() as conn:
         row = conn.execute(
             f"SELECT created_at_utc, model_type, feature_set_version, artifact_json FROM {artifact_view} LIMIT 1"
         ).fetchone()
-    finally:
-        conn.close()
 
     if row is None:
         raise ValueError("No LightGBM artifact row available")
@@ -69,3 +66,43 @@ def load_latest_lightgbm_model_artifact(
         feature_set_version=str(row["feature_set_version"]),
         created_at_utc=row["created_at_utc"],
     )
+
+
+class ArtifactChangeDetector:
+    """Cheap poll for a newly published artifact in the ML data layer.
+
+    ``created_at_utc`` is only queried when ``PRAGMA data_version`` shows the
+    database changed at all.
+    """
+
+    def __init__(self, *, db_path: str, artifact_view: str) -> None:
+        self._db_path = db_path
+        self._artifact_view = artifact_view
+        self._watcher = DataVersionWatcher(db_path)
+        self._created_at_utc: str | None = None
+        self._primed = False
+
+    def check(self) -> bool:
+        """Return whether the latest artifact changed since the previous check."""
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", self._artifact_view):
+            return False
+        if not self._db_path or not Path(self._db_path).exists():
+            return False
+        if not self._watcher.changed() and self._primed:
+            return False
+        try:
+            with get_connection_manager(self._db_path).read() as conn:
+                row = conn.execute(
+                    f"SELECT created_at_utc FROM {self._artifact_view} LIMIT 1"
+                ).fetchone()
+        except (OSError, sqlite3.Error):
+            return False
+
+        created_at_utc = None if row is None else row[0]
+        changed = created_at_utc != self._created_at_utc
+        self._created_at_utc = created_at_utc
+        self._primed = True
+        return changed
+
+    def close(self) -> None:
+        self._watcher.close()
@@ -7,6 +7,7 @@ from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Callable
 
+from .db_connections import get_connection_manager
 from .lightgbm_inference import LightGBMModelSpec
 from .ml_artifact import LightGBMModelArtifact, load_latest_lightgbm_model_artifact
 
@@ -42,16 +43,13 @@ class SqliteLightGBMModelProvider:
         db_file = Path(self._db_path)
         if not db_file.exists():
             return None
-        conn = sqlite3.connect(db_file)
-        conn.row_factory = sqlite3.Row
         try:
-            row = conn.execute(
-                "SELECT value FROM metadata WHERE key = 'contract_version'"
-            ).fetchone()
+            with get_connection_manager(str(db_file)).read() as conn:
+                row = conn.execute(
+                    "SELECT value FROM metadata WHERE key = 'contract_version'"
+                ).fetchone()
         except sqlite3.Error as exc:
             return f"contract_version check failed: {exc}"
-        finally:
-            conn.close()
         if row is None:
             return "contract_version check failed: metadata key missing"
         contract_version = str(row["value"])
@@ -66,29 +64,26 @@ class SqliteLightGBMModelProvider:
         db_file = Path(self._db_path)
         if not db_file.exists():
             return {}
-        conn = sqlite3.connect(db_file)
-        conn.row_factory = sqlite3.Row
         try:
-            row = conn.execute(
-                """
-                SELECT
-                    status,
-                    row_count,
-                    day_count,
-                    notes,
-                    finished_at_utc,
-                    started_at_utc,
-                    model_type,
-                    feature_set_version,
-                    artifact_created_at_utc
-                FROM vw_lightgbm_latest_training_result
-                LIMIT 1
-                """
-            ).fetchone()
+            with get_connection_manager(str(db_file)).read() as conn:
+                row = conn.execute(
+                    """
+                    SELECT
+                        status,
+                        row_count,
+                        day_count,
+                        notes,
+                        finished_at_utc,
+                        started_at_utc,
+                        model_type,
+                        feature_set_version,
+                        artifact_created_at_utc
+                    FROM vw_lightgbm_latest_training_result
+                    LIMIT 1
+                    """
+                ).fetchone()
         except sqlite3.Error:
             return {}
-        finally:
-            conn.close()
         if row is None:
             return {}
         return {
@@ -0,0 +1,66 @@
+"""Backfill the rolling window from Home Assistant's recorder database.
+
+The recorder is optional, so its modules and SQLAlchemy are imported lazily.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable, Iterator
+from typing import Any
+
+from .rolling_window import BucketedRollingWindowTracker, RollingWindowTracker
+
+_FETCH_BATCH_SIZE = 1000
+
+# One query for every watched entity. The recorder indexes states on
+# (metadata_id, last_updated_ts), so each entity's range is an index scan.
+RECORDER_EVENTS_QUERY = """
+SELECT states_meta.entity_id, states.state, states.last_updated_ts
+FROM states
+JOIN states_meta ON states.metadata_id = states_meta.metadata_id
+WHERE states_meta.entity_id IN :entity_ids
+  AND states.last_updated_ts >= :start_ts
+ORDER BY states.last_updated_ts
+"""
+
+
+def iter_recorder_events(
+    session: Any,
+    entity_ids: Iterable[str],
+    start_ts: float,
+) -> Iterator[tuple[str, str, float]]:
+    """Stream ``(entity_id, state, epoch seconds)`` rows, oldest first."""
+    from sqlalchemy import bindparam, text
+
+    query = text(RECORDER_EVENTS_QUERY).bindparams(bindparam("entity_ids", expanding=True))
+    result = session.execute(
+        query.execution_options(stream_results=True),
+        {"entity_ids": list(entity_ids), "start_ts": start_ts},
+    )
+    while rows := result.fetchmany(_FETCH_BATCH_SIZE):
+        for entity_id, state, last_updated_ts in rows:
+            if state is None or last_updated_ts is None:
+                continue
+            yield str(entity_id), str(state), float(last_updated_ts)
+
+
+def load_recorder_backfill(
+    hass: Any,
+    tracker: RollingWindowTracker | BucketedRollingWindowTracker,
+    entity_ids: Iterable[str],
+) -> int:
+    """Fill the empty ``tracker`` from the recorder; runs in the recorder executor.
+
+    Rows go through ``record_event``, so the tracker's ``feature_states``
+    filter applies exactly as for live events. Returns the events recorded.
+    """
+    from homeassistant.components.recorder.util import session_scope
+
+    start_ts = time.time() - tracker.retention_hours * 3600.0
+    with session_scope(hass=hass, read_only=True) as session:
+        for entity_id, state, last_updated_ts in iter_recorder_events(
+            session, entity_ids, start_ts
+        ):
+            tracker.record_event(entity_id, state, last_updated_ts)
+    return tracker.event_count
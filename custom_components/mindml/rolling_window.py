@@ -2,45 +2,784 @@
 
 from __future__ import annotations
 
-from collections import deque
-from datetime import UTC, datetime, timedelta
+import base64
+import binascii
+import math
+import re
+import sys
+import time
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+
+HISTORY_FEATURE_NAMES = ("event_count", "on_ratio")
+
+_INITIAL_CAPACITY = 64
+# Codes are stored as unsigned 16-bit values; the last one stands in for any
+# value interned after the table is full, e.g. a chatty numeric sensor.
+_OVERFLOW_CODE = 0xFFFF
+_WINDOW_FEATURE_RE = re.compile(r"(event_count|on_ratio)_(\d+)([mh])")
+
+
+class _InternTable:
+    """Map strings to small integer codes and back."""
+
+    __slots__ = ("_codes", "values")
+
+    def __init__(self) -> None:
+        self._codes: dict[str, int] = {}
+        self.values: list[str] = []
+
+    def code(self, value: str) -> int:
+        code = self._codes.get(value)
+        if code is not None:
+            return code
+        if len(self.values) >= _OVERFLOW_CODE:
+            return _OVERFLOW_CODE
+        code = self._codes[value] = len(self.values)
+        self.values.append(value)
+        return code
+
+    def lookup(self, value: str) -> int | None:
+        return self._codes.get(value)
+
+    @classmethod
+    def from_values(cls, values: Iterable[str]) -> _InternTable:
+        table = cls()
+        for value in values:
+            table.code(str(value))
+        return table
+
+
+class _EventRing:
+    """FIFO of ``(epoch seconds, entity code, state code)`` in parallel arrays.
+
+    About 12 bytes per event instead of a tuple plus ``datetime`` per event.
+    Capacity doubles when full and halves when a quarter full, so a window
+    that empties after a burst gives its memory back.
+    """
+
+    __slots__ = ("_timestamps", "_entities", "_states", "_head", "_size")
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY) -> None:
+        self._timestamps = array("d", bytes(8 * capacity))
+        self._entities = array("H", bytes(2 * capacity))
+        self._states = array("H", bytes(2 * capacity))
+        self._head = 0
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def append(self, timestamp: float, entity_code: int, state_code: int) -> None:
+        capacity = len(self._timestamps)
+        if self._size == capacity:
+            self._resize(capacity * 2)
+            capacity *= 2
+        index = (self._head + self._size) % capacity
+        self._timestamps[index] = timestamp
+        self._entities[index] = entity_code
+        self._states[index] = state_code
+        self._size += 1
+
+    def timestamp_at(self, offset: int) -> float:
+        """Timestamp of the event ``offset`` places after the oldest one."""
+        return self._timestamps[(self._head + offset) % len(self._timestamps)]
+
+    def state_at(self, offset: int) -> int:
+        return self._states[(self._head + offset) % len(self._states)]
+
+    def popleft(self) -> None:
+        self._head = (self._head + 1) % len(self._timestamps)
+        self._size -= 1
+
+    def shrink_to_fit(self) -> None:
+        capacity = len(self._timestamps)
+        while capacity > _INITIAL_CAPACITY and self._size <= capacity // 4:
+            capacity //= 2
+        if capacity != len(self._timestamps):
+            self._resize(capacity)
+
+    def ordered(self) -> tuple[array, array, array]:
+        """Copies of the timestamp, entity and state columns, oldest first."""
+        head, size = self._head, self._size
+        timestamps, entities, states = (
+            (column[head:] + column[:head])[:size]
+            for column in (self._timestamps, self._entities, self._states)
+        )
+        return timestamps, entities, states
+
+    @classmethod
+    def from_columns(cls, timestamps: array, entities: array, states: array) -> _EventRing:
+        """Adopt ordered columns without per-event work."""
+        size = len(timestamps)
+        capacity = _INITIAL_CAPACITY
+        while capacity < size:
+            capacity *= 2
+        ring = cls(0)
+        for name, column in (
+            ("_timestamps", timestamps),
+            ("_entities", entities),
+            ("_states", states),
+        ):
+            column.frombytes(bytes(column.itemsize * (capacity - size)))
+            setattr(ring, name, column)
+        ring._size = size
+        return ring
+
+    def _resize(self, capacity: int) -> None:
+        head, size = self._head, self._size
+        for name in ("_timestamps", "_entities", "_states"):
+            old = getattr(self, name)
+            ordered = (old[head:] + old[:head])[:size]
+            ordered.frombytes(bytes(ordered.itemsize * (capacity - size)))
+            setattr(self, name, ordered)
+        self._head = 0
+
+
+def _remap(codes: array, source: _InternTable, target: _InternTable) -> array:
+    """Translate ``codes`` from ``source``'s table into ``target``'s."""
+    mapping = [target.code(value) for value in source.values]
+    return array(
+        "H", (mapping[code] if code < len(mapping) else _OVERFLOW_CODE for code in codes)
+    )
+
+
+@dataclass(slots=True)
+class _Window:
+    """Cursor and running per-state-code counts for one window length."""
+
+    seconds: float
+    suffix: str
+    # Sequence number of the oldest event still inside this window.
+    cursor: int
+    state_counts: list[int]
+
+
+def window_suffix(hours: float) -> str:
+    """Feature-name suffix for a window length, e.g. ``15m``, ``1h`` or ``24h``."""
+    minutes = max(round(hours * 60), 1)
+    return f"{minutes // 60}h" if minutes % 60 == 0 else f"{minutes}m"
+
+
+def windows_for_features(feature_names: Iterable[str]) -> list[float]:
+    """Window lengths in hours named by features such as ``event_count_1h``."""
+    hours: list[float] = []
+    for feature_name in feature_names:
+        match = _WINDOW_FEATURE_RE.fullmatch(feature_name)
+        if match is None:
+            continue
+        amount = int(match.group(2))
+        window = amount / 60 if match.group(3) == "m" else float(amount)
+        if window > 0 and window not in hours:
+            hours.append(window)
+    return hours
 
 
 class RollingWindowTracker:
+    """Event counts and on-ratios over one or more trailing windows.
+
+    Every window reads the same event log, which keeps events for the longest
+    window. Each window only advances its own cursor past expired events, so
+    recording and computing stay amortized O(1) per window.
+    """
 
     def __init__(
         self,
         *,
         window_hours: float = 7.0,
         feature_states: dict[str, str] | None = None,
+        extra_window_hours: Iterable[float] = (),
     ) -> None:
         self._window_hours = window_hours
         self._feature_states: dict[str, str] = dict(feature_states) if feature_states else {}
-        self._events: deque[tuple[datetime, str, str]] = deque()
+        self._events = _EventRing()
+        self._entity_codes = _InternTable()
+        self._state_codes = _InternTable()
+        # Sequence numbers of the oldest stored event and of the next event.
+        self._first_seq = 0
+        self._next_seq = 0
+        # The configured window keeps the unsuffixed feature names.
+        self._windows = [_Window(window_hours * 3600.0, "", 0, [])]
+        self._feature_names = HISTORY_FEATURE_NAMES
+        self.add_windows(extra_window_hours)
 
     @property
     def event_count(self) -> int:
-        return len(self._events)
+        return self._next_seq - self._windows[0].cursor
 
-    def record_event(self, entity_id: str, state: str) -> None:
+    @property
+    def feature_names(self) -> tuple[str, ...]:
+        return self._feature_names
+
+    def add_windows(self, window_hours: Iterable[float]) -> None:
+        """Track extra windows; a longer window fills up as new events arrive."""
+        known = {window.suffix for window in self._windows}
+        for hours in window_hours:
+            suffix = f"_{window_suffix(hours)}"
+            if suffix in known:
+                continue
+            known.add(suffix)
+            window = _Window(max(round(hours * 60), 1) * 60.0, suffix, self._first_seq, [])
+            for offset in range(self._next_seq - self._first_seq):
+                self._count(window, self._events.state_at(offset), 1)
+            self._windows.append(window)
+        self._feature_names = tuple(
+            f"{name}{window.suffix}" for window in self._windows for name in HISTORY_FEATURE_NAMES
+        )
+
+    def record_event(
+        self,
+        entity_id: str,
+        state: str,
+        timestamp: datetime | float | None = None,
+    ) -> None:
+        """Record an event at ``timestamp`` (default now); times must not go backwards.
+
+        ``timestamp`` may be a ``datetime`` or epoch seconds, as stored by the
+        recorder.
+        """
         if self._feature_states:
             expected_state = self._feature_states.get(entity_id)
             if expected_state is None or expected_state != state:
                 return
-        self._events.append((datetime.now(UTC), entity_id, state))
+        if timestamp is None:
+            timestamp = time.time()
+        elif isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+        state_code = self._state_codes.code(state)
+        self._events.append(timestamp, self._entity_codes.code(entity_id), state_code)
+        self._next_seq += 1
+        for window in self._windows:
+            self._count(window, state_code, 1)
+
+    @staticmethod
+    def _count(window: _Window, state_code: int, delta: int) -> None:
+        state_counts = window.state_counts
+        if state_code >= len(state_counts):
+            state_counts.extend([0] * (state_code + 1 - len(state_counts)))
+        state_counts[state_code] += delta
 
-    def _prune(self, now: datetime) -> None:
-        cutoff = now - timedelta(hours=self._window_hours)
-        while self._events and self._events[0][0] < cutoff:
-            self._events.popleft()
+    def _state_count(self, window: _Window, state: str) -> int:
+        code = self._state_codes.lookup(state)
+        if code is None or code >= len(window.state_counts):
+            return 0
+        return window.state_counts[code]
+
+    def _prune(self, now: float) -> None:
+        events = self._events
+        first_seq = self._first_seq
+        oldest_cursor = self._next_seq
+        for window in self._windows:
+            cutoff = now - window.seconds
+            cursor = window.cursor
+            state_counts = window.state_counts
+            while cursor < self._next_seq and events.timestamp_at(cursor - first_seq) < cutoff:
+                state_counts[events.state_at(cursor - first_seq)] -= 1
+                cursor += 1
+            window.cursor = cursor
+            oldest_cursor = min(oldest_cursor, cursor)
+
+        if oldest_cursor > first_seq:
+            for _ in range(oldest_cursor - first_seq):
+                events.popleft()
+            self._first_seq = oldest_cursor
+            events.shrink_to_fit()
+
+    def next_expiry(self, now: float | None = None) -> float | None:
+        """Epoch seconds at which the next event leaves a window, or ``None``.
+
+        Expired events are dropped first, so the answer is never in the past
+        and a timer set for it sees the window change.
+        """
+        self._prune(time.time() if now is None else now)
+        expiry: float | None = None
+        for window in self._windows:
+            if window.cursor == self._next_seq:
+                continue
+            leaves_at = self._events.timestamp_at(window.cursor - self._first_seq) + window.seconds
+            if expiry is None or leaves_at < expiry:
+                expiry = leaves_at
+        return expiry
+
+    def checkpoint(self) -> dict[str, Any]:
+        """Serialize the event log as base64 columns for HA storage."""
+        timestamps, entities, states = self._events.ordered()
+        return {
+            "byteorder": sys.byteorder,
+            "timestamps": base64.b64encode(timestamps.tobytes()).decode("ascii"),
+            "entities": base64.b64encode(entities.tobytes()).decode("ascii"),
+            "states": base64.b64encode(states.tobytes()).decode("ascii"),
+            "entity_names": list(self._entity_codes.values),
+            "state_names": list(self._state_codes.values),
+            # Model windows are added after startup, so keep them with the log.
+            "window_hours": [window.seconds / 3600.0 for window in self._windows[1:]],
+        }
+
+    def restore(self, checkpoint: Mapping[str, Any], now: datetime | None = None) -> int:
+        """Load a ``checkpoint`` into an empty tracker; returns the events kept.
+
+        The checkpoint's windows are added first, so a longer window a model
+        asked for keeps its history. Events older than the longest window are
+        dropped. Malformed data and non-empty trackers are left untouched and
+        report ``0``.
+        """
+        if self._next_seq != self._first_seq:
+            return 0
+        try:
+            window_hours = [float(hours) for hours in checkpoint.get("window_hours", ())]
+            columns = []
+            for key, typecode in (("timestamps", "d"), ("entities", "H"), ("states", "H")):
+                column = array(typecode)
+                column.frombytes(base64.b64decode(checkpoint[key], validate=True))
+                if checkpoint.get("byteorder", sys.byteorder) != sys.byteorder:
+                    column.byteswap()
+                columns.append(column)
+            entity_codes = _InternTable.from_values(checkpoint["entity_names"])
+            state_codes = _InternTable.from_values(checkpoint["state_names"])
+        except (KeyError, TypeError, ValueError, binascii.Error):
+            return 0
+        timestamps, entities, states = columns
+        if not len(timestamps) == len(entities) == len(states):
+            return 0
+        self.add_windows(hours for hours in window_hours if hours > 0)
+        return self._load_columns(
+            timestamps,
+            entities,
+            states,
+            entity_codes,
+            state_codes,
+            time.time() if now is None else now.timestamp(),
+        )
+
+    def empty_copy(self) -> RollingWindowTracker:
+        """A new, empty tracker with the same windows and ``feature_states`` filter."""
+        copy = RollingWindowTracker(
+            window_hours=self._window_hours,
+            feature_states=self._feature_states,
+        )
+        copy._windows = [
+            _Window(window.seconds, window.suffix, 0, []) for window in self._windows
+        ]
+        copy._feature_names = self._feature_names
+        return copy
+
+    def adopt(self, other: RollingWindowTracker, now: datetime | None = None) -> int:
+        """Merge in ``other``'s older events; returns the events added.
+
+        Used to swap in a log that was filled off the event loop while live
+        events kept arriving. Only events older than this tracker's oldest
+        event are taken, so an event both logs saw is counted once.
+        """
+        live_timestamps, live_entities, live_states = self._events.ordered()
+        timestamps, entities, states = other._events.ordered()
+        if live_timestamps:
+            count = bisect_left(timestamps, live_timestamps[0])
+            timestamps, entities, states = timestamps[:count], entities[:count], states[:count]
+        if not timestamps:
+            return 0
+        # The backfill is usually the larger log, so keep its codes and remap ours.
+        entity_codes = _InternTable.from_values(other._entity_codes.values)
+        state_codes = _InternTable.from_values(other._state_codes.values)
+        timestamps.extend(live_timestamps)
+        entities.extend(_remap(live_entities, self._entity_codes, entity_codes))
+        states.extend(_remap(live_states, self._state_codes, state_codes))
+        kept = self._load_columns(
+            timestamps,
+            entities,
+            states,
+            entity_codes,
+            state_codes,
+            time.time() if now is None else now.timestamp(),
+        )
+        return max(kept - len(live_timestamps), 0)
+
+    @property
+    def retention_hours(self) -> float:
+        """How far back the longest window reaches."""
+        return max(window.seconds for window in self._windows) / 3600.0
+
+    def _load_columns(
+        self,
+        timestamps: array,
+        entities: array,
+        states: array,
+        entity_codes: _InternTable,
+        state_codes: _InternTable,
+        now_ts: float,
+    ) -> int:
+        start = bisect_left(timestamps, now_ts - max(window.seconds for window in self._windows))
+        if start:
+            timestamps, entities, states = timestamps[start:], entities[start:], states[start:]
+        for window in self._windows:
+            window.cursor = bisect_left(timestamps, now_ts - window.seconds)
+            counts = Counter(states[window.cursor :])
+            window.state_counts = [0] * (max(counts, default=-1) + 1)
+            for code, count in counts.items():
+                window.state_counts[code] = count
+        self._first_seq = 0
+        self._next_seq = len(timestamps)
+        self._entity_codes = entity_codes
+        self._state_codes = state_codes
+        # Adopting the columns pads them in place, so this comes last.
+        self._events = _EventRing.from_columns(timestamps, entities, states)
+        return self._next_seq
 
     def compute_features(self, required_features: list[str]) -> dict[str, float]:
-        self._prune(datetime.now(UTC))
-        event_count = len(self._events)
-        on_count = sum(1 for _, _, state in self._events if state == "on")
-        on_ratio = (on_count / event_count) if event_count else 0.0
+        self._prune(time.time())
+        features: dict[str, float] = {}
+        for window in self._windows:
+            event_count = self._next_seq - window.cursor
+            on_count = self._state_count(window, "on")
+            features[f"event_count{window.suffix}"] = float(event_count)
+            features[f"on_ratio{window.suffix}"] = (
+                float(on_count / event_count) if event_count else 0.0
+            )
+        return features
+
+
+@dataclass(slots=True)
+class _BucketWindow:
+    """Running totals over the newest ``buckets`` buckets of the ring."""
+
+    buckets: int
+    suffix: str
+    event_count: int = 0
+    on_count: int = 0
+    # Absolute number of the oldest non-empty bucket inside the window.
+    oldest: int | None = None
+
 
+class BucketedRollingWindowTracker:
+    """Rolling window features from per-bucket counts instead of an event log.
+
+    Events are summed into fixed ``bucket_seconds`` bins kept in a circular
+    array, so memory is O(longest window / bucket) whatever the event rate.
+    Each window adds events as they land in its newest bucket and subtracts a
+    bucket's counts when it leaves the tail.
+
+    Accuracy: a window of ``W`` seconds spans ``ceil(W / bucket_seconds)``
+    whole buckets ending at the current one, so the history it covers is
+    within one ``bucket_seconds`` of ``W``. ``event_count`` differs from the
+    exact :class:`RollingWindowTracker` by at most the events in one bucket at
+    the trailing edge, and ``on_ratio`` is exact over the history covered.
+    """
+
+    def __init__(
+        self,
+        *,
+        window_hours: float = 7.0,
+        feature_states: dict[str, str] | None = None,
+        extra_window_hours: Iterable[float] = (),
+        bucket_seconds: float = 60.0,
+    ) -> None:
+        if bucket_seconds <= 0:
+            raise ValueError("bucket_seconds must be positive")
+        self._window_hours = window_hours
+        self._feature_states: dict[str, str] = dict(feature_states) if feature_states else {}
+        self._bucket_seconds = float(bucket_seconds)
+        # Absolute bucket number (epoch seconds // bucket_seconds) of the newest bucket.
+        self._head: int | None = None
+        self._totals = array("I")
+        self._on_counts = array("I")
+        # The configured window keeps the unsuffixed feature names.
+        self._windows = [_BucketWindow(self._buckets_for(window_hours * 3600.0), "")]
+        self._feature_names = HISTORY_FEATURE_NAMES
+        self._resize_ring()
+        self.add_windows(extra_window_hours)
+
+    @property
+    def bucket_seconds(self) -> float:
+        return self._bucket_seconds
+
+    @property
+    def event_count(self) -> int:
+        return self._windows[0].event_count
+
+    @property
+    def feature_names(self) -> tuple[str, ...]:
+        return self._feature_names
+
+    @property
+    def retention_hours(self) -> float:
+        """How far back the longest window reaches."""
+        return len(self._totals) * self._bucket_seconds / 3600.0
+
+    def _buckets_for(self, seconds: float) -> int:
+        return max(math.ceil(seconds / self._bucket_seconds - 1e-9), 1)
+
+    def add_windows(self, window_hours: Iterable[float]) -> None:
+        """Track extra windows; a longer window fills up as new events arrive."""
+        known = {window.suffix for window in self._windows}
+        for hours in window_hours:
+            suffix = f"_{window_suffix(hours)}"
+            if suffix in known:
+                continue
+            known.add(suffix)
+            window = _BucketWindow(self._buckets_for(max(round(hours * 60), 1) * 60.0), suffix)
+            self._windows.append(window)
+            self._resize_ring()
+            if self._head is not None:
+                self._recount(window)
+        self._feature_names = tuple(
+            f"{name}{window.suffix}" for window in self._windows for name in HISTORY_FEATURE_NAMES
+        )
+
+    def _resize_ring(self) -> None:
+        """Size the ring to the longest window, keeping the buckets it still covers."""
+        size = max(window.buckets for window in self._windows)
+        old_size = len(self._totals)
+        if size == old_size:
+            return
+        totals = array("I", bytes(4 * size))
+        on_counts = array("I", bytes(4 * size))
+        if self._head is not None:
+            for bucket in range(self._head - min(size, old_size) + 1, self._head + 1):
+                totals[bucket % size] = self._totals[bucket % old_size]
+                on_counts[bucket % size] = self._on_counts[bucket % old_size]
+        self._totals = totals
+        self._on_counts = on_counts
+
+    def _recount(self, window: _BucketWindow) -> None:
+        """Rebuild a window's totals from the ring."""
+        size = len(self._totals)
+        window.event_count = window.on_count = 0
+        window.oldest = None
+        for bucket in range(self._head - window.buckets + 1, self._head + 1):
+            slot = bucket % size
+            if self._totals[slot]:
+                if window.oldest is None:
+                    window.oldest = bucket
+                window.event_count += self._totals[slot]
+                window.on_count += self._on_counts[slot]
+
+    def _oldest_from(self, bucket: int) -> int | None:
+        """First non-empty bucket from ``bucket`` up to the head."""
+        size = len(self._totals)
+        for candidate in range(bucket, self._head + 1):
+            if self._totals[candidate % size]:
+                return candidate
+        return None
+
+    def _advance(self, bucket: int) -> None:
+        """Move the head to ``bucket``, expiring buckets that leave each window."""
+        head = self._head
+        if head is None:
+            self._head = bucket
+            return
+        if bucket <= head:
+            return
+        size = len(self._totals)
+        totals, on_counts = self._totals, self._on_counts
+        steps = bucket - head
+        expired_windows = []
+        for window in self._windows:
+            if steps >= window.buckets:
+                window.event_count = window.on_count = 0
+                window.oldest = None
+                continue
+            tail = bucket - window.buckets + 1
+            for expired in range(head - window.buckets + 1, tail):
+                slot = expired % size
+                window.event_count -= totals[slot]
+                window.on_count -= on_counts[slot]
+            if window.oldest is not None and window.oldest < tail:
+                expired_windows.append((window, tail))
+        # Clear the slots the new buckets reuse.
+        for new_bucket in range(head + 1, head + 1 + min(steps, size)):
+            slot = new_bucket % size
+            totals[slot] = 0
+            on_counts[slot] = 0
+        self._head = bucket
+        for window, tail in expired_windows:
+            # The search only moves forward, so it is amortized O(1) per bucket.
+            window.oldest = self._oldest_from(tail)
+
+    def record_event(
+        self,
+        entity_id: str,
+        state: str,
+        timestamp: datetime | float | None = None,
+    ) -> None:
+        """Count an event at ``timestamp`` (default now) in its bucket.
+
+        Events older than the longest window are ignored.
+        """
+        if self._feature_states:
+            expected_state = self._feature_states.get(entity_id)
+            if expected_state is None or expected_state != state:
+                return
+        if timestamp is None:
+            timestamp = time.time()
+        elif isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+        bucket = int(timestamp // self._bucket_seconds)
+        self._advance(bucket)
+        head = self._head
+        size = len(self._totals)
+        if bucket <= head - size:
+            return
+        is_on = state == "on"
+        slot = bucket % size
+        self._totals[slot] += 1
+        self._on_counts[slot] += is_on
+        for window in self._windows:
+            if bucket > head - window.buckets:
+                window.event_count += 1
+                window.on_count += is_on
+                if window.oldest is None or bucket < window.oldest:
+                    window.oldest = bucket
+
+    def compute_features(self, required_features: list[str]) -> dict[str, float]:
+        self._advance(int(time.time() // self._bucket_seconds))
+        features: dict[str, float] = {}
+        for window in self._windows:
+            event_count = window.event_count
+            features[f"event_count{window.suffix}"] = float(event_count)
+            features[f"on_ratio{window.suffix}"] = (
+                float(window.on_count / event_count) if event_count else 0.0
+            )
+        return features
+
+    def next_expiry(self, now: float | None = None) -> float | None:
+        """Epoch seconds at which the next bucket leaves a window, or ``None``.
+
+        Buckets leave whole, so this is a bucket boundary after ``now``.
+        """
+        self._advance(int((time.time() if now is None else now) // self._bucket_seconds))
+        expiry: float | None = None
+        for window in self._windows:
+            if window.oldest is None:
+                continue
+            leaves_at = (window.oldest + window.buckets) * self._bucket_seconds
+            if expiry is None or leaves_at < expiry:
+                expiry = leaves_at
+        return expiry
+
+    def _ordered(self) -> tuple[array, array]:
+        """Copies of the totals and on-count columns, oldest bucket first."""
+        if self._head is None:
+            return array("I"), array("I")
+        split = (self._head + 1) % len(self._totals)
+        return (
+            self._totals[split:] + self._totals[:split],
+            self._on_counts[split:] + self._on_counts[:split],
+        )
+
+    def checkpoint(self) -> dict[str, Any]:
+        """Serialize the bucket counts as base64 columns for HA storage."""
+        totals, on_counts = self._ordered()
         return {
-            "event_count": float(event_count),
-            "on_ratio": float(on_ratio),
+            "byteorder": sys.byteorder,
+            "bucket_seconds": self._bucket_seconds,
+            "head": self._head,
+            "totals": base64.b64encode(totals.tobytes()).decode("ascii"),
+            "on_counts": base64.b64encode(on_counts.tobytes()).decode("ascii"),
+            # Model windows are added after startup, so keep them with the counts.
+            "window_hours": windows_for_features(
+                f"event_count{window.suffix}" for window in self._windows[1:]
+            ),
         }
+
+    def restore(self, checkpoint: Mapping[str, Any], now: datetime | None = None) -> int:
+        """Load a ``checkpoint`` into an empty tracker; returns the events kept.
+
+        The checkpoint's windows are added first, so the ring is sized for a
+        longer window a model asked for. Checkpoints with another bucket size,
+        malformed data and non-empty trackers are left untouched and report
+        ``0``.
+        """
+        if self._head is not None:
+            return 0
+        try:
+            if float(checkpoint["bucket_seconds"]) != self._bucket_seconds:
+                return 0
+            window_hours = [float(hours) for hours in checkpoint.get("window_hours", ())]
+            head = checkpoint["head"]
+            if head is None:
+                return 0
+            head = int(head)
+            columns = []
+            for key in ("totals", "on_counts"):
+                column = array("I")
+                column.frombytes(base64.b64decode(checkpoint[key], validate=True))
+                if checkpoint.get("byteorder", sys.byteorder) != sys.byteorder:
+                    column.byteswap()
+                columns.append(column)
+        except (KeyError, TypeError, ValueError, binascii.Error):
+            return 0
+        totals, on_counts = columns
+        if len(totals) != len(on_counts):
+            return 0
+        self.add_windows(hours for hours in window_hours if hours > 0)
+        return self._load_buckets(
+            head,
+            totals,
+            on_counts,
+            time.time() if now is None else now.timestamp(),
+        )
+
+    def empty_copy(self) -> BucketedRollingWindowTracker:
+        """A new, empty tracker with the same windows, buckets and filter."""
+        copy = BucketedRollingWindowTracker(
+            window_hours=self._window_hours,
+            feature_states=self._feature_states,
+            bucket_seconds=self._bucket_seconds,
+        )
+        copy._windows = [_BucketWindow(window.buckets, window.suffix) for window in self._windows]
+        copy._feature_names = self._feature_names
+        copy._resize_ring()
+        return copy
+
+    def adopt(self, other: BucketedRollingWindowTracker, now: datetime | None = None) -> int:
+        """Merge in ``other``'s older buckets; returns the events added.
+
+        Used to swap in counts filled off the event loop while live events
+        kept arriving. Only buckets before this tracker's oldest non-empty
+        bucket are taken, so an event both saw is counted once; the bucket
+        they share keeps the live counts only.
+        """
+        if other._head is None:
+            return 0
+        now_ts = time.time() if now is None else now.timestamp()
+        if self._head is None:
+            totals, on_counts = other._ordered()
+            return self._load_buckets(other._head, totals, on_counts, now_ts)
+        self._advance(max(other._head, int(now_ts // self._bucket_seconds)))
+        size = len(self._totals)
+        first_live = self._oldest_from(self._head - size + 1)
+        if first_live is None:
+            first_live = self._head + 1
+        other_size = len(other._totals)
+        added = 0
+        start = max(self._head - size, other._head - other_size) + 1
+        for bucket in range(start, min(first_live, other._head + 1)):
+            total = other._totals[bucket % other_size]
+            if total:
+                self._totals[bucket % size] += total
+                self._on_counts[bucket % size] += other._on_counts[bucket % other_size]
+                added += total
+        if added:
+            for window in self._windows:
+                self._recount(window)
+        return added
+
+    def _load_buckets(self, head: int, totals: array, on_counts: array, now_ts: float) -> int:
+        """Place ordered columns ending at bucket ``head``, then age them to now."""
+        size = len(self._totals)
+        keep = min(len(totals), size)
+        self._head = head
+        for offset in range(keep):
+            bucket = head - keep + 1 + offset
+            source = len(totals) - keep + offset
+            self._totals[bucket % size] = totals[source]
+            self._on_counts[bucket % size] = on_counts[source]
+        for window in self._windows:
+            self._recount(window)
+        self._advance(int(now_ts // self._bucket_seconds))
+        return sum(self._totals)
@@ -2,18 +2,31 @@
 
 from __future__ import annotations
 
-from datetime import UTC, datetime
-from typing import Any
+import asyncio
+from collections.abc import Iterable
+from dataclasses import dataclass
+from datetime import UTC, datetime, timedelta
+from functools import partial
+from typing import Any, Callable
 
 from homeassistant.components.sensor import SensorEntity, SensorStateClass
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import EVENT_HOMEASSISTANT_STOP
 from homeassistant.core import Event, HomeAssistant, callback
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.event import async_track_state_change_event
+from homeassistant.helpers.event import (
+    async_track_point_in_time,
+    async_track_state_change_event,
+    async_track_time_interval,
+)
 from homeassistant.helpers.restore_state import RestoreEntity
+from homeassistant.helpers.storage import Store
 
 from .const import (
     CONF_BED_PRESENCE_ENTITY,
+    CONF_CONTRIBUTIONS_EVERY_N,
+    CONF_CONTRIBUTIONS_MIN_INTERVAL,
+    CONF_ROLLING_WINDOW_BUCKET_SECONDS,
     CONF_ROLLING_WINDOW_HOURS,
     CONF_FEATURE_STATES,
     CONF_FEATURE_TYPES,
@@ -25,19 +38,74 @@ from .const import (
     CONF_REQUIRED_FEATURES,
     CONF_STATE_MAPPINGS,
     CONF_THRESHOLD,
+    DEFAULT_CONTRIBUTIONS_EVERY_N,
+    DEFAULT_CONTRIBUTIONS_MIN_INTERVAL,
     DEFAULT_ML_ARTIFACT_VIEW,
+    DEFAULT_ROLLING_WINDOW_BUCKET_SECONDS,
     DEFAULT_ROLLING_WINDOW_HOURS,
     DEFAULT_ML_FEATURE_SOURCE,
     DEFAULT_ML_FEATURE_VIEW,
     DEFAULT_THRESHOLD,
     DOMAIN,
+    MODEL_RELOAD_CHECK_INTERVAL_SECONDS,
+    ENTITY_TIMING_REFRESH_SECONDS,
+    ROLLING_WINDOW_CHECKPOINT_SECONDS,
+    ROLLING_WINDOW_STORAGE_VERSION,
+    SNAPSHOT_WATCH_DEBOUNCE_SECONDS,
+)
+from .feature_provider import (
+    FeaturePlan,
+    FeatureVectorResult,
+    RealtimeHistoryFeatureProvider,
+    SqliteSnapshotFeatureProvider,
+)
+from .incremental import IncrementalScorer, build_incremental_scorer
+from .rolling_window import (
+    BucketedRollingWindowTracker,
+    RollingWindowTracker,
+    windows_for_features,
 )
-from .feature_provider import RealtimeHistoryFeatureProvider, SqliteSnapshotFeatureProvider
-from .rolling_window import RollingWindowTracker
 from .ingestion_rules import sync_ingestion_rules
-from .lightgbm_inference import LightGBMModelSpec, run_lightgbm_inference
+from .lightgbm_inference import LightGBMModelSpec, compile_tree_model, run_lightgbm_inference
+from .ml_artifact import ArtifactChangeDetector
 from .model_provider import ModelProviderResult, SqliteLightGBMModelProvider
 from .paths import resolve_ml_db_path
+from .recorder_bootstrap import load_recorder_backfill
+from .snapshot_watcher import SnapshotFileWatcher
+from .state_timing import EntityTimingTracker
+
+
+@dataclass(slots=True)
+class _ModelRuntime:
+    """Model plus everything derived from it, swapped in as one reference."""
+
+    model: LightGBMModelSpec
+    incremental_scorer: IncrementalScorer | None
+    feature_plan: FeaturePlan
+    feature_provider: Any
+    required_features: list[str]
+
+    def close(self) -> None:
+        """Release resources held by the feature provider, if it has any."""
+        close = getattr(self.feature_provider, "close", None)
+        if close is not None:
+            close()
+
+
+@dataclass(slots=True)
+class _LoadedModel:
+    """Result of the executor-side model load, applied on the event loop."""
+
+    model_result: ModelProviderResult
+    runtime: _ModelRuntime
+    ingestion_rules_count: int
+    ingestion_sync_error: str | None
+
+
+def _close_abandoned_load(future: asyncio.Future[_LoadedModel]) -> None:
+    """Close the runtime of a load nobody is waiting for any more."""
+    if not future.cancelled() and future.exception() is None:
+        future.result().runtime.close()
 
 
 async def async_setup_entry(
@@ -77,38 +145,29 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
         ).strip() or DEFAULT_ML_FEATURE_VIEW
         self._bed_presence_entity = str(config.get(CONF_BED_PRESENCE_ENTITY, "")).strip()
 
-        requested_features = list(config.get(CONF_REQUIRED_FEATURES, []))
-        model_provider = SqliteLightGBMModelProvider(
-            db_path=self._ml_db_path,
-            artifact_view=self._ml_artifact_view,
-            fallback_feature_names=requested_features,
-        )
-        model_result: ModelProviderResult = model_provider.load()
-
-        self._model: LightGBMModelSpec = model_result.model
-        self._model_source = model_result.source
-        self._model_artifact_error = model_result.artifact_error
-        self._model_artifact_meta: dict[str, Any] = dict(model_result.artifact_meta)
-        self._training_result: dict[str, Any] = dict(model_result.training_result)
-        self._ingestion_sync_error: str | None = None
-        self._ingestion_rules_count: int = 0
-
+        self._requested_features: list[str] = list(config.get(CONF_REQUIRED_FEATURES, []))
+        self._required_features: list[str] = list(self._requested_features)
         self._feature_states = {
             str(entity_id): str(state)
             for entity_id, state in dict(config.get(CONF_FEATURE_STATES, {})).items()
         }
-        try:
-            self._ingestion_rules_count = sync_ingestion_rules(
-                db_path=self._ml_db_path,
-                source=f"mindml:{self._entry_id}",
-                feature_states=self._feature_states,
-            )
-        except Exception as exc:  # pragma: no cover - diagnostics-only
-            self._ingestion_sync_error = str(exc)
 
-        self._required_features: list[str] = list(config.get(CONF_REQUIRED_FEATURES, []))
-        if self._model.feature_names and self._ml_feature_source == "ml_snapshot":
-            self._required_features = list(self._model.feature_names)
+        # The model is loaded off the event loop once the entity is added and
+        # replaced wholesale when the trainer publishes a new artifact.
+        self._runtime: _ModelRuntime | None = None
+        self._artifact_change_detector = ArtifactChangeDetector(
+            db_path=self._ml_db_path,
+            artifact_view=self._ml_artifact_view,
+        )
+        self._model_reload_in_progress = False
+        self._runtime_closed = False
+        self._model_reload_error: str | None = None
+        self._model_source: str | None = None
+        self._model_artifact_error: str | None = None
+        self._model_artifact_meta: dict[str, Any] = {}
+        self._training_result: dict[str, Any] = {}
+        self._ingestion_sync_error: str | None = None
+        self._ingestion_rules_count: int = 0
 
         self._feature_types: dict[str, str] = {
             feature_id: str(feature_type).strip().casefold()
@@ -125,29 +184,42 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
             }
 
         self._threshold = float(config.get(CONF_THRESHOLD, DEFAULT_THRESHOLD))
+        self._contributions_every_n = int(
+            config.get(CONF_CONTRIBUTIONS_EVERY_N, DEFAULT_CONTRIBUTIONS_EVERY_N)
+        )
+        self._contributions_min_interval = float(
+            config.get(CONF_CONTRIBUTIONS_MIN_INTERVAL, DEFAULT_CONTRIBUTIONS_MIN_INTERVAL)
+        )
 
         self._rolling_window_tracker = None
+        self._entity_timing_tracker: EntityTimingTracker | None = None
+        self._unsub_state_change: Callable[[], None] | None = None
+        self._rolling_window_store: Store | None = None
+        self._rolling_window_backfill_error: str | None = None
+        self._unsub_hass_stop: Callable[[], None] | None = None
+        # Set while the entity is live, so expiring events trigger a recompute.
+        self._rolling_window_expiry_enabled = False
+        self._rolling_window_expiry_at: float | None = None
+        self._unsub_rolling_window_expiry: Callable[[], None] | None = None
         self._rolling_window_hours = float(config.get(CONF_ROLLING_WINDOW_HOURS, DEFAULT_ROLLING_WINDOW_HOURS))
+        self._rolling_window_bucket_seconds = float(
+            config.get(CONF_ROLLING_WINDOW_BUCKET_SECONDS, DEFAULT_ROLLING_WINDOW_BUCKET_SECONDS)
+        )
 
-        if self._ml_feature_source == "ml_snapshot" and self._ml_db_path:
-            self._feature_provider = SqliteSnapshotFeatureProvider(
-                db_path=self._ml_db_path,
-                snapshot_view=self._ml_feature_view,
-                required_features=self._required_features,
-            )
-        else:
+        if self._ml_feature_source != "ml_snapshot" or not self._ml_db_path:
             self._ml_feature_source = "hass_state"
-            self._rolling_window_tracker = RollingWindowTracker(
-                window_hours=self._rolling_window_hours,
-                feature_states=self._feature_states,
-            )
-            self._feature_provider = RealtimeHistoryFeatureProvider(
-                hass=self.hass,
-                required_features=self._required_features,
-                feature_types=self._feature_types,
-                state_mappings=self._state_mappings,
-                history_feature_loader=self._rolling_window_tracker.compute_features,
-            )
+            if self._rolling_window_bucket_seconds > 0:
+                self._rolling_window_tracker = BucketedRollingWindowTracker(
+                    window_hours=self._rolling_window_hours,
+                    feature_states=self._feature_states,
+                    bucket_seconds=self._rolling_window_bucket_seconds,
+                )
+            else:
+                self._rolling_window_tracker = RollingWindowTracker(
+                    window_hours=self._rolling_window_hours,
+                    feature_states=self._feature_states,
+                )
+            self._entity_timing_tracker = EntityTimingTracker()
 
         self._attr_name = self._name
         self._attr_unique_id = f"{entry.entry_id}_mindml_probability"
@@ -161,16 +233,198 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
         self._missing_features: list[str] = []
         self._feature_values: dict[str, float] = {}
         self._feature_contributions: dict[str, float] = {}
+        self._feature_contributions_computed_at: datetime | None = None
+        self._contributions_pending_recomputes = 0
+        self._contributions_refresh_in_progress = False
         self._mapped_state_values: dict[str, str] = {}
         self._feature_provider_error: str | None = None
-        self._unavailable_reason: str | None = None
+        self._last_feature_vector: FeatureVectorResult | None = None
+        self._unavailable_reason: str | None = "model_loading"
         self._last_computed_at: str | None = None
         self._is_above_threshold: bool | None = None
         self._decision: str | None = None
 
+    def _load_model(self) -> _LoadedModel:
+        """Load and compile the model and sync ingestion rules; runs in an executor."""
+        # Record the artifact version first so a write racing this load is
+        # picked up by the next change check rather than missed.
+        self._artifact_change_detector.check()
+        model_provider = SqliteLightGBMModelProvider(
+            db_path=self._ml_db_path,
+            artifact_view=self._ml_artifact_view,
+            fallback_feature_names=self._requested_features,
+        )
+        model_result: ModelProviderResult = model_provider.load()
+        ingestion_rules_count = 0
+        ingestion_sync_error: str | None = None
+        try:
+            ingestion_rules_count = sync_ingestion_rules(
+                db_path=self._ml_db_path,
+                source=f"mindml:{self._entry_id}",
+                feature_states=self._feature_states,
+            )
+        except Exception as exc:  # pragma: no cover - diagnostics-only
+            ingestion_sync_error = str(exc)
+        return _LoadedModel(
+            model_result=model_result,
+            runtime=self._build_runtime(model_result.model),
+            ingestion_rules_count=ingestion_rules_count,
+            ingestion_sync_error=ingestion_sync_error,
+        )
+
+    def _build_runtime(self, model: LightGBMModelSpec) -> _ModelRuntime:
+        """Compile ``model`` and build the feature pipeline that feeds it."""
+        compile_tree_model(model)
+        required_features = list(self._requested_features)
+        if model.feature_names and self._ml_feature_source == "ml_snapshot":
+            required_features = list(model.feature_names)
+
+        feature_plan = FeaturePlan(list(model.feature_names))
+        if self._rolling_window_tracker is None:
+            feature_provider: Any = SqliteSnapshotFeatureProvider(
+                db_path=self._ml_db_path,
+                snapshot_view=self._ml_feature_view,
+                required_features=required_features,
+                feature_plan=feature_plan,
+            )
+        else:
+            feature_provider = RealtimeHistoryFeatureProvider(
+                hass=self.hass,
+                required_features=required_features,
+                feature_types=self._feature_types,
+                state_mappings=self._state_mappings,
+                history_feature_loader=self._load_history_features,
+                feature_plan=feature_plan,
+            )
+        return _ModelRuntime(
+            model=model,
+            incremental_scorer=build_incremental_scorer(model),
+            feature_plan=feature_plan,
+            feature_provider=feature_provider,
+            required_features=required_features,
+        )
+
+    def _load_history_features(self, required_features: list[str]) -> dict[str, float]:
+        """Rolling window and per-entity timing features for the hass_state provider."""
+        features = self._rolling_window_tracker.compute_features(required_features)
+        if self._entity_timing_tracker is not None and self._entity_timing_tracker.feature_names:
+            features.update(self._entity_timing_tracker.compute_features(required_features))
+        return features
+
+    def _apply_loaded_model(self, loaded: _LoadedModel) -> None:
+        """Swap in a loaded model; runs on the event loop between recomputes."""
+        model_result = loaded.model_result
+        if self._runtime is not None:
+            self._runtime.close()
+        self._runtime = loaded.runtime
+        self._last_feature_vector = None
+        if self._rolling_window_tracker is not None:
+            # Models can ask for extra windows by name, e.g. event_count_1h.
+            self._rolling_window_tracker.add_windows(
+                windows_for_features(loaded.runtime.model.feature_names)
+            )
+        if self._entity_timing_tracker is not None:
+            # ...and for per-entity timing, e.g. binary_sensor.door__minutes_on_1h.
+            new_entities = self._entity_timing_tracker.add_features(
+                loaded.runtime.model.feature_names
+            )
+            if new_entities and self._unsub_state_change is not None:
+                self._track_watched_entities()
+        self._required_features = loaded.runtime.required_features
+        self._model_source = model_result.source
+        self._model_artifact_error = model_result.artifact_error
+        self._model_artifact_meta = dict(model_result.artifact_meta)
+        self._training_result = dict(model_result.training_result)
+        self._ingestion_rules_count = loaded.ingestion_rules_count
+        self._ingestion_sync_error = loaded.ingestion_sync_error
+        self._model_reload_error = None
+
+    async def _async_load_model_in_executor(self) -> _LoadedModel | None:
+        """Run ``_load_model`` in the executor; ``None`` once the entity is removed.
+
+        A load that finishes after removal, or after its task was cancelled,
+        has its runtime closed so its snapshot subscription is released.
+        """
+        future = asyncio.ensure_future(self.hass.async_add_executor_job(self._load_model))
+        try:
+            loaded = await asyncio.shield(future)
+        except asyncio.CancelledError:
+            future.add_done_callback(_close_abandoned_load)
+            raise
+        if self._runtime_closed:
+            loaded.runtime.close()
+            return None
+        return loaded
+
+    async def _async_load_model(self) -> None:
+        """Load the model in an executor, then compute the first state."""
+        loaded = await self._async_load_model_in_executor()
+        if loaded is None:
+            return
+        self._apply_loaded_model(loaded)
+        await self._async_recompute_state(datetime.now(UTC))
+        self.async_write_ha_state()
+        # The model may have added shorter windows that expire sooner.
+        self._schedule_rolling_window_expiry()
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass,
+                self._async_reload_model_if_changed,
+                timedelta(seconds=MODEL_RELOAD_CHECK_INTERVAL_SECONDS),
+            )
+        )
+
+    async def _async_reload_model_if_changed(self, now: datetime | None = None) -> None:
+        """Reload the model in the background when a new artifact is published."""
+        if self._runtime is None or self._model_reload_in_progress:
+            return
+        self._model_reload_in_progress = True
+        try:
+            if not await self.hass.async_add_executor_job(self._artifact_change_detector.check):
+                return
+            loaded = await self._async_load_model_in_executor()
+        finally:
+            self._model_reload_in_progress = False
+
+        if loaded is None:
+            return
+        if loaded.model_result.source != "ml_data_layer" and self._model_source == "ml_data_layer":
+            # Keep serving the current model rather than regress to the fallback.
+            loaded.runtime.close()
+            self._model_reload_error = loaded.model_result.artifact_error
+            self.async_write_ha_state()
+            return
+        self._apply_loaded_model(loaded)
+        await self._async_recompute_state(datetime.now(UTC))
+        self.async_write_ha_state()
+        # The model may have added shorter windows that expire sooner.
+        self._schedule_rolling_window_expiry()
+
+    async def _async_recompute_state(self, now: datetime) -> None:
+        """Recompute state, reading SQLite snapshots in an executor."""
+        runtime = self._runtime
+        if runtime is None or self._rolling_window_tracker is not None:
+            self._recompute_state(now)
+            self._schedule_feature_contributions(now)
+            return
+        try:
+            feature_vector = await self.hass.async_add_executor_job(runtime.feature_provider.load)
+        except Exception as exc:  # pragma: no cover
+            if self._runtime is runtime:
+                self._set_feature_source_error(now, exc)
+            return
+        if self._runtime is not runtime:
+            # A reload swapped the model while the snapshot was read; the
+            # vector was built for the old layout and the swap recomputes.
+            return
+        self._recompute_state(now, feature_vector=feature_vector)
+        self._schedule_feature_contributions(now)
+
     async def async_added_to_hass(self) -> None:
         """Subscribe to source entity updates."""
         await super().async_added_to_hass()
+        # Lets async_unload_entry close the pooled connections for this path.
+        self._entry_data()["ml_db_path"] = self._ml_db_path
         last_state = await self.async_get_last_state()
         if last_state is not None and last_state.state not in (None, "unknown", "unavailable"):
             try:
@@ -184,42 +438,244 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
                 self._linear_score = attrs["linear_score"]
             self._feature_values = dict(attrs.get("feature_values") or {})
             self._feature_contributions = dict(attrs.get("feature_contributions") or {})
+            try:
+                self._feature_contributions_computed_at = datetime.fromisoformat(
+                    str(attrs["feature_contributions_computed_at"])
+                )
+            except (KeyError, TypeError, ValueError):
+                self._feature_contributions_computed_at = None
             self._missing_features = list(attrs.get("missing_features") or [])
             self._last_computed_at = attrs.get("last_computed_at")
             self._is_above_threshold = attrs.get("is_above_threshold")
             self._decision = attrs.get("decision")
 
+        needs_backfill = False
         if self._ml_feature_source == "hass_state":
-            watched_entities = list(dict.fromkeys(
-                list(self._required_features) + list(self._feature_states.keys())
-            ))
-
-            @callback
-            def _handle_state_change(event: Event) -> None:
-                if self._rolling_window_tracker is not None:
-                    entity_id = event.data.get("entity_id", "")
-                    new_state = event.data.get("new_state")
-                    if new_state is not None:
-                        self._rolling_window_tracker.record_event(
-                            entity_id, new_state.state
-                        )
-                self._recompute_state(datetime.now(UTC))
-                self.async_write_ha_state()
-
-            self.async_on_remove(
-                async_track_state_change_event(
-                    self.hass,
-                    watched_entities,
-                    _handle_state_change,
-                )
+            needs_backfill = await self._async_restore_rolling_window()
+            self._track_watched_entities()
+            self.async_on_remove(self._untrack_watched_entities)
+
+        elif self._ml_feature_source == "ml_snapshot":
+            # Polling stays on as the fallback where inotify is unavailable.
+            watcher = SnapshotFileWatcher.start(
+                loop=self.hass.loop,
+                db_path=self._ml_db_path,
+                callback=self._handle_snapshot_write,
+                debounce_seconds=SNAPSHOT_WATCH_DEBOUNCE_SECONDS,
             )
+            if watcher is not None:
+                self.async_on_remove(watcher.close)
 
         self._recompute_state(datetime.now(UTC))
+        self.async_on_remove(self._artifact_change_detector.close)
+        self.async_on_remove(self._close_runtime)
+        load_task: asyncio.Task | None = None
+        if self._runtime is None:
+            load_task = self.hass.async_create_background_task(
+                self._async_load_model(), f"{DOMAIN} model load {self._entry_id}"
+            )
+            self.async_on_remove(load_task.cancel)
+        if needs_backfill:
+            backfill_task = self.hass.async_create_background_task(
+                self._async_backfill_rolling_window(load_task),
+                f"{DOMAIN} rolling window backfill {self._entry_id}",
+            )
+            self.async_on_remove(backfill_task.cancel)
+
+    async def _async_restore_rolling_window(self) -> bool:
+        """Reload the checkpointed event log, then keep checkpointing it.
+
+        Returns whether the window should be backfilled from the recorder:
+        there was no usable checkpoint and the recorder is loaded.
+        """
+        tracker = self._rolling_window_tracker
+        if tracker is None:
+            return False
+        store = self._rolling_window_store = Store(
+            self.hass,
+            ROLLING_WINDOW_STORAGE_VERSION,
+            f"{DOMAIN}.rolling_window.{self._entry_id}",
+        )
+        checkpoint = await store.async_load()
+        restored = isinstance(checkpoint, dict) and tracker.restore(checkpoint) > 0
+        self.async_on_remove(
+            async_track_time_interval(
+                self.hass,
+                self._schedule_rolling_window_checkpoint,
+                timedelta(seconds=ROLLING_WINDOW_CHECKPOINT_SECONDS),
+            )
+        )
+        self._unsub_hass_stop = self.hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_STOP, self._handle_hass_stop
+        )
+        self.async_on_remove(self._handle_rolling_window_removed)
+        self._rolling_window_expiry_enabled = True
+        self._schedule_rolling_window_expiry()
+        return not restored and "recorder" in self.hass.config.components
+
+    async def _async_backfill_rolling_window(self, model_load: asyncio.Task | None = None) -> None:
+        """Fill the window from the recorder when there is no usable checkpoint.
+
+        Runs in the background once ``model_load`` is done, so the query
+        reaches back as far as the longest window the model asked for. Live
+        events recorded meanwhile are kept and the backfill fills in before
+        them.
+        """
+        from homeassistant.components.recorder import get_instance
+
+        if model_load is not None:
+            await asyncio.wait([model_load])
+        tracker = self._rolling_window_tracker
+        backfill = tracker.empty_copy()
+        try:
+            await get_instance(self.hass).async_add_executor_job(
+                load_recorder_backfill, self.hass, backfill, self._watched_entities()
+            )
+        except Exception as exc:  # pragma: no cover - recorder backend specific
+            self._rolling_window_backfill_error = str(exc)
+            return
+        self._rolling_window_backfill_error = None
+        if not tracker.adopt(backfill):
+            return
+        await self._async_recompute_state(datetime.now(UTC))
+        self.async_write_ha_state()
+        self._schedule_rolling_window_expiry()
+
+    def _watched_entities(self) -> list[str]:
+        timing_entities = (
+            list(self._entity_timing_tracker.entity_ids) if self._entity_timing_tracker else []
+        )
+        return list(dict.fromkeys(
+            list(self._required_features) + list(self._feature_states.keys()) + timing_entities
+        ))
+
+    @callback
+    def _track_watched_entities(self) -> None:
+        """(Re)subscribe to state changes of every watched entity."""
+        self._untrack_watched_entities()
+        if self._entity_timing_tracker is not None:
+            self._seed_entity_timing(self._entity_timing_tracker.entity_ids)
+        self._unsub_state_change = async_track_state_change_event(
+            self.hass,
+            self._watched_entities(),
+            self._handle_state_change,
+        )
+
+    @callback
+    def _untrack_watched_entities(self) -> None:
+        if self._unsub_state_change is not None:
+            self._unsub_state_change()
+            self._unsub_state_change = None
+
+    def _seed_entity_timing(self, entity_ids: Iterable[str]) -> None:
+        """Start timing features from the states Home Assistant already holds."""
+        for entity_id in entity_ids:
+            state = self.hass.states.get(entity_id)
+            last_changed = getattr(state, "last_changed", None)
+            if state is not None and isinstance(last_changed, datetime):
+                self._entity_timing_tracker.seed(entity_id, str(state.state), last_changed)
+
+    @callback
+    def _handle_state_change(self, event: Event) -> None:
+        entity_id = event.data.get("entity_id", "")
+        changed_features = {entity_id}
+        new_state = event.data.get("new_state")
+        if self._rolling_window_tracker is not None:
+            if new_state is not None:
+                self._rolling_window_tracker.record_event(entity_id, new_state.state)
+            changed_features.update(self._rolling_window_tracker.feature_names)
+        if self._entity_timing_tracker is not None:
+            if new_state is not None:
+                self._entity_timing_tracker.record_state(entity_id, new_state.state)
+            changed_features.update(self._entity_timing_tracker.feature_names)
+        now = datetime.now(UTC)
+        self._recompute_state(now, changed_features=changed_features)
+        self.async_write_ha_state()
+        self._schedule_feature_contributions(now)
+        self._schedule_rolling_window_expiry()
+
+    @callback
+    def _schedule_rolling_window_checkpoint(self, now: datetime | None = None) -> None:
+        # Store writes in its executor and flushes pending saves at final write.
+        if self._rolling_window_store is not None and self._rolling_window_tracker is not None:
+            self._rolling_window_store.async_delay_save(self._rolling_window_tracker.checkpoint, 0)
+
+    @callback
+    def _handle_hass_stop(self, event: Event) -> None:
+        self._unsub_hass_stop = None
+        self._schedule_rolling_window_checkpoint()
+
+    @callback
+    def _handle_rolling_window_removed(self) -> None:
+        if self._unsub_hass_stop is not None:
+            self._unsub_hass_stop()
+            self._unsub_hass_stop = None
+        self._rolling_window_expiry_enabled = False
+        self._cancel_rolling_window_expiry()
+        self._schedule_rolling_window_checkpoint()
+
+    @callback
+    def _schedule_rolling_window_expiry(self) -> None:
+        """Keep one timer armed for the next event to leave a rolling window.
+
+        Without it the window features would stay frozen until a watched
+        entity changes, however long the house is quiet. Entity timing
+        features also cap the wait at ``ENTITY_TIMING_REFRESH_SECONDS``.
+        """
+        tracker = self._rolling_window_tracker
+        if tracker is None or not self._rolling_window_expiry_enabled:
+            return
+        expiry = tracker.next_expiry()
+        if self._entity_timing_tracker is not None and self._entity_timing_tracker.feature_names:
+            # Time-since features change continuously, so refresh them periodically.
+            refresh_at = datetime.now(UTC).timestamp() + ENTITY_TIMING_REFRESH_SECONDS
+            expiry = refresh_at if expiry is None else min(expiry, refresh_at)
+        armed_at = self._rolling_window_expiry_at
+        if expiry is None or (armed_at is not None and armed_at <= expiry):
+            # An armed timer that fires no later still recomputes and re-arms.
+            return
+        self._cancel_rolling_window_expiry()
+        self._rolling_window_expiry_at = expiry
+        self._unsub_rolling_window_expiry = async_track_point_in_time(
+            self.hass,
+            self._handle_rolling_window_expiry,
+            datetime.fromtimestamp(expiry, UTC),
+        )
+
+    @callback
+    def _cancel_rolling_window_expiry(self) -> None:
+        if self._unsub_rolling_window_expiry is not None:
+            self._unsub_rolling_window_expiry()
+            self._unsub_rolling_window_expiry = None
+        self._rolling_window_expiry_at = None
+
+    @callback
+    def _handle_rolling_window_expiry(self, now: datetime) -> None:
+        self._unsub_rolling_window_expiry = None
+        self._rolling_window_expiry_at = None
+        if self._rolling_window_tracker is None:
+            return
+        changed_features = set(self._rolling_window_tracker.feature_names)
+        if self._entity_timing_tracker is not None:
+            changed_features.update(self._entity_timing_tracker.feature_names)
+        self._recompute_state(now, changed_features=changed_features)
+        self.async_write_ha_state()
+        self._schedule_feature_contributions(now)
+        self._schedule_rolling_window_expiry()
 
     async def async_update(self) -> None:
         """Refresh state when polling is enabled."""
-        self._recompute_state(datetime.now(UTC))
+        await self._async_recompute_state(datetime.now(UTC))
+
+    @callback
+    def _handle_snapshot_write(self) -> None:
+        self.hass.async_create_background_task(
+            self._async_refresh_from_snapshot(), f"{DOMAIN} snapshot refresh {self._entry_id}"
+        )
 
+    async def _async_refresh_from_snapshot(self) -> None:
+        await self._async_recompute_state(datetime.now(UTC))
+        self.async_write_ha_state()
 
     @property
     def native_value(self) -> float | None:
@@ -227,11 +683,17 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
+        now = datetime.now(UTC)
+        computed_at = self._feature_contributions_computed_at
         return {
             "raw_probability": self._raw_probability,
             "linear_score": self._linear_score,
             "feature_values": dict(self._feature_values),
             "feature_contributions": dict(self._feature_contributions),
+            "feature_contributions_computed_at": computed_at.isoformat() if computed_at else None,
+            "feature_contributions_age_seconds": (
+                (now - computed_at).total_seconds() if computed_at else None
+            ),
             "mapped_state_values": dict(self._mapped_state_values),
             "missing_features": list(self._missing_features),
             "required_features": list(self._required_features),
@@ -248,11 +710,14 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
             "model_runtime": "lightgbm",
             "model_artifact_error": self._model_artifact_error,
             "model_artifact_meta": dict(self._model_artifact_meta),
+            "model_reload_error": self._model_reload_error,
             "feature_source": self._ml_feature_source,
             "feature_view": self._ml_feature_view,
             "bed_presence_entity": self._bed_presence_entity,
             "rolling_window_hours": self._rolling_window_hours,
+            "rolling_window_bucket_seconds": self._rolling_window_bucket_seconds,
             "rolling_window_event_count": self._rolling_window_tracker.event_count if self._rolling_window_tracker else None,
+            "rolling_window_backfill_error": self._rolling_window_backfill_error,
             "ingestion_rules_count": self._ingestion_rules_count,
             "ingestion_sync_error": self._ingestion_sync_error,
             "training_status": self._training_result.get("status"),
@@ -262,41 +727,83 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
             "training_finished_at_utc": self._training_result.get("finished_at_utc"),
         }
 
-    def _recompute_state(self, now: datetime) -> None:
-        try:
-            feature_vector = self._feature_provider.load()
-            self._feature_provider_error = None
-        except Exception as exc:  # pragma: no cover
-            self._feature_values = {}
-            self._mapped_state_values = {}
-            self._missing_features = list(self._required_features)
-            self._last_computed_at = now.astimezone(UTC).isoformat()
-            self._feature_provider_error = str(exc)
-            self._native_value = None
-            self._raw_probability = None
-            self._linear_score = None
-            self._feature_contributions = {}
-            self._unavailable_reason = "feature_source_error"
-            self._is_above_threshold = None
-            self._decision = None
+    def _set_feature_source_error(self, now: datetime, exc: Exception) -> None:
+        self._feature_values = {}
+        self._mapped_state_values = {}
+        self._missing_features = list(self._required_features)
+        self._last_computed_at = now.astimezone(UTC).isoformat()
+        self._feature_provider_error = str(exc)
+        self._last_feature_vector = None
+        if self._runtime is not None and self._runtime.incremental_scorer is not None:
+            self._runtime.incremental_scorer.invalidate()
+        self._native_value = None
+        self._raw_probability = None
+        self._linear_score = None
+        self._feature_contributions = {}
+        self._feature_contributions_computed_at = None
+        self._contributions_pending_recomputes = 0
+        self._unavailable_reason = "feature_source_error"
+        self._is_above_threshold = None
+        self._decision = None
+        self._store_runtime_diagnostics()
+
+    def _recompute_state(
+        self,
+        now: datetime,
+        *,
+        changed_features: set[str] | None = None,
+        feature_vector: FeatureVectorResult | None = None,
+    ) -> None:
+        runtime = self._runtime
+        if runtime is None:
+            self._unavailable_reason = "model_loading"
             self._store_runtime_diagnostics()
             return
-
-        self._feature_values = dict(feature_vector.feature_values)
-        self._mapped_state_values = dict(feature_vector.mapped_state_values)
-        self._missing_features = list(feature_vector.missing_features)
+        if feature_vector is None:
+            try:
+                provider = runtime.feature_provider
+                # Only the hass_state providers take a change set; snapshots
+                # are re-validated through the data_version check instead.
+                feature_vector = (
+                    provider.load() if changed_features is None else provider.load(changed_features)
+                )
+            except Exception as exc:  # pragma: no cover
+                self._set_feature_source_error(now, exc)
+                return
+        if feature_vector is self._last_feature_vector:
+            # The snapshot provider hands back the same vector while the
+            # database is unchanged, so the previous inference still holds.
+            return
+        self._last_feature_vector = feature_vector
+        self._feature_provider_error = None
+
+        # The provider owns these containers and attributes copy them, so
+        # keep references rather than copying on every recompute.
+        self._feature_values = feature_vector.feature_values
+        self._mapped_state_values = feature_vector.mapped_state_values
+        self._missing_features = feature_vector.missing_features
         self._last_computed_at = now.astimezone(UTC).isoformat()
 
         result = run_lightgbm_inference(
             feature_values=self._feature_values,
             missing_features=self._missing_features,
-            model=self._model,
+            model=runtime.model,
             threshold=self._threshold,
+            compute_contributions=False,
+            incremental_scorer=runtime.incremental_scorer,
+            changed_features=changed_features,
+            ordered_row=feature_vector.ordered_row,
         )
         self._native_value = result.native_value
         self._raw_probability = result.raw_probability
         self._linear_score = result.linear_score
-        self._feature_contributions = dict(result.feature_contributions)
+        if result.feature_contributions or not result.available:
+            # Linear scorers update this dict in place; attributes copy it.
+            self._feature_contributions = result.feature_contributions
+            self._feature_contributions_computed_at = now.astimezone(UTC) if result.available else None
+            self._contributions_pending_recomputes = 0
+        else:
+            self._contributions_pending_recomputes += 1
         self._unavailable_reason = result.unavailable_reason
         if (
             not result.available
@@ -309,12 +816,81 @@ class CalibratedLogisticRegressionSensor(SensorEntity, RestoreEntity):
         self._decision = result.decision
         self._store_runtime_diagnostics()
 
-    def _store_runtime_diagnostics(self) -> None:
-        """Persist lightweight runtime status for diagnostics endpoint."""
+    def _feature_contributions_due(self, now: datetime) -> bool:
+        """Whether contributions are stale enough for the configured cadence.
+
+        The minimum interval is a hard lower bound; once it has passed, the
+        update count, if set, must be reached too. Both at 0 turns the
+        contribution pass off.
+        """
+        every_n = self._contributions_every_n
+        min_interval = self._contributions_min_interval
+        if every_n <= 0 and min_interval <= 0:
+            return False
+        if not self._contributions_pending_recomputes or self._runtime is None:
+            return False
+        computed_at = self._feature_contributions_computed_at
+        if computed_at is None:
+            return True
+        if min_interval > 0 and (now - computed_at).total_seconds() < min_interval:
+            return False
+        return every_n <= 0 or self._contributions_pending_recomputes >= every_n
+
+    @callback
+    def _schedule_feature_contributions(self, now: datetime) -> None:
+        """Refresh contributions in the background when the cadence says so."""
+        if self._contributions_refresh_in_progress or not self._feature_contributions_due(now):
+            return
+        self._contributions_refresh_in_progress = True
+        self.hass.async_create_background_task(
+            self._async_refresh_feature_contributions(now),
+            f"{DOMAIN} feature contributions {self._entry_id}",
+        )
+
+    async def _async_refresh_feature_contributions(self, now: datetime) -> None:
+        """Run the full contribution pass in the executor, then publish it.
+
+        A native tree pass can take hundreds of milliseconds, so it must not
+        run on the event loop, e.g. while attributes are read for a write.
+        """
+        runtime = self._runtime
+        pending = self._contributions_pending_recomputes
+        try:
+            result = await self.hass.async_add_executor_job(
+                partial(
+                    run_lightgbm_inference,
+                    feature_values=dict(self._feature_values),
+                    missing_features=list(self._missing_features),
+                    model=runtime.model,
+                    threshold=self._threshold,
+                )
+            )
+        finally:
+            self._contributions_refresh_in_progress = False
+        if runtime is not self._runtime:
+            return
+        self._contributions_pending_recomputes = max(
+            self._contributions_pending_recomputes - pending, 0
+        )
+        if result.available:
+            self._feature_contributions = dict(result.feature_contributions)
+            self._feature_contributions_computed_at = now
+            self.async_write_ha_state()
+
+    def _close_runtime(self) -> None:
+        self._runtime_closed = True
+        if self._runtime is not None:
+            self._runtime.close()
+
+    def _entry_data(self) -> dict[str, Any]:
         if not isinstance(getattr(self.hass, "data", None), dict):
             self.hass.data = {}
         domain_data = self.hass.data.setdefault(DOMAIN, {})
-        entry_data = domain_data.setdefault(self._entry_id, {})
+        return domain_data.setdefault(self._entry_id, {})
+
+    def _store_runtime_diagnostics(self) -> None:
+        """Persist lightweight runtime status for diagnostics endpoint."""
+        entry_data = self._entry_data()
         entry_data["runtime"] = {
             "feature_source": self._ml_feature_source,
             "missing_features": list(self._missing_features),
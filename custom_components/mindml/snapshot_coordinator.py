@@ -0,0 +1,131 @@
+"""One shared snapshot read per ML database view, however many sensors use it."""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from collections import Counter
+from collections.abc import Iterable, Mapping
+from types import MappingProxyType
+
+from .db_connections import DataVersionWatcher, get_connection_manager
+from .model import parse_float
+
+_MAX_SNAPSHOT_IN_PARAMS = 500
+
+
+class SnapshotCoordinator:
+    """Cache the parsed feature snapshot of one view for all subscribed sensors.
+
+    The view is queried for the union of the subscribers' features only when
+    ``PRAGMA data_version`` shows a commit, so N sensors polling the same view
+    cost one query per change plus N cheap version checks.
+    """
+
+    def __init__(self, db_path: str, snapshot_view: str) -> None:
+        self._db_path = db_path
+        self._snapshot_view = snapshot_view
+        self._lock = threading.Lock()
+        self._watcher = DataVersionWatcher(db_path)
+        self._subscriptions = 0
+        self._subscribers: Counter[str] = Counter()
+        self._query: tuple[str, tuple[str, ...]] | None = None
+        self._values: Mapping[str, float] | None = None
+
+    @property
+    def subscribed(self) -> bool:
+        return self._subscriptions > 0
+
+    def subscribe(self, feature_names: Iterable[str]) -> None:
+        with self._lock:
+            added = set(feature_names)
+            if not added.issubset(self._subscribers):
+                self._query = None
+                self._values = None
+            self._subscribers.update(added)
+            self._subscriptions += 1
+
+    def unsubscribe(self, feature_names: Iterable[str]) -> None:
+        with self._lock:
+            self._subscribers.subtract(set(feature_names))
+            self._subscribers = +self._subscribers
+            self._subscriptions -= 1
+            self._query = None
+            if not self._subscriptions:
+                self._values = None
+                self._watcher.close()
+
+    def snapshot(self) -> Mapping[str, float]:
+        """Return the parsed values; the same object while the DB is unchanged."""
+        with self._lock:
+            # Check before querying so a commit racing the read is seen next time.
+            if not self._watcher.changed() and self._values is not None:
+                return self._values
+            if self._query is None:
+                self._query = self._build_query()
+            query, params = self._query
+            try:
+                with get_connection_manager(self._db_path).read() as conn:
+                    rows = conn.execute(query, params).fetchall()
+            except BaseException:
+                # Forget the version just seen so the next call retries the read.
+                self._watcher.close()
+                raise
+
+            values: dict[str, float] = {}
+            for row in rows:
+                parsed = parse_float(row["feature_value"])
+                if parsed is not None:
+                    values[str(row["feature_name"])] = parsed
+            self._values = MappingProxyType(values)
+            return self._values
+
+    def _build_query(self) -> tuple[str, tuple[str, ...]]:
+        """Push the subscribed feature names into SQL so only those rows are read."""
+        names = tuple(sorted(self._subscribers))
+        select = f"SELECT feature_name, feature_value FROM {self._snapshot_view}"
+        if not names:
+            return f"{select} WHERE 0", ()
+        if len(names) <= _MAX_SNAPSHOT_IN_PARAMS:
+            placeholders = ", ".join("?" for _ in names)
+            return f"{select} WHERE feature_name IN ({placeholders})", names
+        # Large lists go through one JSON parameter instead of a temp table,
+        # which the read-only (query_only) connections could not create.
+        return (
+            f"{select} WHERE feature_name IN (SELECT value FROM json_each(?))",
+            (json.dumps(names),),
+        )
+
+
+_COORDINATORS: dict[tuple[str, str], SnapshotCoordinator] = {}
+_COORDINATORS_LOCK = threading.Lock()
+
+
+def acquire_snapshot_coordinator(
+    db_path: str,
+    snapshot_view: str,
+    feature_names: Iterable[str],
+) -> SnapshotCoordinator:
+    """Subscribe ``feature_names`` to the shared coordinator for the view."""
+    key = (os.path.realpath(db_path), snapshot_view)
+    with _COORDINATORS_LOCK:
+        coordinator = _COORDINATORS.get(key)
+        if coordinator is None:
+            coordinator = _COORDINATORS[key] = SnapshotCoordinator(db_path, snapshot_view)
+        coordinator.subscribe(feature_names)
+        return coordinator
+
+
+def release_snapshot_coordinator(
+    coordinator: SnapshotCoordinator,
+    feature_names: Iterable[str],
+) -> None:
+    """Unsubscribe ``feature_names``; the last release drops the coordinator."""
+    with _COORDINATORS_LOCK:
+        coordinator.unsubscribe(feature_names)
+        if coordinator.subscribed:
+            return
+        for key, registered in list(_COORDINATORS.items()):
+            if registered is coordinator:
+                del _COORDINATORS[key]
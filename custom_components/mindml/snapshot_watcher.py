@@ -0,0 +1,131 @@
+"""Push notifications for ML data-layer commits via Linux inotify."""
+
+from __future__ import annotations
+
+import asyncio
+import ctypes
+import ctypes.util
+import os
+import struct
+import sys
+from pathlib import Path
+from typing import Callable
+
+_IN_MODIFY = 0x00000002
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_CREATE = 0x00000100
+_IN_NONBLOCK = os.O_NONBLOCK
+_IN_CLOEXEC = 0o2000000
+_WATCH_MASK = _IN_MODIFY | _IN_CLOSE_WRITE | _IN_MOVED_TO | _IN_CREATE
+
+_EVENT_HEADER = struct.Struct("iIII")
+_READ_SIZE = 64 * 1024
+
+
+def _load_libc() -> ctypes.CDLL | None:
+    if not sys.platform.startswith("linux"):
+        return None
+    try:
+        libc = ctypes.CDLL(ctypes.util.find_library("c") or "libc.so.6", use_errno=True)
+    except OSError:
+        return None
+    if not hasattr(libc, "inotify_init1") or not hasattr(libc, "inotify_add_watch"):
+        return None
+    return libc
+
+
+# Resolved once at import: find_library spawns a subprocess and must not run
+# on the event loop each time a watcher starts.
+_LIBC = _load_libc()
+
+
+class SnapshotFileWatcher:
+    """Call back, debounced, when the database or its ``-wal`` file is written.
+
+    The parent directory is watched rather than the files themselves, because
+    SQLite creates and removes the WAL file across checkpoints. Events are read
+    on the event loop through ``add_reader``, so an idle database costs nothing.
+    """
+
+    def __init__(
+        self,
+        *,
+        loop: asyncio.AbstractEventLoop,
+        fd: int,
+        file_names: frozenset[str],
+        callback: Callable[[], None],
+        debounce_seconds: float,
+    ) -> None:
+        self._loop = loop
+        self._fd = fd
+        self._file_names = file_names
+        self._callback = callback
+        self._debounce_seconds = debounce_seconds
+        self._pending: asyncio.TimerHandle | None = None
+        loop.add_reader(fd, self._on_readable)
+
+    @classmethod
+    def start(
+        cls,
+        *,
+        loop: asyncio.AbstractEventLoop,
+        db_path: str,
+        callback: Callable[[], None],
+        debounce_seconds: float,
+    ) -> SnapshotFileWatcher | None:
+        """Start watching ``db_path``; returns ``None`` where inotify is unavailable."""
+        libc = _LIBC
+        if libc is None or not db_path:
+            return None
+        db_file = Path(db_path)
+        fd = libc.inotify_init1(_IN_NONBLOCK | _IN_CLOEXEC)
+        if fd < 0:
+            return None
+        if libc.inotify_add_watch(fd, os.fsencode(db_file.parent), _WATCH_MASK) < 0:
+            os.close(fd)
+            return None
+        return cls(
+            loop=loop,
+            fd=fd,
+            file_names=frozenset({db_file.name, f"{db_file.name}-wal"}),
+            callback=callback,
+            debounce_seconds=debounce_seconds,
+        )
+
+    def close(self) -> None:
+        if self._pending is not None:
+            self._pending.cancel()
+            self._pending = None
+        if self._fd >= 0:
+            self._loop.remove_reader(self._fd)
+            os.close(self._fd)
+            self._fd = -1
+
+    def _on_readable(self) -> None:
+        names = self._drain()
+        if self._pending is None and not self._file_names.isdisjoint(names):
+            # Coalesce a burst of writes into one callback; a burst longer than
+            # the debounce window still fires once per window.
+            self._pending = self._loop.call_later(self._debounce_seconds, self._fire)
+
+    def _drain(self) -> list[str]:
+        names: list[str] = []
+        while True:
+            try:
+                data = os.read(self._fd, _READ_SIZE)
+            except OSError:  # BlockingIOError once the queue is empty
+                return names
+            if not data:
+                return names
+            offset = 0
+            while offset + _EVENT_HEADER.size <= len(data):
+                _, _, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                raw_name = data[offset : offset + name_length]
+                offset += name_length
+                names.append(os.fsdecode(raw_name.rstrip(b"\0")))
+
+    def _fire(self) -> None:
+        self._pending = None
+        self._callback()
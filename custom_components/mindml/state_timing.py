@@ -0,0 +1,233 @@
+"""Per-entity timing features maintained incrementally from state changes.
+
+Feature names are ``<entity_id>__<operator>``; Home Assistant entity ids never
+contain a double underscore, so the split is unambiguous. Operators:
+
+* ``seconds_since_change``: seconds since the entity last changed state.
+* ``seconds_since_<state>``: seconds since the entity last entered ``state``.
+* ``minutes_<state>_<window>``: minutes spent in ``state`` over the trailing
+  window, e.g. ``cover.garage__minutes_open_1h``.
+* ``activity_<half-life>``: state changes with exponentially decayed weight,
+  e.g. ``binary_sensor.motion__activity_15m``.
+
+Each state change costs O(1) per operator on that entity; reading a value
+costs amortized O(1). Values not known yet, such as the time since a state
+that has not been seen, are reported as NaN. Tree models route NaN down their
+missing-value branch; linear models cannot score it and report unavailable.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+import time
+from collections import deque
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+from datetime import datetime
+
+_TIMING_FEATURE_RE = re.compile(
+    r"(?P<entity>[a-z0-9_]+\.[a-z0-9_]+)__(?:"
+    r"seconds_since_(?P<since>.+)"
+    r"|minutes_(?P<duration_state>.+)_(?P<duration>\d+[mh])"
+    r"|activity_(?P<half_life>\d+[mh])"
+    r")"
+)
+_CHANGE = "change"
+
+
+def _window_seconds(amount: str) -> float:
+    """``15m`` or ``1h`` in seconds."""
+    value = int(amount[:-1])
+    return value * (60.0 if amount[-1] == "m" else 3600.0)
+
+
+@dataclass(slots=True)
+class _StateDuration:
+    """Time spent in one state over a trailing window, kept as intervals.
+
+    Closed intervals inside the window are summed as they close and dropped
+    as they leave, so reading the total never rescans history.
+    """
+
+    feature_name: str
+    state: str
+    seconds: float
+    intervals: deque[tuple[float, float]] = field(default_factory=deque)
+    closed_seconds: float = 0.0
+    open_since: float | None = None
+
+    def transition(self, old_state: str | None, new_state: str, timestamp: float) -> None:
+        if new_state == self.state:
+            if self.open_since is None:
+                self.open_since = timestamp
+        elif old_state == self.state and self.open_since is not None:
+            self.intervals.append((self.open_since, timestamp))
+            self.closed_seconds += timestamp - self.open_since
+            self.open_since = None
+            self._expire(timestamp - self.seconds)
+
+    def _expire(self, cutoff: float) -> None:
+        intervals = self.intervals
+        while intervals and intervals[0][1] <= cutoff:
+            start, end = intervals.popleft()
+            self.closed_seconds -= end - start
+
+    def minutes(self, now: float) -> float:
+        cutoff = now - self.seconds
+        self._expire(cutoff)
+        total = self.closed_seconds
+        if self.intervals and self.intervals[0][0] < cutoff:
+            total -= cutoff - self.intervals[0][0]
+        if self.open_since is not None:
+            total += now - max(self.open_since, cutoff)
+        return max(total, 0.0) / 60.0
+
+
+@dataclass(slots=True)
+class _DecayedActivity:
+    """State changes weighted by ``0.5 ** (age / half_life)``."""
+
+    feature_name: str
+    half_life: float
+    value: float = 0.0
+    updated_at: float = 0.0
+
+    def transition(self, timestamp: float) -> None:
+        self.value = self.at(timestamp) + 1.0
+        self.updated_at = timestamp
+
+    def at(self, now: float) -> float:
+        if not self.value:
+            return 0.0
+        return self.value * math.exp2(-max(now - self.updated_at, 0.0) / self.half_life)
+
+
+@dataclass(slots=True)
+class _EntityTiming:
+    """Current state and the timing operators requested for one entity."""
+
+    state: str | None = None
+    changed_at: float | None = None
+    # Last time each state named by a seconds_since_<state> feature was entered.
+    entered_at: dict[str, float | None] = field(default_factory=dict)
+    since_features: dict[str, str] = field(default_factory=dict)
+    durations: list[_StateDuration] = field(default_factory=list)
+    activities: list[_DecayedActivity] = field(default_factory=list)
+
+
+class EntityTimingTracker:
+    """Time-since, time-in-state and decayed activity features per entity."""
+
+    def __init__(self, feature_names: Iterable[str] = ()) -> None:
+        self._entities: dict[str, _EntityTiming] = {}
+        self._feature_names: tuple[str, ...] = ()
+        self.add_features(feature_names)
+
+    @property
+    def feature_names(self) -> tuple[str, ...]:
+        return self._feature_names
+
+    @property
+    def entity_ids(self) -> tuple[str, ...]:
+        return tuple(self._entities)
+
+    def add_features(self, feature_names: Iterable[str]) -> list[str]:
+        """Track the timing features among ``feature_names``.
+
+        Other names are ignored. Returns the entity ids seen for the first
+        time, which the caller should seed and start watching.
+        """
+        known = set(self._feature_names)
+        added: list[str] = []
+        new_entities: list[str] = []
+        for feature_name in feature_names:
+            match = _TIMING_FEATURE_RE.fullmatch(feature_name)
+            if match is None or feature_name in known:
+                continue
+            known.add(feature_name)
+            added.append(feature_name)
+            entity_id = match.group("entity")
+            timing = self._entities.get(entity_id)
+            if timing is None:
+                timing = self._entities[entity_id] = _EntityTiming()
+                new_entities.append(entity_id)
+            if match.group("since") is not None:
+                since = match.group("since")
+                timing.since_features[feature_name] = since
+                if since != _CHANGE and since not in timing.entered_at:
+                    entered = timing.changed_at if timing.state == since else None
+                    timing.entered_at[since] = entered
+            elif match.group("duration") is not None:
+                duration = _StateDuration(
+                    feature_name,
+                    match.group("duration_state"),
+                    _window_seconds(match.group("duration")),
+                )
+                if timing.state == duration.state and timing.changed_at is not None:
+                    duration.open_since = timing.changed_at
+                timing.durations.append(duration)
+            else:
+                timing.activities.append(
+                    _DecayedActivity(feature_name, _window_seconds(match.group("half_life")))
+                )
+        self._feature_names += tuple(added)
+        return new_entities
+
+    def seed(self, entity_id: str, state: str, last_changed: datetime | float) -> None:
+        """Set an entity's current state without counting it as a change.
+
+        Used for the state Home Assistant already holds, so time-since and
+        open intervals start from ``last_changed`` rather than from now.
+        """
+        timing = self._entities.get(entity_id)
+        if timing is None or timing.state is not None:
+            return
+        if isinstance(last_changed, datetime):
+            last_changed = last_changed.timestamp()
+        timing.state = state
+        timing.changed_at = last_changed
+        if state in timing.entered_at:
+            timing.entered_at[state] = last_changed
+        for duration in timing.durations:
+            if duration.state == state:
+                duration.open_since = last_changed
+
+    def record_state(
+        self,
+        entity_id: str,
+        state: str,
+        timestamp: datetime | float | None = None,
+    ) -> None:
+        """Apply a state change; attribute-only updates are ignored."""
+        timing = self._entities.get(entity_id)
+        if timing is None or state == timing.state:
+            return
+        if timestamp is None:
+            timestamp = time.time()
+        elif isinstance(timestamp, datetime):
+            timestamp = timestamp.timestamp()
+        old_state = timing.state
+        timing.state = state
+        timing.changed_at = timestamp
+        if state in timing.entered_at:
+            timing.entered_at[state] = timestamp
+        for duration in timing.durations:
+            duration.transition(old_state, state, timestamp)
+        for activity in timing.activities:
+            activity.transition(timestamp)
+
+    def compute_features(self, required_features: list[str]) -> dict[str, float]:
+        now = time.time()
+        features: dict[str, float] = {}
+        for timing in self._entities.values():
+            for feature_name, since in timing.since_features.items():
+                started = timing.changed_at if since == _CHANGE else timing.entered_at[since]
+                features[feature_name] = math.nan if started is None else max(now - started, 0.0)
+            for duration in timing.durations:
+                features[duration.feature_name] = (
+                    math.nan if timing.state is None else duration.minutes(now)
+                )
+            for activity in timing.activities:
+                features[activity.feature_name] = activity.at(now)
+        return features
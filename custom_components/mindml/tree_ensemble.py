@@ -0,0 +1,458 @@
+"""Pure-Python evaluator for LightGBM text-format tree ensembles."""
+
+from __future__ import annotations
+
+from array import array
+from dataclasses import dataclass
+from importlib import import_module
+from typing import Any, Sequence
+
+from .model import safe_sigmoid
+
+# Node kinds, derived from LightGBM's ``decision_type`` bit field.
+_NUMERICAL_MISSING_NONE = 0
+_NUMERICAL_MISSING_ZERO = 1
+_NUMERICAL_MISSING_NAN = 2
+_CATEGORICAL = 3
+
+_CATEGORICAL_MASK = 1
+_DEFAULT_LEFT_MASK = 2
+_ZERO_THRESHOLD = 1e-35
+
+_SIGMOID_OBJECTIVES = frozenset({"binary", "cross_entropy", "xentropy"})
+
+
+def _parse_numbers(raw: str, cast: type) -> list:
+    return [cast(token) for token in raw.split()] if raw.strip() else []
+
+
+@dataclass(frozen=True, slots=True)
+class OutputTransform:
+    """Objective-specific mapping from raw score to model output.
+
+    As in LightGBM, random-forest models report summed raw scores and
+    contributions; averaging only happens when converting to the output.
+    """
+
+    objective: str = "binary"
+    sigmoid: float = 1.0
+    average_over: int = 1
+
+    @classmethod
+    def from_header(
+        cls,
+        header: dict[str, str],
+        *,
+        average_output: bool,
+        num_trees: int,
+    ) -> OutputTransform:
+        tokens = header.get("objective", "binary").split()
+        sigmoid = 1.0
+        for token in tokens[1:]:
+            name, _, value = token.partition(":")
+            if name == "sigmoid":
+                sigmoid = float(value)
+        tree_per_iteration = max(int(header.get("num_tree_per_iteration", "1")), 1)
+        return cls(
+            objective=tokens[0] if tokens else "binary",
+            sigmoid=sigmoid,
+            average_over=max(num_trees // tree_per_iteration, 1) if average_output else 1,
+        )
+
+    @classmethod
+    def from_model_str(cls, model_str: str) -> OutputTransform:
+        """Read only the model header; payloads without one default to binary."""
+        header: dict[str, str] = {}
+        average_output = False
+        header_end = model_str.find("Tree=")
+        for raw_line in (model_str if header_end < 0 else model_str[:header_end]).splitlines():
+            line = raw_line.strip()
+            if line == "average_output":
+                average_output = True
+                continue
+            key, sep, value = line.partition("=")
+            if sep:
+                header[key] = value
+        return cls.from_header(
+            header,
+            average_output=average_output,
+            num_trees=len(header.get("tree_sizes", "").split()),
+        )
+
+    def __call__(self, raw_score: float) -> float:
+        if self.average_over != 1:
+            raw_score /= self.average_over
+        if self.objective in _SIGMOID_OBJECTIVES:
+            return safe_sigmoid(self.sigmoid * raw_score)
+        return raw_score
+
+    def apply_many(self, raw_scores: Any) -> Any:
+        """Vectorized ``__call__`` over a NumPy array of raw scores."""
+        numpy = import_module("numpy")
+        if self.average_over != 1:
+            raw_scores = raw_scores / self.average_over
+        if self.objective not in _SIGMOID_OBJECTIVES:
+            return raw_scores
+        scaled = self.sigmoid * raw_scores
+        # Same branch-free stable form as safe_sigmoid.
+        z = numpy.exp(-numpy.abs(scaled))
+        return numpy.where(scaled >= 0, 1.0 / (1.0 + z), z / (1.0 + z))
+
+
+class TreeEnsemble:
+    """LightGBM model parsed once into flat struct-of-arrays node tables.
+
+    Every tree is stored in shared arrays. Internal node references are
+    absolute indexes into the node tables and leaf references are encoded as
+    ``~leaf_index`` into the shared leaf table, mirroring LightGBM's layout.
+    """
+
+    def __init__(
+        self,
+        *,
+        num_features: int,
+        transform: OutputTransform,
+        roots: array,
+        split_feature: array,
+        threshold: array,
+        node_kind: array,
+        default_left: array,
+        left_child: array,
+        right_child: array,
+        internal_count: array,
+        leaf_value: array,
+        leaf_count: array,
+        tree_leaf_start: array,
+        cat_bitsets: dict[int, tuple[int, ...]],
+    ) -> None:
+        self.num_features = num_features
+        self.transform = transform
+        self._roots = roots
+        self._split_feature = split_feature
+        self._threshold = threshold
+        self._node_kind = node_kind
+        self._default_left = default_left
+        self._left_child = left_child
+        self._right_child = right_child
+        self._internal_count = internal_count
+        self._leaf_value = leaf_value
+        self._leaf_count = leaf_count
+        self._tree_leaf_start = tree_leaf_start
+        self._cat_bitsets = cat_bitsets
+
+    @property
+    def num_trees(self) -> int:
+        return len(self._roots)
+
+    @classmethod
+    def from_model_str(cls, *, model_str: str) -> TreeEnsemble:
+        """Parse a LightGBM ``model_to_string`` payload."""
+        header: dict[str, str] = {}
+        trees: list[dict[str, str]] = []
+        current: dict[str, str] | None = None
+        average_output = False
+        for raw_line in model_str.splitlines():
+            line = raw_line.strip()
+            if line == "end of trees":
+                break
+            if line.startswith("Tree="):
+                current = {}
+                trees.append(current)
+                continue
+            if line == "average_output":
+                average_output = True
+                continue
+            key, sep, value = line.partition("=")
+            if not sep:
+                continue
+            (current if current is not None else header)[key] = value
+
+        if not header.get("max_feature_idx") or not trees:
+            raise ValueError("not a LightGBM text model")
+        if int(header.get("num_class", "1")) != 1:
+            raise ValueError("multiclass LightGBM models are not supported")
+
+        roots = array("i")
+        split_feature = array("i")
+        threshold = array("d")
+        node_kind = array("B")
+        default_left = array("B")
+        left_child = array("i")
+        right_child = array("i")
+        internal_count = array("d")
+        leaf_value = array("d")
+        leaf_count = array("d")
+        tree_leaf_start = array("i")
+        cat_bitsets: dict[int, tuple[int, ...]] = {}
+
+        for tree in trees:
+            if tree.get("is_linear", "0") not in ("", "0"):
+                raise ValueError("linear LightGBM trees are not supported")
+            num_leaves = int(tree["num_leaves"])
+            node_offset = len(split_feature)
+            leaf_offset = len(leaf_value)
+            tree_leaf_start.append(leaf_offset)
+            values = _parse_numbers(tree["leaf_value"], float)
+            counts = _parse_numbers(tree.get("leaf_count", ""), float) or [0.0] * num_leaves
+            leaf_value.extend(values)
+            leaf_count.extend(counts)
+            if num_leaves == 1:
+                roots.append(~leaf_offset)
+                continue
+
+            features = _parse_numbers(tree["split_feature"], int)
+            thresholds = _parse_numbers(tree["threshold"], float)
+            decision_types = _parse_numbers(tree["decision_type"], int)
+            lefts = _parse_numbers(tree["left_child"], int)
+            rights = _parse_numbers(tree["right_child"], int)
+            counts = _parse_numbers(tree.get("internal_count", ""), float) or [0.0] * len(features)
+            cat_boundaries = _parse_numbers(tree.get("cat_boundaries", ""), int)
+            cat_threshold = _parse_numbers(tree.get("cat_threshold", ""), int)
+
+            def _absolute(child: int) -> int:
+                return ~(leaf_offset + ~child) if child < 0 else node_offset + child
+
+            for index, decision_type in enumerate(decision_types):
+                node = node_offset + index
+                if decision_type & _CATEGORICAL_MASK:
+                    kind = _CATEGORICAL
+                    cat_index = int(thresholds[index])
+                    cat_bitsets[node] = tuple(
+                        cat_threshold[cat_boundaries[cat_index] : cat_boundaries[cat_index + 1]]
+                    )
+                else:
+                    kind = (_NUMERICAL_MISSING_NONE, _NUMERICAL_MISSING_ZERO, _NUMERICAL_MISSING_NAN)[
+                        min((decision_type >> 2) & 3, 2)
+                    ]
+                split_feature.append(features[index])
+                threshold.append(thresholds[index])
+                node_kind.append(kind)
+                default_left.append(1 if decision_type & _DEFAULT_LEFT_MASK else 0)
+                left_child.append(_absolute(lefts[index]))
+                right_child.append(_absolute(rights[index]))
+                internal_count.append(counts[index])
+            roots.append(node_offset)
+
+        return cls(
+            num_features=int(header["max_feature_idx"]) + 1,
+            transform=OutputTransform.from_header(
+                header,
+                average_output=average_output,
+                num_trees=len(trees),
+            ),
+            roots=roots,
+            split_feature=split_feature,
+            threshold=threshold,
+            node_kind=node_kind,
+            default_left=default_left,
+            left_child=left_child,
+            right_child=right_child,
+            internal_count=internal_count,
+            leaf_value=leaf_value,
+            leaf_count=leaf_count,
+            tree_leaf_start=tree_leaf_start,
+            cat_bitsets=cat_bitsets,
+        )
+
+    def _next_node(self, node: int, fval: float) -> int:
+        """Return the child ``node`` routes ``fval`` to, using LightGBM semantics."""
+        kind = self._node_kind[node]
+        if kind == _CATEGORICAL:
+            if fval != fval or fval < 0:
+                return self._right_child[node]
+            category = int(fval)
+            bits = self._cat_bitsets[node]
+            word = category >> 5
+            if word < len(bits) and (bits[word] >> (category & 31)) & 1:
+                return self._left_child[node]
+            return self._right_child[node]
+        if fval != fval:
+            if kind == _NUMERICAL_MISSING_NAN:
+                return self._left_child[node] if self._default_left[node] else self._right_child[node]
+            fval = 0.0
+        if kind == _NUMERICAL_MISSING_ZERO and -_ZERO_THRESHOLD <= fval <= _ZERO_THRESHOLD:
+            return self._left_child[node] if self._default_left[node] else self._right_child[node]
+        return self._left_child[node] if fval <= self._threshold[node] else self._right_child[node]
+
+    def leaf_index(self, tree: int, row: Sequence[float]) -> int:
+        """Return the absolute leaf index ``row`` lands in for ``tree``."""
+        node = self._roots[tree]
+        split_feature = self._split_feature
+        threshold = self._threshold
+        node_kind = self._node_kind
+        left_child = self._left_child
+        right_child = self._right_child
+        while node >= 0:
+            fval = row[split_feature[node]]
+            # Plain numerical splits dominate; keep them off the slow path.
+            if node_kind[node] == _NUMERICAL_MISSING_NONE and fval == fval:
+                node = left_child[node] if fval <= threshold[node] else right_child[node]
+            else:
+                node = self._next_node(node, fval)
+        return ~node
+
+    def tree_output(self, tree: int, row: Sequence[float]) -> float:
+        """Return the leaf value ``tree`` contributes to the raw score of ``row``."""
+        return self._leaf_value[self.leaf_index(tree, row)]
+
+    def trees_by_feature(self) -> list[tuple[int, ...]]:
+        """Return, for every feature index, the trees that split on it."""
+        trees: list[set[int]] = [set() for _ in range(self.num_features)]
+        roots = self._roots
+        num_nodes = len(self._split_feature)
+        split_roots = [(root, tree) for tree, root in enumerate(roots) if root >= 0]
+        # Internal nodes of a tree are contiguous and start at its root.
+        for position, (start, tree) in enumerate(split_roots):
+            end = split_roots[position + 1][0] if position + 1 < len(split_roots) else num_nodes
+            for node in range(start, end):
+                trees[self._split_feature[node]].add(tree)
+        return [tuple(sorted(feature_trees)) for feature_trees in trees]
+
+    def predict_raw_row(self, row: Sequence[float]) -> float:
+        """Return the raw (margin) score for one row of model-ordered features."""
+        leaf_value = self._leaf_value
+        total = 0.0
+        for tree in range(len(self._roots)):
+            total += leaf_value[self.leaf_index(tree, row)]
+        return total
+
+    def _data_count(self, ref: int) -> float:
+        return self._internal_count[ref] if ref >= 0 else self._leaf_count[~ref]
+
+    def _expected_value(self, tree: int) -> float:
+        root = self._roots[tree]
+        if root < 0:
+            return self._leaf_value[~root]
+        start = self._tree_leaf_start[tree]
+        end = self._tree_leaf_start[tree + 1] if tree + 1 < len(self._roots) else len(self._leaf_value)
+        total_count = self._internal_count[root]
+        if not total_count:
+            return 0.0
+        return sum(
+            self._leaf_count[leaf] / total_count * self._leaf_value[leaf]
+            for leaf in range(start, end)
+        )
+
+    def predict_contrib_row(self, row: Sequence[float]) -> list[float]:
+        """Return TreeSHAP contributions; the last element is the expected value."""
+        phi = [0.0] * (self.num_features + 1)
+        for tree in range(len(self._roots)):
+            phi[-1] += self._expected_value(tree)
+            if self._roots[tree] >= 0:
+                self._tree_shap(row, phi, self._roots[tree], [], [], [], [], 1.0, 1.0, -1)
+        return phi
+
+    def _tree_shap(
+        self,
+        row: Sequence[float],
+        phi: list[float],
+        node: int,
+        features: list[int],
+        zeros: list[float],
+        ones: list[float],
+        weights: list[float],
+        zero_fraction: float,
+        one_fraction: float,
+        feature_index: int,
+    ) -> None:
+        # Port of LightGBM's Tree::TreeSHAP with the unique path kept as
+        # parallel lists that are copied per recursion level.
+        features = features + [feature_index]
+        zeros = zeros + [zero_fraction]
+        ones = ones + [one_fraction]
+        weights = weights + [1.0 if not weights else 0.0]
+        depth = len(features) - 1
+        for i in range(depth - 1, -1, -1):
+            weights[i + 1] += one_fraction * weights[i] * (i + 1) / (depth + 1)
+            weights[i] = zero_fraction * weights[i] * (depth - i) / (depth + 1)
+
+        if node < 0:
+            leaf = self._leaf_value[~node]
+            for i in range(1, depth + 1):
+                scale = _unwound_path_sum(zeros, ones, weights, depth, i)
+                phi[features[i]] += scale * (ones[i] - zeros[i]) * leaf
+            return
+
+        split = self._split_feature[node]
+        hot = self._next_node(node, row[split])
+        cold = self._right_child[node] if hot == self._left_child[node] else self._left_child[node]
+        count = self._data_count(node)
+        hot_zero_fraction = self._data_count(hot) / count if count else 0.0
+        cold_zero_fraction = self._data_count(cold) / count if count else 0.0
+        incoming_zero = 1.0
+        incoming_one = 1.0
+
+        if split in features:
+            path_index = features.index(split)
+            incoming_zero = zeros[path_index]
+            incoming_one = ones[path_index]
+            _unwind_path(features, zeros, ones, weights, depth, path_index)
+
+        self._tree_shap(
+            row, phi, hot, features, zeros, ones, weights,
+            hot_zero_fraction * incoming_zero, incoming_one, split,
+        )
+        self._tree_shap(
+            row, phi, cold, features, zeros, ones, weights,
+            cold_zero_fraction * incoming_zero, 0.0, split,
+        )
+
+    def predict(
+        self,
+        rows: Sequence[Sequence[float]],
+        raw_score: bool = False,
+        pred_contrib: bool = False,
+    ) -> list:
+        """Score rows with the same calling convention as ``lightgbm.Booster.predict``."""
+        if pred_contrib:
+            return [self.predict_contrib_row(row) for row in rows]
+        raw = [self.predict_raw_row(row) for row in rows]
+        if raw_score:
+            return raw
+        return [self.transform(value) for value in raw]
+
+
+def _unwound_path_sum(
+    zeros: list[float],
+    ones: list[float],
+    weights: list[float],
+    depth: int,
+    path_index: int,
+) -> float:
+    one_fraction = ones[path_index]
+    zero_fraction = zeros[path_index]
+    next_one_portion = weights[depth]
+    total = 0.0
+    for i in range(depth - 1, -1, -1):
+        if one_fraction != 0:
+            tmp = next_one_portion * (depth + 1) / ((i + 1) * one_fraction)
+            total += tmp
+            next_one_portion = weights[i] - tmp * zero_fraction * ((depth - i) / (depth + 1))
+        elif zero_fraction != 0:
+            total += (weights[i] / zero_fraction) / ((depth - i) / (depth + 1))
+    return total
+
+
+def _unwind_path(
+    features: list[int],
+    zeros: list[float],
+    ones: list[float],
+    weights: list[float],
+    depth: int,
+    path_index: int,
+) -> None:
+    one_fraction = ones[path_index]
+    zero_fraction = zeros[path_index]
+    next_one_portion = weights[depth]
+    for i in range(depth - 1, -1, -1):
+        if one_fraction != 0:
+            tmp = weights[i]
+            weights[i] = next_one_portion * (depth + 1) / ((i + 1) * one_fraction)
+            next_one_portion = tmp - weights[i] * zero_fraction * (depth - i) / (depth + 1)
+        elif zero_fraction != 0:
+            weights[i] = weights[i] * (depth + 1) / (zero_fraction * (depth - i))
+    del features[path_index]
+    del zeros[path_index]
+    del ones[path_index]
+    del weights[depth]
+
@@ -28,6 +28,8 @@ def _install_homeassistant_stubs() -> None:
     entity_platform = types.ModuleType("homeassistant.helpers.entity_platform")
     event_helpers = types.ModuleType("homeassistant.helpers.event")
     restore_state = types.ModuleType("homeassistant.helpers.restore_state")
+    storage = types.ModuleType("homeassistant.helpers.storage")
+    const = types.ModuleType("homeassistant.const")
 
     class ConfigFlow:
         @classmethod
@@ -91,6 +93,22 @@ def _install_homeassistant_stubs() -> None:
         async def async_get_last_state(self):
             return None
 
+    class Store:
+        def __init__(self, hass, version, key, **kwargs) -> None:
+            self.hass = hass
+            self.version = version
+            self.key = key
+            self.data = None
+
+        async def async_load(self):
+            return self.data
+
+        async def async_save(self, data) -> None:
+            self.data = data
+
+        def async_delay_save(self, data_func, delay: float = 0) -> None:
+            self.data = data_func()
+
     class SelectSelectorMode:
         DROPDOWN = "dropdown"
 
@@ -133,6 +151,8 @@ def _install_homeassistant_stubs() -> None:
     sensor_component.SensorEntity = SensorEntity
     sensor_component.SensorStateClass = SensorStateClass
     restore_state.RestoreEntity = RestoreEntity
+    storage.Store = Store
+    const.EVENT_HOMEASSISTANT_STOP = "homeassistant_stop"
     selector.SelectSelectorMode = SelectSelectorMode
     selector.SelectOptionDict = SelectOptionDict
     selector.SelectSelectorConfig = SelectSelectorConfig
@@ -141,6 +161,8 @@ def _install_homeassistant_stubs() -> None:
     selector.EntitySelector = EntitySelector
     entity_platform.AddEntitiesCallback = object
     event_helpers.async_track_state_change_event = lambda hass, entities, cb: lambda: None
+    event_helpers.async_track_time_interval = lambda hass, action, interval: lambda: None
+    event_helpers.async_track_point_in_time = lambda hass, action, point_in_time: lambda: None
     helpers.selector = selector
 
     sys.modules["homeassistant"] = homeassistant
@@ -154,6 +176,8 @@ def _install_homeassistant_stubs() -> None:
     sys.modules["homeassistant.helpers.entity_platform"] = entity_platform
     sys.modules["homeassistant.helpers.event"] = event_helpers
     sys.modules["homeassistant.helpers.restore_state"] = restore_state
+    sys.modules["homeassistant.helpers.storage"] = storage
+    sys.modules["homeassistant.const"] = const
 
 
 _install_homeassistant_stubs()
@@ -124,6 +124,26 @@ def test_options_flow_decision_updates_threshold() -> None:
     assert result["data"]["threshold"] == 72.5
 
 
+def test_options_flow_decision_updates_contribution_cadence() -> None:
+    entry = MagicMock()
+    entry.options = {}
+    entry.data = {"threshold": 50.0}
+
+    flow = ClrOptionsFlow(entry)
+    result = asyncio.run(
+        flow.async_step_decision(
+            {
+                "threshold": 60.0,
+                "contributions_every_n": 10,
+                "contributions_min_interval_seconds": 300,
+            }
+        )
+    )
+
+    assert result["data"]["contributions_every_n"] == 10
+    assert result["data"]["contributions_min_interval_seconds"] == 300.0
+
+
 def test_options_flow_features_updates_configuration() -> None:
     entry = MagicMock()
     entry.options = {}
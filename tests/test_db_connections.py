@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from custom_components.mindml.db_connections import (
+    close_connection_manager,
+    get_connection_manager,
+)
+
+
+def _create_db(db_path: Path) -> None:
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("CREATE TABLE items (value INTEGER)")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+def test_connection_manager_reuses_read_only_connections(tmp_path: Path) -> None:
+    db_path = tmp_path / "ml.db"
+    _create_db(db_path)
+    manager = get_connection_manager(str(db_path))
+    try:
+        assert get_connection_manager(str(tmp_path / "." / "ml.db")) is manager
+        with manager.read() as first:
+            assert first.execute("PRAGMA query_only").fetchone()[0] == 1
+            with pytest.raises(sqlite3.OperationalError):
+                first.execute("INSERT INTO items(value) VALUES (1)")
+        with manager.read() as second:
+            assert second is first
+    finally:
+        close_connection_manager(str(db_path))
+
+
+def test_connection_manager_serializes_writes_and_closes(tmp_path: Path) -> None:
+    db_path = tmp_path / "ml.db"
+    _create_db(db_path)
+    manager = get_connection_manager(str(db_path))
+
+    with manager.write() as conn:
+        conn.execute("INSERT INTO items(value) VALUES (7)")
+    with manager.read() as conn:
+        assert conn.execute("SELECT value FROM items").fetchall()[0][0] == 7
+        reader = conn
+
+    close_connection_manager(str(db_path))
+
+    with pytest.raises(sqlite3.ProgrammingError):
+        reader.execute("SELECT 1")
+    assert get_connection_manager(str(db_path)) is not manager
+    close_connection_manager(str(db_path))
+
+
+def test_connection_manager_never_creates_missing_database(tmp_path: Path) -> None:
+    with pytest.raises(FileNotFoundError):
+        get_connection_manager(str(tmp_path / "missing.db"))
+
+    assert not (tmp_path / "missing.db").exists()
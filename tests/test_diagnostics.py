@@ -39,3 +39,4 @@ def test_diagnostics_returns_structured_payload_with_redaction() -> None:
     assert payload["config"]["data"]["ml_db_path"] == "**REDACTED**"
     assert payload["config"]["data"]["bed_presence_entity"] == "binary_sensor.bedtime"
     assert payload["runtime"]["status"] == "ok"
+    assert set(payload["booster_cache"]) >= {"hits", "misses", "evictions"}
@@ -50,6 +50,7 @@ def test_config_entry_to_sensor_probability_smoke_path(monkeypatch) -> None:
     entry.options = {}
 
     sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    sensor._apply_loaded_model(sensor._load_model())
     sensor._recompute_state(datetime.now())
 
     assert sensor.available is True
@@ -3,6 +3,7 @@ from __future__ import annotations
 from custom_components.mindml.feature_mapping import (
     FEATURE_TYPE_CATEGORICAL,
     FEATURE_TYPE_NUMERIC,
+    compile_state_encoder,
     infer_feature_types_from_states,
     infer_state_mappings_from_states,
     parse_feature_types,
@@ -58,3 +59,20 @@ def test_infer_state_mappings_from_states_uses_common_defaults() -> None:
     )
     assert mappings["binary_sensor.window"] == {"on": 1.0, "off": 0.0}
     assert mappings["person.matt"] == {"home": 1.0, "away": 0.0}
+
+
+def test_compiled_state_encoders_match_numeric_table_and_default_encoding() -> None:
+    numeric = compile_state_encoder(FEATURE_TYPE_NUMERIC)
+    assert numeric("21.5") == (21.5, None)
+    assert numeric("on") == (None, None)
+
+    with_table = compile_state_encoder(FEATURE_TYPE_CATEGORICAL, {"Heat": 2.0, "on": 5.0})
+    assert with_table("heat") == (2.0, "heat")
+    assert with_table("ON") == (5.0, "ON")
+    assert with_table("closed") == (0.0, "closed")
+    assert with_table("3") == (3.0, None)
+    assert with_table("unknown_status") == (None, None)
+
+    defaults_only = compile_state_encoder(FEATURE_TYPE_CATEGORICAL)
+    assert defaults_only("away") == (0.0, "away")
+    assert defaults_only("away") is defaults_only("away")
@@ -16,6 +16,7 @@ sys.modules.setdefault("homeassistant.config_entries", config_entries)
 sys.modules.setdefault("homeassistant.core", core)
 
 from custom_components.mindml.feature_provider import (
+    FeaturePlan,
     FeatureVectorResult,
     HassStateFeatureProvider,
     RealtimeHistoryFeatureProvider,
@@ -50,6 +51,36 @@ def test_hass_feature_provider_maps_numeric_and_categorical_values() -> None:
     assert vector.mapped_state_values == {"binary_sensor.window": "on"}
 
 
+def test_hass_feature_provider_updates_only_changed_entities() -> None:
+    states = {"sensor.a": _State("1"), "sensor.b": _State("2"), "sensor.c": _State("3")}
+    hass = MagicMock()
+    hass.states.get.side_effect = states.get
+    plan = FeaturePlan(["sensor.c", "sensor.a", "sensor.b"])
+    provider = HassStateFeatureProvider(
+        hass=hass,
+        required_features=["sensor.a", "sensor.b", "sensor.c"],
+        feature_types={},
+        state_mappings={},
+        feature_plan=plan,
+    )
+    provider.load()
+    hass.states.get.reset_mock()
+
+    states["sensor.b"] = _State("unavailable")
+    vector = provider.load({"sensor.b", "sensor.unrelated"})
+
+    assert [call.args[0] for call in hass.states.get.call_args_list] == ["sensor.b"]
+    assert vector.feature_values == {"sensor.a": 1.0, "sensor.c": 3.0}
+    assert vector.missing_features == ["sensor.b"]
+    assert list(vector.ordered_row) == [3.0, 1.0, 0.0]
+
+    states["sensor.b"] = _State("5")
+    vector = provider.load({"sensor.b"})
+    assert vector.feature_values == {"sensor.a": 1.0, "sensor.b": 5.0, "sensor.c": 3.0}
+    assert vector.missing_features == []
+    assert list(vector.ordered_row) == [3.0, 1.0, 5.0]
+
+
 def test_hass_feature_provider_marks_missing_when_state_unmapped() -> None:
     hass = MagicMock()
     hass.states.get.return_value = _State("unknown_status")
@@ -135,3 +166,115 @@ def test_realtime_history_feature_provider_combines_state_and_history_features()
         "minutes_since_motion": 12.0,
     }
     assert vector.missing_features == []
+
+
+def test_feature_plan_fills_preallocated_row_in_model_order() -> None:
+    hass = MagicMock()
+    hass.states.get.side_effect = lambda entity_id: {
+        "sensor.temp": _State("21.5"),
+        "binary_sensor.window": _State("on"),
+    }.get(entity_id)
+    plan = FeaturePlan(["event_count", "binary_sensor.window", "sensor.temp"])
+    provider = RealtimeHistoryFeatureProvider(
+        hass=hass,
+        required_features=["sensor.temp", "binary_sensor.window", "event_count"],
+        feature_types={"binary_sensor.window": "categorical"},
+        state_mappings={"binary_sensor.window": {"on": 1.0, "off": 0.0}},
+        history_feature_loader=lambda required: {"event_count": 4},
+        feature_plan=plan,
+    )
+
+    vector = provider.load()
+
+    assert vector.ordered_row is plan.row
+    assert list(vector.ordered_row) == [4.0, 1.0, 21.5]
+
+    hass.states.get.side_effect = lambda entity_id: None
+    assert list(provider.load().ordered_row) == [4.0, 0.0, 0.0]
+
+
+def test_sqlite_snapshot_provider_reads_only_required_rows(tmp_path: Path) -> None:
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.execute("CREATE TABLE snapshot (feature_name TEXT, feature_value TEXT)")
+        conn.executemany(
+            "INSERT INTO snapshot(feature_name, feature_value) VALUES (?, ?)",
+            [(f"f{index}", str(index)) for index in range(2000)] + [("bad", "not-a-number")],
+        )
+        conn.commit()
+    finally:
+        conn.close()
+
+    small = SqliteSnapshotFeatureProvider(
+        db_path=str(db_path),
+        snapshot_view="snapshot",
+        required_features=["f3", "f1999", "missing"],
+    )
+    large = SqliteSnapshotFeatureProvider(
+        db_path=str(db_path),
+        snapshot_view="snapshot",
+        required_features=[f"f{index}" for index in range(0, 2000, 2)] + ["bad"],
+    )
+
+    small_vector = small.load()
+    large_vector = large.load()
+
+    assert small_vector.feature_values == {"f3": 3.0, "f1999": 1999.0}
+    assert small_vector.missing_features == ["missing"]
+    assert len(large_vector.feature_values) == 1000
+    assert large_vector.feature_values["f1998"] == 1998.0
+    assert large_vector.missing_features == ["bad"]
+
+
+def test_sqlite_snapshot_provider_reuses_vector_until_database_changes(tmp_path: Path) -> None:
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    writer = sqlite3.connect(db_path)
+    writer.execute("CREATE TABLE snapshot (feature_name TEXT, feature_value TEXT)")
+    writer.execute("INSERT INTO snapshot(feature_name, feature_value) VALUES ('a', '1')")
+    writer.commit()
+    provider = SqliteSnapshotFeatureProvider(
+        db_path=str(db_path),
+        snapshot_view="snapshot",
+        required_features=["a"],
+    )
+    try:
+        first = provider.load()
+        assert provider.load() is first
+
+        writer.execute("UPDATE snapshot SET feature_value = '2' WHERE feature_name = 'a'")
+        writer.commit()
+        second = provider.load()
+        assert second is not first
+        assert second.feature_values == {"a": 2.0}
+        assert provider.load() is second
+    finally:
+        provider.close()
+        writer.close()
+
+
+def test_sqlite_snapshot_results_keep_their_own_ordered_row(tmp_path: Path) -> None:
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    writer = sqlite3.connect(db_path)
+    writer.execute("CREATE TABLE snapshot (feature_name TEXT, feature_value TEXT)")
+    writer.execute("INSERT INTO snapshot(feature_name, feature_value) VALUES ('a', '1')")
+    writer.commit()
+    plan = FeaturePlan(["a", "b"])
+    provider = SqliteSnapshotFeatureProvider(
+        db_path=str(db_path),
+        snapshot_view="snapshot",
+        required_features=["a", "b"],
+        feature_plan=plan,
+    )
+    try:
+        first = provider.load()
+        writer.execute("UPDATE snapshot SET feature_value = '2' WHERE feature_name = 'a'")
+        writer.commit()
+        second = provider.load()
+
+        assert list(first.ordered_row) == [1.0, 0.0]
+        assert list(second.ordered_row) == [2.0, 0.0]
+        assert first.ordered_row is not plan.row
+    finally:
+        provider.close()
+        writer.close()
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import math
+import random
+
+import pytest
+
+from custom_components.mindml.incremental import (
+    IncrementalLinearScorer,
+    IncrementalTreeScorer,
+    build_incremental_scorer,
+)
+from custom_components.mindml.lightgbm_inference import LightGBMModelSpec, run_lightgbm_inference
+from custom_components.mindml.tree_ensemble import TreeEnsemble
+
+
+def _linear_model() -> LightGBMModelSpec:
+    return LightGBMModelSpec(
+        feature_names=["a", "b", "c"],
+        model_payload={"intercept": -0.5, "weights": [0.25, 2.0, -1.5]},
+    )
+
+
+def test_incremental_linear_scorer_applies_single_feature_delta() -> None:
+    scorer = IncrementalLinearScorer.from_model(_linear_model())
+    assert scorer is not None
+
+    values = {"a": 1.0, "b": 0.5, "c": 2.0}
+    assert scorer.score(values) == -0.5 + 0.25 + 1.0 - 3.0
+
+    values["b"] = 1.5
+    assert scorer.score(values, {"b"}) == -0.5 + 0.25 + 3.0 - 3.0
+    assert scorer.contributions == {"a": 0.25, "b": 3.0, "c": -3.0}
+
+
+def test_incremental_linear_scorer_ignores_unknown_changed_features() -> None:
+    scorer = IncrementalLinearScorer.from_model(_linear_model())
+    assert scorer is not None
+    values = {"a": 1.0, "b": 0.5, "c": 2.0}
+    baseline = scorer.score(values)
+
+    assert scorer.score(values, {"event_count", "sensor.unrelated"}) == baseline
+
+
+def test_incremental_linear_scorer_full_recompute_bounds_drift() -> None:
+    model = LightGBMModelSpec(
+        feature_names=[f"f{index}" for index in range(20)],
+        model_payload={"intercept": 0.1, "weights": [0.1 * (index + 1) for index in range(20)]},
+    )
+    scorer = IncrementalLinearScorer.from_model(model, full_recompute_every=50)
+    assert scorer is not None
+    rng = random.Random(5)
+    values = {name: rng.uniform(-10, 10) for name in model.feature_names}
+    scorer.score(values)
+
+    for _ in range(500):
+        name = rng.choice(model.feature_names)
+        values[name] = rng.uniform(-10, 10)
+        incremental = scorer.score(values, {name})
+        expected = run_lightgbm_inference(
+            feature_values=values,
+            missing_features=[],
+            model=model,
+            threshold=50.0,
+        ).linear_score
+        assert math.isclose(incremental, expected, rel_tol=1e-9, abs_tol=1e-9)
+
+
+def test_incremental_linear_scorer_skips_tree_payloads() -> None:
+    model = LightGBMModelSpec(
+        feature_names=["a"],
+        model_payload={"booster_model_str": "tree\nversion=v4\n"},
+    )
+
+    assert IncrementalLinearScorer.from_model(model) is None
+
+
+def test_inference_resyncs_scorer_after_missing_features() -> None:
+    model = _linear_model()
+    scorer = IncrementalLinearScorer.from_model(model)
+    assert scorer is not None
+    values = {"a": 1.0, "b": 0.5, "c": 2.0}
+    run_lightgbm_inference(
+        feature_values=values, missing_features=[], model=model, threshold=50.0, incremental_scorer=scorer
+    )
+
+    unavailable = run_lightgbm_inference(
+        feature_values={"a": 4.0, "b": 0.5},
+        missing_features=["c"],
+        model=model,
+        threshold=50.0,
+        incremental_scorer=scorer,
+    )
+    # "a" changed while the result was unavailable; the next call must not
+    # trust the stale cached value even if only "c" is reported as changed.
+    result = run_lightgbm_inference(
+        feature_values={"a": 4.0, "b": 0.5, "c": 2.0},
+        missing_features=[],
+        model=model,
+        threshold=50.0,
+        incremental_scorer=scorer,
+        changed_features={"c"},
+    )
+
+    assert unavailable.available is False
+    assert result.linear_score == -0.5 + 1.0 + 1.0 - 3.0
+    assert result.feature_contributions == {"a": 1.0, "b": 1.0, "c": -3.0}
+
+
+
+def test_inference_shares_linear_scorer_contributions_without_copying() -> None:
+    model = _linear_model()
+    scorer = IncrementalLinearScorer.from_model(model)
+    assert scorer is not None
+    values = {"a": 1.0, "b": 0.5, "c": 2.0}
+    first = run_lightgbm_inference(
+        feature_values=values, missing_features=[], model=model, threshold=50.0, incremental_scorer=scorer
+    )
+
+    values["b"] = 1.0
+    second = run_lightgbm_inference(
+        feature_values=values,
+        missing_features=[],
+        model=model,
+        threshold=50.0,
+        incremental_scorer=scorer,
+        changed_features={"b"},
+    )
+
+    assert first.feature_contributions is scorer.contributions
+    assert second.feature_contributions is scorer.contributions
+    assert second.feature_contributions == {"a": 0.25, "b": 2.0, "c": -3.0}
+
+# Tree 0 splits on "a" only, tree 1 on "b" only.
+_TWO_TREE_MODEL_STR = """tree
+version=v4
+num_class=1
+num_tree_per_iteration=1
+label_index=0
+max_feature_idx=1
+objective=binary sigmoid:1
+feature_names=a b
+feature_infos=[-1:1] [-1:1]
+tree_sizes=0 0
+
+Tree=0
+num_leaves=2
+num_cat=0
+split_feature=0
+split_gain=1
+threshold=0
+decision_type=2
+left_child=-1
+right_child=-2
+leaf_value=-1 1
+leaf_weight=1 1
+leaf_count=50 50
+internal_value=0
+internal_weight=0
+internal_count=100
+is_linear=0
+shrinkage=1
+
+
+Tree=1
+num_leaves=2
+num_cat=0
+split_feature=1
+split_gain=1
+threshold=0
+decision_type=2
+left_child=-1
+right_child=-2
+leaf_value=0.25 0.75
+leaf_weight=1 1
+leaf_count=50 50
+internal_value=0
+internal_weight=0
+internal_count=100
+is_linear=0
+shrinkage=1
+
+
+end of trees
+"""
+
+
+def test_incremental_tree_scorer_rewalks_only_affected_trees(monkeypatch) -> None:
+    model = LightGBMModelSpec(
+        feature_names=["a", "b"],
+        model_payload={"booster_model_str": _TWO_TREE_MODEL_STR},
+    )
+    scorer = build_incremental_scorer(model)
+    assert isinstance(scorer, IncrementalTreeScorer)
+    values = {"a": -0.5, "b": -0.5}
+    assert scorer.score(values) == -1.0 + 0.25
+
+    walked: list[int] = []
+    original = TreeEnsemble.tree_output
+
+    def _tracking(self, tree, row):
+        walked.append(tree)
+        return original(self, tree, row)
+
+    monkeypatch.setattr(TreeEnsemble, "tree_output", _tracking)
+    values["b"] = 0.5
+
+    assert scorer.score(values, {"b", "event_count"}) == -1.0 + 0.75
+    assert walked == [1]
+
+
+def test_inference_uses_tree_scorer_for_raw_score_only() -> None:
+    model = LightGBMModelSpec(
+        feature_names=["a", "b"],
+        model_payload={"booster_model_str": _TWO_TREE_MODEL_STR},
+    )
+    scorer = build_incremental_scorer(model)
+    values = {"a": 0.5, "b": -0.5}
+
+    result = run_lightgbm_inference(
+        feature_values=values,
+        missing_features=[],
+        model=model,
+        threshold=50.0,
+        compute_contributions=False,
+        incremental_scorer=scorer,
+    )
+
+    assert result.linear_score == 1.25
+    assert math.isclose(result.raw_probability, 1.0 / (1.0 + math.exp(-1.25)))
+    assert result.feature_contributions == {}
+
+
+def test_incremental_tree_scorer_matches_lightgbm_after_updates() -> None:
+    lightgbm = pytest.importorskip("lightgbm")
+    np = pytest.importorskip("numpy")
+
+    rng = np.random.default_rng(11)
+    features = rng.normal(size=(800, 6))
+    labels = (features[:, 0] + features[:, 3] > 0).astype(int)
+    booster = lightgbm.train(
+        {"objective": "binary", "num_leaves": 7, "verbose": -1},
+        lightgbm.Dataset(features, labels),
+        num_boost_round=40,
+    )
+    names = [f"f{index}" for index in range(6)]
+    model = LightGBMModelSpec(
+        feature_names=names,
+        model_payload={"booster_model_str": booster.model_to_string()},
+    )
+    scorer = IncrementalTreeScorer.from_model(model, full_recompute_every=25)
+    assert scorer is not None
+    values = dict(zip(names, features[0].tolist()))
+    scorer.score(values)
+
+    for step in range(100):
+        name = names[step % len(names)]
+        values[name] = float(rng.normal())
+        incremental = scorer.score(values, {name})
+        expected = booster.predict([[values[feature] for feature in names]], raw_score=True)[0]
+        assert math.isclose(incremental, expected, abs_tol=1e-9)
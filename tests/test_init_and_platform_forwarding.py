@@ -49,3 +49,27 @@ def test_async_unload_entry_unloads_platforms_and_cleans_up() -> None:
     assert result is True
     hass.config_entries.async_unload_platforms.assert_awaited_once()
     assert "entry-1" not in hass.data[DOMAIN]
+
+
+def test_async_unload_entry_closes_connections_for_unused_db_path(monkeypatch) -> None:
+    closed: list[str] = []
+    monkeypatch.setattr(
+        "custom_components.mindml.close_connection_manager",
+        closed.append,
+    )
+    hass = MagicMock()
+    hass.data = {
+        DOMAIN: {
+            "entry-1": {"ml_db_path": "/config/a.db"},
+            "entry-2": {"ml_db_path": "/config/b.db"},
+            "entry-3": {"ml_db_path": "/config/b.db"},
+        }
+    }
+    hass.config_entries.async_unload_platforms = AsyncMock(return_value=True)
+
+    for entry_id in ("entry-1", "entry-2"):
+        entry = MagicMock()
+        entry.entry_id = entry_id
+        asyncio.run(async_unload_entry(hass, entry))
+
+    assert closed == ["/config/a.db"]
@@ -1,7 +1,11 @@
 from __future__ import annotations
 
+import math
 import sys
 import types
+from array import array
+
+import pytest
 
 homeassistant = types.ModuleType("homeassistant")
 config_entries = types.ModuleType("homeassistant.config_entries")
@@ -13,7 +17,10 @@ sys.modules.setdefault("homeassistant.config_entries", config_entries)
 sys.modules.setdefault("homeassistant.core", core)
 
 from custom_components.mindml.lightgbm_inference import (
+    BoosterCache,
     LightGBMModelSpec,
+    booster_cache_stats,
+    clear_booster_cache,
     run_lightgbm_inference,
 )
 
@@ -35,17 +42,20 @@ def test_lightgbm_inference_returns_unavailable_when_missing_features() -> None:
 
 
 def test_lightgbm_inference_uses_booster_model_str_for_probability(monkeypatch) -> None:
+    predict_calls: list[tuple[bool, bool]] = []
+
     class _Booster:
         def __init__(self, *, model_str: str) -> None:
             assert model_str == "serialized-booster"
 
         def predict(self, rows, raw_score: bool = False, pred_contrib: bool = False):
             assert rows == [[4.0, 0.5]]
+            predict_calls.append((raw_score, pred_contrib))
             if pred_contrib:
-                return [[0.8, 0.1, -0.7]]
+                return [[0.5, 0.125, -0.375]]
             if raw_score:
-                return [0.2]
-            return [0.549833997312478]
+                return [0.25]
+            return [0.5621765008857981]
 
     monkeypatch.setitem(sys.modules, "lightgbm", types.SimpleNamespace(Booster=_Booster))
 
@@ -60,10 +70,11 @@ def test_lightgbm_inference_uses_booster_model_str_for_probability(monkeypatch)
     )
 
     assert result.available is True
-    assert result.linear_score == 0.2
-    assert result.raw_probability == 0.549833997312478
-    assert result.native_value == 54.98339973124779
-    assert result.feature_contributions == {"event_count": 0.8, "on_ratio": 0.1}
+    assert result.linear_score == 0.25
+    assert result.raw_probability == 0.5621765008857981
+    assert result.native_value == 56.21765008857981
+    assert result.feature_contributions == {"event_count": 0.5, "on_ratio": 0.125}
+    assert predict_calls == [(False, True)]
     assert result.is_above_threshold is True
     assert result.decision == "positive"
 
@@ -125,3 +136,233 @@ def test_lightgbm_inference_returns_unavailable_when_model_payload_missing() ->
     assert result.available is False
     assert result.native_value is None
     assert result.unavailable_reason == "model_payload_missing"
+
+
+def test_lightgbm_inference_reuses_cached_booster_for_same_model_str(monkeypatch) -> None:
+    built: list[str] = []
+
+    class _Booster:
+        def __init__(self, *, model_str: str) -> None:
+            built.append(model_str)
+
+        def predict(self, rows, raw_score: bool = False, pred_contrib: bool = False):
+            if pred_contrib:
+                return [[0.0, 0.0, 0.0]]
+            return [0.0 if raw_score else 0.5]
+
+    monkeypatch.setitem(sys.modules, "lightgbm", types.SimpleNamespace(Booster=_Booster))
+    clear_booster_cache()
+    model = LightGBMModelSpec(
+        feature_names=["event_count", "on_ratio"],
+        model_payload={"booster_model_str": "cached-booster"},
+    )
+
+    for _ in range(3):
+        result = run_lightgbm_inference(
+            feature_values={"event_count": 4.0, "on_ratio": 0.5},
+            missing_features=[],
+            model=model,
+            threshold=50.0,
+        )
+        assert result.available is True
+
+    stats = booster_cache_stats()
+    assert built == ["cached-booster"]
+    assert stats.misses == 1
+    assert stats.hits == 2
+    assert stats.entries == 1
+
+
+def test_lightgbm_inference_hashes_booster_once_per_model_spec(monkeypatch) -> None:
+    from custom_components.mindml import lightgbm_inference
+
+    class _Booster:
+        def __init__(self, *, model_str: str) -> None:
+            pass
+
+        def predict(self, rows, raw_score: bool = False, pred_contrib: bool = False):
+            return [0.0 if raw_score else 0.5]
+
+    digests: list[str] = []
+    original_digest = lightgbm_inference.model_str_digest
+
+    def _counting_digest(model_str: str) -> str:
+        digests.append(model_str)
+        return original_digest(model_str)
+
+    monkeypatch.setitem(sys.modules, "lightgbm", types.SimpleNamespace(Booster=_Booster))
+    monkeypatch.setattr(lightgbm_inference, "model_str_digest", _counting_digest)
+    clear_booster_cache()
+    model = LightGBMModelSpec(
+        feature_names=["event_count"],
+        model_payload={"booster_model_str": "digest-booster"},
+    )
+
+    for _ in range(3):
+        run_lightgbm_inference(
+            feature_values={"event_count": 1.0},
+            missing_features=[],
+            model=model,
+            threshold=50.0,
+            compute_contributions=False,
+        )
+
+    assert digests == ["digest-booster"]
+    assert not hasattr(lightgbm_inference._BOOSTER_CACHE, "_digests")
+
+
+def test_booster_cache_evicts_least_recently_used_when_over_budget() -> None:
+    cache = BoosterCache(max_bytes=10)
+    builder = lambda *, model_str: object()  # noqa: E731
+
+    first = cache.get_or_build("aaaa", builder)
+    cache.get_or_build("bbbb", builder)
+    assert cache.get_or_build("aaaa", builder) is first
+    cache.get_or_build("cccc", builder)
+
+    stats = cache.stats()
+    assert stats.evictions == 1
+    assert stats.entries == 2
+    assert stats.size_bytes == 8
+    assert cache.get_or_build("aaaa", builder) is first
+    assert cache.stats().misses == 3
+
+
+def test_booster_cache_does_not_cache_failed_builds() -> None:
+    cache = BoosterCache(max_bytes=1024)
+
+    def _failing(*, model_str: str) -> object:
+        raise ValueError(model_str)
+
+    for _ in range(2):
+        try:
+            cache.get_or_build("bad", _failing)
+        except ValueError:
+            pass
+
+    stats = cache.stats()
+    assert stats.entries == 0
+    assert stats.misses == 2
+
+
+def test_lightgbm_inference_skips_contribution_pass_when_not_requested(monkeypatch) -> None:
+    predict_calls: list[tuple[bool, bool]] = []
+
+    class _Booster:
+        def __init__(self, *, model_str: str) -> None:
+            pass
+
+        def predict(self, rows, raw_score: bool = False, pred_contrib: bool = False):
+            predict_calls.append((raw_score, pred_contrib))
+            return [0.25]
+
+    monkeypatch.setitem(sys.modules, "lightgbm", types.SimpleNamespace(Booster=_Booster))
+
+    result = run_lightgbm_inference(
+        feature_values={"event_count": 4.0, "on_ratio": 0.5},
+        missing_features=[],
+        model=LightGBMModelSpec(
+            feature_names=["event_count", "on_ratio"],
+            model_payload={"booster_model_str": "raw-only-booster"},
+        ),
+        threshold=50.0,
+        compute_contributions=False,
+    )
+
+    assert result.available is True
+    assert result.linear_score == 0.25
+    assert result.raw_probability == 0.5621765008857981
+    assert result.feature_contributions == {}
+    assert predict_calls == [(True, False)]
+
+
+def test_predict_batch_scores_linear_rows_like_single_row_inference(monkeypatch) -> None:
+    monkeypatch.setattr(
+        "custom_components.mindml.lightgbm_inference._optional_numpy",
+        lambda: None,
+    )
+    model = LightGBMModelSpec(
+        feature_names=["event_count", "on_ratio"],
+        model_payload={"intercept": -1.0, "weights": [0.4, 0.3]},
+    )
+    rows = [[4.0, 0.5], [0.0, 0.0], [1.0, 1.0]]
+
+    batch = model.predict_batch(rows, threshold=50.0)
+
+    assert list(batch.raw_scores) == [0.75, -1.0, -0.30000000000000004]
+    for index, row in enumerate(rows):
+        single = run_lightgbm_inference(
+            feature_values=dict(zip(model.feature_names, row)),
+            missing_features=[],
+            model=model,
+            threshold=50.0,
+        )
+        assert math.isclose(batch.probabilities[index], single.raw_probability)
+        assert batch.decisions[index] == single.decision
+
+
+def test_predict_batch_uses_numpy_for_linear_rows_when_available() -> None:
+    numpy = pytest.importorskip("numpy")
+    model = LightGBMModelSpec(
+        feature_names=["event_count", "on_ratio"],
+        model_payload={"intercept": -1.0, "weights": [0.4, 0.3]},
+    )
+
+    batch = model.predict_batch(numpy.array([[4.0, 0.5], [0.0, 0.0]]), threshold=50.0)
+
+    assert list(batch.raw_scores) == pytest.approx([0.75, -1.0])
+    assert batch.decisions == ["positive", "negative"]
+
+
+def test_predict_batch_scores_all_tree_rows_in_one_booster_call(monkeypatch) -> None:
+    predict_calls: list[tuple[int, bool, bool]] = []
+
+    class _Booster:
+        def __init__(self, *, model_str: str) -> None:
+            pass
+
+        def predict(self, rows, raw_score: bool = False, pred_contrib: bool = False):
+            predict_calls.append((len(rows), raw_score, pred_contrib))
+            return [row[0] - row[1] for row in rows]
+
+    monkeypatch.setitem(sys.modules, "lightgbm", types.SimpleNamespace(Booster=_Booster))
+    monkeypatch.setattr(
+        "custom_components.mindml.lightgbm_inference._optional_numpy",
+        lambda: None,
+    )
+    model = LightGBMModelSpec(
+        feature_names=["event_count", "on_ratio"],
+        model_payload={"booster_model_str": "batch-booster"},
+    )
+
+    batch = model.predict_batch([[1.0, 0.0], [0.0, 2.0], [0.5, 0.5]], threshold=50.0)
+
+    assert predict_calls == [(3, True, False)]
+    assert list(batch.raw_scores) == [1.0, -2.0, 0.0]
+    assert batch.probabilities[2] == 0.5
+    assert batch.decisions == ["positive", "negative", "positive"]
+
+
+def test_predict_batch_raises_when_payload_missing() -> None:
+    model = LightGBMModelSpec(feature_names=["event_count"], model_payload={})
+
+    with pytest.raises(ValueError, match="model_payload_missing"):
+        model.predict_batch([[1.0]], threshold=50.0)
+
+
+def test_inference_reads_prebuilt_ordered_row_instead_of_feature_values() -> None:
+    model = LightGBMModelSpec(
+        feature_names=["a", "b"],
+        model_payload={"intercept": 0.5, "weights": [2.0, -1.0]},
+    )
+
+    result = run_lightgbm_inference(
+        feature_values={},
+        missing_features=[],
+        model=model,
+        threshold=50.0,
+        ordered_row=array("d", [1.0, 4.0]),
+    )
+
+    assert result.linear_score == 0.5 + 2.0 - 4.0
+    assert result.feature_contributions == {"a": 2.0, "b": -4.0}
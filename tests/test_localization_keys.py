@@ -63,3 +63,15 @@ def test_options_features_strings_include_management_action() -> None:
 
     options_features_data = strings["options"]["step"]["features"]["data"]
     assert "action" in options_features_data
+
+
+def test_translations_label_every_feature_source_option() -> None:
+    strings = json.loads(Path("custom_components/mindml/strings.json").read_text())
+    english = json.loads(Path("custom_components/mindml/translations/en.json").read_text())
+
+    strings_step = strings["options"]["step"]["feature_source"]
+    english_step = english["options"]["step"]["feature_source"]
+
+    assert english_step["data"] == strings_step["data"]
+    assert "rolling_window_bucket_seconds" in english_step["data"]
+    assert english_step["data_description"] == strings_step["data_description"]
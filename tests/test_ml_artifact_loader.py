@@ -16,6 +16,7 @@ sys.modules.setdefault("homeassistant.config_entries", config_entries)
 sys.modules.setdefault("homeassistant.core", core)
 
 from custom_components.mindml.ml_artifact import (
+    ArtifactChangeDetector,
     load_latest_lightgbm_model_artifact,
 )
 
@@ -66,3 +67,51 @@ def test_load_latest_lightgbm_model_artifact_parses_payload(tmp_path: Path) -> N
     assert artifact.feature_names == ["event_count", "on_ratio"]
     assert artifact.model_payload["type"] == "lightgbm_binary_classifier"
     assert artifact.model_payload["booster_model_str"] == "tree\nversion=v4\nend of trees\n"
+
+
+def test_artifact_change_detector_reports_new_artifacts_only(tmp_path: Path) -> None:
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    writer = sqlite3.connect(db_path)
+    writer.executescript(
+        """
+        CREATE TABLE lightgbm_model_artifacts (
+            id INTEGER PRIMARY KEY,
+            created_at_utc TEXT NOT NULL
+        );
+        CREATE VIEW vw_lightgbm_latest_model_artifact AS
+        SELECT * FROM lightgbm_model_artifacts ORDER BY created_at_utc DESC LIMIT 1;
+        CREATE TABLE unrelated (value INTEGER);
+        INSERT INTO lightgbm_model_artifacts(created_at_utc) VALUES ('2026-02-25T00:00:00+00:00');
+        """
+    )
+    writer.commit()
+    detector = ArtifactChangeDetector(
+        db_path=str(db_path),
+        artifact_view="vw_lightgbm_latest_model_artifact",
+    )
+    try:
+        assert detector.check() is True
+        assert detector.check() is False
+
+        writer.execute("INSERT INTO unrelated(value) VALUES (1)")
+        writer.commit()
+        assert detector.check() is False
+
+        writer.execute(
+            "INSERT INTO lightgbm_model_artifacts(created_at_utc) VALUES ('2026-02-26T00:00:00+00:00')"
+        )
+        writer.commit()
+        assert detector.check() is True
+        assert detector.check() is False
+    finally:
+        detector.close()
+        writer.close()
+
+
+def test_artifact_change_detector_ignores_missing_database(tmp_path: Path) -> None:
+    detector = ArtifactChangeDetector(
+        db_path=str(tmp_path / "missing.db"),
+        artifact_view="vw_lightgbm_latest_model_artifact",
+    )
+
+    assert detector.check() is False
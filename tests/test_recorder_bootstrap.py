@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import time
+
+import pytest
+
+from custom_components.mindml.recorder_bootstrap import iter_recorder_events
+from custom_components.mindml.rolling_window import (
+    BucketedRollingWindowTracker,
+    RollingWindowTracker,
+)
+
+
+def test_backfilled_copy_is_adopted_with_feature_state_filter() -> None:
+    tracker = RollingWindowTracker(
+        window_hours=1.0,
+        feature_states={"binary_sensor.motion": "on"},
+        extra_window_hours=(0.25,),
+    )
+    backfill = tracker.empty_copy()
+    now = time.time()
+    for entity_id, state, age in (
+        ("binary_sensor.motion", "on", 7200.0),
+        ("binary_sensor.motion", "on", 1800.0),
+        ("binary_sensor.motion", "off", 600.0),
+        ("binary_sensor.motion", "on", 300.0),
+        ("binary_sensor.door", "on", 60.0),
+    ):
+        backfill.record_event(entity_id, state, now - age)
+
+    assert tracker.adopt(backfill) == 2
+    result = tracker.compute_features([])
+    assert result["event_count"] == 2.0
+    assert result["event_count_15m"] == 1.0
+
+    assert tracker.adopt(backfill) == 0
+
+
+@pytest.mark.parametrize(
+    "make_tracker",
+    [
+        lambda: RollingWindowTracker(window_hours=1.0, extra_window_hours=(24.0,)),
+        lambda: BucketedRollingWindowTracker(
+            window_hours=1.0, extra_window_hours=(24.0,), bucket_seconds=60.0
+        ),
+    ],
+)
+def test_backfill_fills_in_before_live_events(make_tracker) -> None:
+    tracker = make_tracker()
+    backfill = tracker.empty_copy()
+    now = time.time()
+    # The live events arrived while the recorder was queried.
+    tracker.record_event("sensor.other", "off", now - 300.0)
+    tracker.record_event("binary_sensor.motion", "on", now - 120.0)
+    for entity_id, state, age in (
+        ("binary_sensor.motion", "on", 20 * 3600.0),
+        ("binary_sensor.motion", "off", 1800.0),
+        ("sensor.other", "off", 300.0),
+    ):
+        backfill.record_event(entity_id, state, now - age)
+
+    assert tracker.adopt(backfill) == 2
+    result = tracker.compute_features([])
+    assert result["event_count_24h"] == 4.0
+    assert result["on_ratio_24h"] == 0.5
+    assert result["event_count"] == 3.0
+    assert tracker.adopt(backfill) == 0
+
+
+def test_iter_recorder_events_streams_watched_entities_in_time_order() -> None:
+    sqlalchemy = pytest.importorskip("sqlalchemy")
+    engine = sqlalchemy.create_engine("sqlite://")
+    with engine.begin() as conn:
+        conn.exec_driver_sql(
+            "CREATE TABLE states_meta (metadata_id INTEGER PRIMARY KEY, entity_id TEXT)"
+        )
+        conn.exec_driver_sql(
+            "CREATE TABLE states (state_id INTEGER PRIMARY KEY, metadata_id INTEGER,"
+            " state TEXT, last_updated_ts FLOAT)"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO states_meta VALUES (1, 'binary_sensor.motion'), (2, 'sensor.other')"
+        )
+        conn.exec_driver_sql(
+            "INSERT INTO states(metadata_id, state, last_updated_ts) VALUES"
+            " (1, 'on', 30.0), (2, 'on', 20.0), (1, 'off', 10.0), (1, NULL, 40.0), (1, 'on', 1.0)"
+        )
+
+    with sqlalchemy.orm.Session(engine) as session:
+        rows = list(iter_recorder_events(session, ["binary_sensor.motion"], 5.0))
+
+    assert rows == [("binary_sensor.motion", "off", 10.0), ("binary_sensor.motion", "on", 30.0)]
@@ -2,9 +2,16 @@
 
 from __future__ import annotations
 
+import tracemalloc
+from collections import deque
 from datetime import UTC, datetime, timedelta
 
-from custom_components.mindml.rolling_window import RollingWindowTracker
+from custom_components.mindml.rolling_window import (
+    BucketedRollingWindowTracker,
+    RollingWindowTracker,
+    window_suffix,
+    windows_for_features,
+)
 
 
 def test_empty_tracker_returns_zero_event_count() -> None:
@@ -52,10 +59,11 @@ def test_on_ratio_mixed_events() -> None:
 def test_old_events_pruned() -> None:
     tracker = RollingWindowTracker(window_hours=1.0)
     old_time = datetime.now(UTC) - timedelta(hours=2)
-    tracker._events.append((old_time, "binary_sensor.motion", "on"))
-    tracker.record_event("binary_sensor.motion", "on")
+    tracker.record_event("binary_sensor.motion", "on", timestamp=old_time)
+    tracker.record_event("binary_sensor.motion", "off")
     result = tracker.compute_features(["event_count"])
     assert result["event_count"] == 1.0
+    assert result["on_ratio"] == 0.0
 
 
 def test_ingestion_filter_matching_event_recorded() -> None:
@@ -106,3 +114,251 @@ def test_returns_both_even_with_unrelated_required_features() -> None:
     tracker.record_event("binary_sensor.motion", "on")
     result = tracker.compute_features(["sensor.a", "sensor.b"])
     assert result == {"event_count": 1.0, "on_ratio": 1.0}
+
+
+def test_ring_buffer_keeps_order_across_wraparound_growth_and_shrink() -> None:
+    tracker = RollingWindowTracker(window_hours=1.0)
+    now = datetime.now(UTC)
+    # 100 stale events, then enough fresh ones to wrap and grow the buffer.
+    for index in range(100):
+        tracker.record_event("binary_sensor.motion", "on", now - timedelta(hours=2, seconds=-index))
+    tracker.compute_features([])
+    for index in range(300):
+        state = "on" if index % 3 == 0 else "off"
+        tracker.record_event("binary_sensor.motion", state, now - timedelta(minutes=30))
+    result = tracker.compute_features([])
+    assert result == {"event_count": 300.0, "on_ratio": 100 / 300}
+
+    for index in range(10):
+        tracker.record_event("binary_sensor.door", "on", now)
+    tracker._prune(now.timestamp() + 45 * 60)
+    assert tracker.event_count == 10
+    assert tracker._state_count(tracker._windows[0], "on") == 10
+    assert len(tracker._events._timestamps) == 64
+
+
+def test_event_storage_is_an_order_of_magnitude_smaller_than_tuples() -> None:
+    count = 4096
+    now = datetime.now(UTC)
+    timestamps = [now - timedelta(seconds=count - index) for index in range(count)]
+
+    tracker = RollingWindowTracker(window_hours=7.0)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        for index, timestamp in enumerate(timestamps):
+            tracker.record_event("binary_sensor.motion", "on" if index % 2 else "off", timestamp)
+        compact_bytes = tracemalloc.get_traced_memory()[0] - before
+
+        before = tracemalloc.get_traced_memory()[0]
+        tuples: deque[tuple[datetime, str, str]] = deque()
+        for index, timestamp in enumerate(timestamps):
+            tuples.append((timestamp + timedelta(0), "binary_sensor.motion", "on" if index % 2 else "off"))
+        tuple_bytes = tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+    assert tracker.event_count == count
+    assert compact_bytes / count < 16
+    assert tuple_bytes >= 8 * compact_bytes
+
+
+def test_multiple_windows_share_one_event_log() -> None:
+    tracker = RollingWindowTracker(window_hours=7.0, extra_window_hours=(0.25, 1.0, 24.0))
+    now = datetime.now(UTC)
+    events = [
+        (timedelta(hours=20), "on"),
+        (timedelta(hours=3), "off"),
+        (timedelta(minutes=30), "on"),
+        (timedelta(minutes=5), "off"),
+    ]
+    for age, state in events:
+        tracker.record_event("binary_sensor.motion", state, now - age)
+
+    result = tracker.compute_features([])
+
+    assert tracker.feature_names == (
+        "event_count", "on_ratio",
+        "event_count_15m", "on_ratio_15m",
+        "event_count_1h", "on_ratio_1h",
+        "event_count_24h", "on_ratio_24h",
+    )
+    assert result["event_count"] == 3.0
+    assert result["on_ratio"] == 1 / 3
+    assert result["event_count_15m"] == 1.0
+    assert result["on_ratio_15m"] == 0.0
+    assert result["event_count_1h"] == 2.0
+    assert result["on_ratio_1h"] == 0.5
+    assert result["event_count_24h"] == 4.0
+    assert result["on_ratio_24h"] == 0.5
+    assert tracker.event_count == 3
+    assert len(tracker._events) == 4
+
+
+def test_added_window_counts_events_already_in_the_log() -> None:
+    tracker = RollingWindowTracker(window_hours=7.0)
+    now = datetime.now(UTC)
+    tracker.record_event("binary_sensor.motion", "on", now - timedelta(hours=2))
+    tracker.record_event("binary_sensor.motion", "on", now - timedelta(minutes=10))
+
+    tracker.add_windows(windows_for_features(["sensor.a", "event_count_1h", "on_ratio_1h"]))
+
+    assert tracker.compute_features([])["event_count_1h"] == 1.0
+
+
+def test_window_suffixes_round_trip_through_feature_names() -> None:
+    assert [window_suffix(hours) for hours in (0.25, 1.0, 1.5, 24.0)] == ["15m", "1h", "90m", "24h"]
+    assert windows_for_features(["event_count_15m", "on_ratio_90m", "on_ratio_24h", "on_ratio"]) == [
+        0.25,
+        1.5,
+        24.0,
+    ]
+
+
+def test_checkpoint_round_trip_drops_expired_events_quickly() -> None:
+    import json
+    import time
+
+    tracker = RollingWindowTracker(window_hours=7.0, extra_window_hours=(1.0,))
+    now = datetime.now(UTC)
+    start = now - timedelta(hours=8)
+    for index in range(100_000):
+        entity_id = f"binary_sensor.motion_{index % 20}"
+        state = "on" if index % 3 else "off"
+        tracker.record_event(entity_id, state, start + timedelta(seconds=index * 0.3))
+    checkpoint = json.loads(json.dumps(tracker.checkpoint()))
+
+    restored = RollingWindowTracker(window_hours=7.0, extra_window_hours=(1.0,))
+    started = time.perf_counter()
+    kept = restored.restore(checkpoint, now=now)
+    elapsed = time.perf_counter() - started
+
+    tracker._prune(now.timestamp())
+    assert kept == tracker._next_seq - tracker._windows[0].cursor
+    assert restored.compute_features([]) == tracker.compute_features([])
+    assert elapsed < 0.5
+    assert restored.restore(checkpoint, now=now) == 0
+
+
+def test_restore_ignores_malformed_checkpoints() -> None:
+    tracker = RollingWindowTracker(window_hours=7.0)
+    assert tracker.restore({"timestamps": "not base64!"}) == 0
+    assert tracker.restore({}) == 0
+    assert tracker.event_count == 0
+
+
+def test_bucketed_tracker_matches_exact_counts_within_one_bucket() -> None:
+    exact = RollingWindowTracker(window_hours=1.0, extra_window_hours=(0.25,))
+    bucketed = BucketedRollingWindowTracker(
+        window_hours=1.0, extra_window_hours=(0.25,), bucket_seconds=60.0
+    )
+    now = datetime.now(UTC)
+    for index in range(5000):
+        timestamp = now - timedelta(hours=2) + timedelta(seconds=index * 1.44)
+        state = "on" if index % 3 else "off"
+        exact.record_event("binary_sensor.motion", state, timestamp)
+        bucketed.record_event("binary_sensor.motion", state, timestamp)
+
+    expected = exact.compute_features([])
+    result = bucketed.compute_features([])
+
+    assert bucketed.feature_names == exact.feature_names
+    # 1.44 s between events: one 60 s bucket holds at most 42 of them.
+    for name in ("event_count", "event_count_15m"):
+        assert 0 <= expected[name] - result[name] <= 42
+    for name in ("on_ratio", "on_ratio_15m"):
+        assert abs(expected[name] - result[name]) < 0.01
+
+
+def test_bucketed_tracker_memory_is_independent_of_event_rate() -> None:
+    tracker = BucketedRollingWindowTracker(window_hours=168.0, bucket_seconds=60.0)
+    now = datetime.now(UTC)
+    ring = tracker._totals
+    for index in range(50_000):
+        tracker.record_event("binary_sensor.motion", "on", now - timedelta(seconds=50_000 - index))
+    assert tracker._totals is ring
+    assert len(tracker._totals) == 168 * 60
+    assert tracker.compute_features([])["event_count"] == 50_000.0
+
+    tracker.add_windows([336.0])
+    assert len(tracker._totals) == 336 * 60
+    assert tracker.compute_features([])["event_count_336h"] == 50_000.0
+
+
+def test_bucketed_tracker_expires_buckets_and_ignores_stale_events() -> None:
+    tracker = BucketedRollingWindowTracker(window_hours=1.0, bucket_seconds=60.0)
+    now = datetime.now(UTC)
+    tracker.record_event("binary_sensor.motion", "on", now - timedelta(hours=3))
+    tracker.record_event("binary_sensor.motion", "on", now - timedelta(minutes=30))
+    tracker.record_event("binary_sensor.motion", "on", now - timedelta(hours=2))
+
+    assert tracker.compute_features([])["event_count"] == 1.0
+    assert tracker.event_count == 1
+
+
+def test_bucketed_checkpoint_round_trip_and_bucket_size_mismatch() -> None:
+    import json
+
+    tracker = BucketedRollingWindowTracker(
+        window_hours=7.0, extra_window_hours=(1.0,), bucket_seconds=60.0
+    )
+    now = datetime.now(UTC)
+    for index in range(1000):
+        tracker.record_event(
+            "binary_sensor.motion",
+            "on" if index % 2 else "off",
+            now - timedelta(hours=8) + timedelta(seconds=index * 30),
+        )
+    checkpoint = json.loads(json.dumps(tracker.checkpoint()))
+
+    restored = BucketedRollingWindowTracker(
+        window_hours=7.0, extra_window_hours=(1.0,), bucket_seconds=60.0
+    )
+    assert restored.restore(checkpoint, now=now) == tracker.compute_features([])["event_count"]
+    assert restored.compute_features([]) == tracker.compute_features([])
+    assert restored.restore(checkpoint, now=now) == 0
+
+    assert BucketedRollingWindowTracker(bucket_seconds=30.0).restore(checkpoint) == 0
+    assert RollingWindowTracker(window_hours=7.0).restore(checkpoint) == 0
+    assert BucketedRollingWindowTracker().restore(RollingWindowTracker().checkpoint()) == 0
+
+    backfill = restored.empty_copy()
+    backfill.record_event("binary_sensor.motion", "on", now - timedelta(minutes=5))
+    assert BucketedRollingWindowTracker(
+        window_hours=7.0, extra_window_hours=(1.0,), bucket_seconds=60.0
+    ).adopt(backfill) == 1
+
+
+def test_next_expiry_is_when_the_oldest_event_leaves_the_shortest_window() -> None:
+    tracker = RollingWindowTracker(window_hours=1.0, extra_window_hours=(0.25,))
+    now = datetime.now(UTC).timestamp()
+    assert tracker.next_expiry(now) is None
+
+    tracker.record_event("binary_sensor.motion", "on", now - 1800)
+    tracker.record_event("binary_sensor.motion", "on", now - 600)
+
+    # 15m window: the event from 10 minutes ago leaves in 5 minutes.
+    assert tracker.next_expiry(now) == now - 600 + 900
+    # Once it has left, the 1h window's event is next.
+    assert tracker.next_expiry(now + 301) == now - 1800 + 3600
+    assert tracker.event_count == 2
+    assert tracker.next_expiry(now + 3601) is None
+    assert tracker.event_count == 0
+
+
+def test_bucketed_next_expiry_is_a_bucket_boundary() -> None:
+    tracker = BucketedRollingWindowTracker(window_hours=1.0, bucket_seconds=60.0)
+    now = 1_800_000_030.0
+    assert tracker.next_expiry(now) is None
+
+    tracker.record_event("binary_sensor.motion", "on", now - 1800)
+    tracker.record_event("binary_sensor.motion", "on", now - 600)
+
+    first = tracker.next_expiry(now)
+    assert first == (int((now - 1800) // 60) + 60) * 60.0
+    assert now - 1800 + 3600 - 60 < first <= now - 1800 + 3600
+    second = tracker.next_expiry(first)
+    assert second == (int((now - 600) // 60) + 60) * 60.0
+    assert tracker.event_count == 1
+    assert tracker.next_expiry(second) is None
+    assert tracker.event_count == 0
@@ -18,15 +18,17 @@ def _new_flow() -> CalibratedLogisticRegressionConfigFlow:
     return flow
 
 
-def test_rolling_window_hours_persisted_in_entry() -> None:
+def test_rolling_window_hours_persisted_in_entry(tmp_path) -> None:
     flow = _new_flow()
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    db_path.touch()
 
     asyncio.run(
         flow.async_step_user(
             {
                 "name": "Kitchen MindML",
                 "goal": "risk",
-                "ml_db_path": "/tmp/ha_ml_data_layer.db",
+                "ml_db_path": str(db_path),
                 "rolling_window_hours": 4.0,
             }
         )
@@ -79,3 +81,4 @@ def test_options_feature_source_persists_rolling_window_hours() -> None:
     )
     assert result["type"] == "create_entry"
     assert result["data"]["rolling_window_hours"] == 3.5
+    assert result["data"]["rolling_window_bucket_seconds"] == 0.0
@@ -2,8 +2,11 @@
 
 from __future__ import annotations
 
+from datetime import UTC, datetime
 from unittest.mock import MagicMock
 
+import pytest
+
 from custom_components.mindml.sensor import CalibratedLogisticRegressionSensor
 
 
@@ -55,6 +58,7 @@ def test_tracker_created_in_hass_state_mode(monkeypatch) -> None:
     )
 
     sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor._apply_loaded_model(sensor._load_model())
     assert sensor._rolling_window_tracker is not None
 
 
@@ -99,6 +103,7 @@ def test_events_flow_from_callback_to_tracker(monkeypatch) -> None:
     from unittest.mock import AsyncMock
 
     sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor._apply_loaded_model(sensor._load_model())
     sensor.async_get_last_state = AsyncMock(return_value=None)
     asyncio.run(sensor.async_added_to_hass())
 
@@ -146,6 +151,7 @@ def test_computed_features_appear_in_feature_values(monkeypatch) -> None:
     )
 
     sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor._apply_loaded_model(sensor._load_model())
     # Manually add events to the tracker
     # feature_states filter only allows "on" events for binary_sensor.motion
     sensor._rolling_window_tracker.record_event("binary_sensor.motion", "on")
@@ -204,6 +210,7 @@ def test_watched_entities_includes_feature_states_entities(monkeypatch) -> None:
     entry.data["feature_states"]["binary_sensor.door"] = "open"
 
     sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    sensor._apply_loaded_model(sensor._load_model())
     sensor.async_get_last_state = AsyncMock(return_value=None)
     asyncio.run(sensor.async_added_to_hass())
 
@@ -239,6 +246,381 @@ def test_diagnostics_attributes_present(monkeypatch) -> None:
     )
 
     sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor._apply_loaded_model(sensor._load_model())
     attrs = sensor.extra_state_attributes
     assert attrs["rolling_window_hours"] == 7.0
     assert attrs["rolling_window_event_count"] == 0
+
+
+def test_bucket_seconds_option_selects_bucketed_tracker() -> None:
+    from custom_components.mindml.rolling_window import BucketedRollingWindowTracker
+
+    entry = _build_entry()
+    entry.options = {"rolling_window_bucket_seconds": 60.0}
+
+    sensor = CalibratedLogisticRegressionSensor(MagicMock(), entry)
+
+    assert isinstance(sensor._rolling_window_tracker, BucketedRollingWindowTracker)
+    assert sensor._rolling_window_tracker.bucket_seconds == 60.0
+    assert sensor.extra_state_attributes["rolling_window_bucket_seconds"] == 60.0
+
+
+def test_model_feature_names_add_rolling_windows(monkeypatch) -> None:
+    hass = MagicMock()
+    hass.states.get.return_value = MagicMock(state="1")
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            pass
+
+        def load(self):
+            from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+            from custom_components.mindml.model_provider import ModelProviderResult
+
+            return ModelProviderResult(
+                model=LightGBMModelSpec(
+                    feature_names=["event_count", "event_count_15m", "on_ratio_1h"],
+                    model_payload={"intercept": 0.0, "weights": [0.0, 1.0, 0.0]},
+                ),
+                source="ml_data_layer",
+                artifact_error=None,
+                artifact_meta={},
+            )
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteLightGBMModelProvider",
+        _Provider,
+    )
+
+    sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor._apply_loaded_model(sensor._load_model())
+    sensor._rolling_window_tracker.record_event("binary_sensor.motion", "on")
+    sensor._recompute_state(datetime.now(UTC))
+
+    attrs = sensor.extra_state_attributes
+    assert "event_count_15m" in sensor._rolling_window_tracker.feature_names
+    assert "on_ratio_1h" in sensor._rolling_window_tracker.feature_names
+    assert attrs["feature_values"]["event_count_15m"] == 1.0
+    assert attrs["linear_score"] == 1.0
+
+
+def test_rolling_window_is_restored_from_storage_and_checkpointed_on_removal(monkeypatch) -> None:
+    import asyncio
+    from datetime import timedelta
+    from unittest.mock import AsyncMock
+
+    from custom_components.mindml.rolling_window import RollingWindowTracker
+
+    hass = MagicMock()
+    hass.states.get.return_value = None
+    removers: list = []
+    previous = RollingWindowTracker(window_hours=7.0)
+    now = datetime.now(UTC)
+    previous.record_event("binary_sensor.motion", "on", now - timedelta(hours=9))
+    previous.record_event("binary_sensor.motion", "on", now - timedelta(hours=1))
+    stores: list = []
+
+    class _Store:
+        def __init__(self, hass_arg, version, key, **kwargs):
+            self.key = key
+            self.data = previous.checkpoint()
+            stores.append(self)
+
+        async def async_load(self):
+            return self.data
+
+        def async_delay_save(self, data_func, delay=0):
+            self.data = data_func()
+
+    monkeypatch.setattr("custom_components.mindml.sensor.Store", _Store)
+    sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor.async_get_last_state = AsyncMock(return_value=None)
+    sensor.async_on_remove = removers.append
+    sensor.hass.async_create_background_task = lambda coro, name: coro.close() or MagicMock()
+    asyncio.run(sensor.async_added_to_hass())
+
+    assert stores[0].key == "mindml.rolling_window.entry-1"
+    assert sensor._rolling_window_tracker.event_count == 1
+
+    sensor._rolling_window_tracker.record_event("binary_sensor.motion", "on")
+    for remove in removers:
+        remove()
+
+    restored = RollingWindowTracker(window_hours=7.0)
+    assert restored.restore(stores[0].data) == 2
+
+
+def test_expiry_timer_recomputes_when_events_leave_the_window(monkeypatch) -> None:
+    import asyncio
+    import time
+    from unittest.mock import AsyncMock
+
+    hass = MagicMock()
+    hass.states.get.return_value = None
+    timers: list = []
+
+    def _track_point(hass_arg, action, point_in_time):
+        timer = {"action": action, "at": point_in_time, "cancelled": False}
+        timers.append(timer)
+        return lambda: timer.update(cancelled=True)
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.async_track_point_in_time",
+        _track_point,
+    )
+    sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor.async_get_last_state = AsyncMock(return_value=None)
+    sensor.async_write_ha_state = MagicMock()
+    sensor.hass.async_create_background_task = lambda coro, name: coro.close() or MagicMock()
+    asyncio.run(sensor.async_added_to_hass())
+    assert timers == []
+
+    tracker = sensor._rolling_window_tracker
+    recorded_at = time.time() - 7 * 3600 + 60
+    tracker.record_event("binary_sensor.motion", "on", recorded_at)
+    sensor._schedule_rolling_window_expiry()
+    assert timers[-1]["at"] == datetime.fromtimestamp(recorded_at + 7 * 3600, UTC)
+
+    # A newer event does not move the timer.
+    tracker.record_event("binary_sensor.motion", "on")
+    sensor._schedule_rolling_window_expiry()
+    assert len(timers) == 1
+
+    monkeypatch.setattr(
+        "custom_components.mindml.rolling_window.time.time", lambda: recorded_at + 7 * 3600 + 1
+    )
+    timers[-1]["action"](datetime.now(UTC))
+    assert tracker.event_count == 1
+    assert len(timers) == 2 and not timers[-1]["cancelled"]
+    sensor.async_write_ha_state.assert_called()
+
+    sensor._handle_rolling_window_removed()
+    assert timers[-1]["cancelled"]
+
+
+def test_model_timing_features_watch_and_seed_their_entities(monkeypatch) -> None:
+    import asyncio
+    from datetime import timedelta
+    from unittest.mock import AsyncMock
+
+    from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+    from custom_components.mindml.model_provider import ModelProviderResult
+
+    door_changed = datetime.now(UTC) - timedelta(minutes=10)
+    hass = MagicMock()
+    hass.states.get.side_effect = lambda eid: (
+        MagicMock(state="on", last_changed=door_changed) if eid == "binary_sensor.door" else None
+    )
+    subscriptions: list = []
+
+    def _track_state(hass_arg, entities, cb):
+        subscription = {"entities": list(entities), "cb": cb, "active": True}
+        subscriptions.append(subscription)
+        return lambda: subscription.update(active=False)
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.async_track_state_change_event",
+        _track_state,
+    )
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            pass
+
+        def load(self):
+            return ModelProviderResult(
+                model=LightGBMModelSpec(
+                    feature_names=["event_count", "binary_sensor.door__seconds_since_on"],
+                    model_payload={"intercept": 0.0, "weights": [0.0, 0.0]},
+                ),
+                source="ml_data_layer",
+                artifact_error=None,
+                artifact_meta={},
+            )
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteLightGBMModelProvider",
+        _Provider,
+    )
+
+    sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor.async_get_last_state = AsyncMock(return_value=None)
+    sensor.async_write_ha_state = MagicMock()
+    sensor.hass.async_create_background_task = lambda coro, name: coro.close() or MagicMock()
+    asyncio.run(sensor.async_added_to_hass())
+    assert "binary_sensor.door" not in subscriptions[-1]["entities"]
+
+    sensor._apply_loaded_model(sensor._load_model())
+    sensor._recompute_state(datetime.now(UTC))
+
+    assert not subscriptions[0]["active"]
+    assert "binary_sensor.door" in subscriptions[-1]["entities"]
+    seconds = sensor.extra_state_attributes["feature_values"]["binary_sensor.door__seconds_since_on"]
+    assert 595 <= seconds <= 605
+
+    event = MagicMock()
+    event.data = {"entity_id": "binary_sensor.door", "new_state": MagicMock(state="off")}
+    subscriptions[-1]["cb"](event)
+    event.data = {"entity_id": "binary_sensor.door", "new_state": MagicMock(state="on")}
+    subscriptions[-1]["cb"](event)
+    seconds = sensor.extra_state_attributes["feature_values"]["binary_sensor.door__seconds_since_on"]
+    assert seconds < 5
+
+
+@pytest.mark.parametrize("bucket_seconds", [0.0, 60.0])
+def test_model_window_longer_than_configured_survives_restart(
+    monkeypatch, bucket_seconds: float
+) -> None:
+    import asyncio
+    from datetime import timedelta
+    from unittest.mock import AsyncMock
+
+    from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+    from custom_components.mindml.model_provider import ModelProviderResult
+
+    saved: dict = {}
+
+    class _Store:
+        def __init__(self, hass_arg, version, key, **kwargs):
+            pass
+
+        async def async_load(self):
+            return saved.get("data")
+
+        def async_delay_save(self, data_func, delay=0):
+            saved["data"] = data_func()
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            pass
+
+        def load(self):
+            return ModelProviderResult(
+                model=LightGBMModelSpec(
+                    feature_names=["event_count", "event_count_24h"],
+                    model_payload={"intercept": 0.0, "weights": [0.0, 0.0]},
+                ),
+                source="ml_data_layer",
+                artifact_error=None,
+                artifact_meta={},
+            )
+
+    monkeypatch.setattr("custom_components.mindml.sensor.Store", _Store)
+    monkeypatch.setattr("custom_components.mindml.sensor.SqliteLightGBMModelProvider", _Provider)
+
+    def _start_sensor() -> tuple[CalibratedLogisticRegressionSensor, list]:
+        hass = MagicMock()
+        hass.states.get.return_value = None
+        hass.config.components = set()
+        entry = _build_entry()
+        entry.data["rolling_window_hours"] = 1.0
+        entry.options = {"rolling_window_bucket_seconds": bucket_seconds}
+        sensor = CalibratedLogisticRegressionSensor(hass, entry)
+        removers: list = []
+        sensor.async_get_last_state = AsyncMock(return_value=None)
+        sensor.async_on_remove = removers.append
+        sensor.hass.async_create_background_task = lambda coro, name: coro.close() or MagicMock()
+        asyncio.run(sensor.async_added_to_hass())
+        sensor._apply_loaded_model(sensor._load_model())
+        return sensor, removers
+
+    sensor, removers = _start_sensor()
+    now = datetime.now(UTC)
+    for hours_ago in (20, 10, 5, 0.5):
+        sensor._rolling_window_tracker.record_event(
+            "binary_sensor.motion", "on", now - timedelta(hours=hours_ago)
+        )
+    assert sensor._rolling_window_tracker.compute_features([])["event_count_24h"] == 4.0
+    for remove in removers:
+        remove()
+
+    restarted, _ = _start_sensor()
+    assert restarted._rolling_window_tracker.compute_features([])["event_count_24h"] == 4.0
+
+
+def test_recorder_backfill_runs_after_model_load_and_keeps_live_events(monkeypatch) -> None:
+    import asyncio
+    import sys
+    import types
+    from datetime import timedelta
+    from unittest.mock import AsyncMock
+
+    from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+    from custom_components.mindml.model_provider import ModelProviderResult
+
+    class _Store:
+        def __init__(self, hass_arg, version, key, **kwargs):
+            pass
+
+        async def async_load(self):
+            return None
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            pass
+
+        def load(self):
+            return ModelProviderResult(
+                model=LightGBMModelSpec(
+                    feature_names=["event_count", "event_count_24h"],
+                    model_payload={"intercept": 0.0, "weights": [0.0, 0.0]},
+                ),
+                source="ml_data_layer",
+                artifact_error=None,
+                artifact_meta={},
+            )
+
+    now = datetime.now(UTC)
+    live_at = now - timedelta(minutes=1)
+    queried_hours: list[float] = []
+
+    def _backfill(hass_arg, tracker, entity_ids):
+        queried_hours.append(tracker.retention_hours)
+        for event_at in (now - timedelta(hours=20), now - timedelta(minutes=30), live_at):
+            tracker.record_event("binary_sensor.motion", "on", event_at)
+        return tracker.event_count
+
+    async def _recorder_job(func, *args):
+        # A live event lands while the recorder query runs.
+        sensor._rolling_window_tracker.record_event("binary_sensor.motion", "on", live_at)
+        return func(*args)
+
+    recorder = types.ModuleType("homeassistant.components.recorder")
+    recorder.get_instance = lambda hass_arg: types.SimpleNamespace(
+        async_add_executor_job=_recorder_job
+    )
+    monkeypatch.setitem(sys.modules, "homeassistant.components.recorder", recorder)
+    monkeypatch.setattr("custom_components.mindml.sensor.Store", _Store)
+    monkeypatch.setattr("custom_components.mindml.sensor.SqliteLightGBMModelProvider", _Provider)
+    monkeypatch.setattr("custom_components.mindml.sensor.load_recorder_backfill", _backfill)
+
+    hass = MagicMock()
+    hass.states.get.return_value = None
+    hass.config.components = {"recorder"}
+    entry = _build_entry()
+    entry.data["rolling_window_hours"] = 1.0
+    sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    sensor.async_get_last_state = AsyncMock(return_value=None)
+    sensor.async_on_remove = lambda remove: None
+    sensor.async_write_ha_state = MagicMock()
+
+    async def _executor_job(func, *args):
+        return func(*args)
+
+    async def _run() -> None:
+        tasks: list[asyncio.Task] = []
+        hass.async_add_executor_job = _executor_job
+        hass.async_create_background_task = lambda coro, name: tasks.append(
+            asyncio.ensure_future(coro)
+        ) or tasks[-1]
+        await sensor.async_added_to_hass()
+        # Setup does not wait for the recorder.
+        assert queried_hours == []
+        await asyncio.gather(*tasks)
+
+    asyncio.run(_run())
+
+    assert queried_hours == [24.0]
+    features = sensor._rolling_window_tracker.compute_features([])
+    assert features["event_count_24h"] == 3.0
+    assert features["event_count"] == 2.0
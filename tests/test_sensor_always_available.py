@@ -69,6 +69,7 @@ def test_sensor_available_when_features_missing(monkeypatch) -> None:
     )
 
     sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor._apply_loaded_model(sensor._load_model())
     sensor._recompute_state(datetime.now())
 
     assert sensor.available is True
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
 import asyncio
-from datetime import datetime
+import sys
+import types
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock
 
+import pytest
 from homeassistant.core import State
 
+from custom_components.mindml import sensor as sensor_module
 from custom_components.mindml.const import DOMAIN
+from custom_components.mindml.feature_provider import FeatureVectorResult
+from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+from custom_components.mindml.model_provider import ModelProviderResult
 from custom_components.mindml.sensor import (
     CalibratedLogisticRegressionSensor,
     async_setup_entry,
@@ -72,6 +79,7 @@ def test_sensor_unavailable_reason_when_required_feature_missing(monkeypatch) ->
     )
 
     sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor._apply_loaded_model(sensor._load_model())
     sensor._recompute_state(datetime.now())
 
     assert sensor.available is True
@@ -112,6 +120,7 @@ def test_sensor_updates_probability_attributes(monkeypatch) -> None:
     )
 
     sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor._apply_loaded_model(sensor._load_model())
     sensor._recompute_state(datetime.now())
 
     assert sensor.available is True
@@ -158,6 +167,7 @@ def test_sensor_resolves_default_ml_db_path_when_missing(monkeypatch) -> None:
     )
 
     sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    sensor._apply_loaded_model(sensor._load_model())
 
     assert _Provider.last_kwargs["db_path"] == "/config/appdaemon/ha_ml_data_layer.db"
     assert sensor.extra_state_attributes["model_runtime"] == "lightgbm"
@@ -193,6 +203,7 @@ def test_sensor_hass_state_keeps_configured_features_when_model_has_abstract_nam
     )
 
     sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    sensor._apply_loaded_model(sensor._load_model())
     assert sensor._required_features == ["sensor.a", "sensor.b"]
 
 
@@ -237,6 +248,7 @@ def test_sensor_restores_state_from_last_known(monkeypatch) -> None:
     )
 
     sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    sensor._apply_loaded_model(sensor._load_model())
     sensor.async_get_last_state = AsyncMock(return_value=_LastState())
     sensor._recompute_state = lambda now: None
 
@@ -282,6 +294,7 @@ def test_sensor_handles_no_previous_state(monkeypatch) -> None:
     )
 
     sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    sensor._apply_loaded_model(sensor._load_model())
     sensor.async_get_last_state = AsyncMock(return_value=None)
     sensor._recompute_state = lambda now: None
     asyncio.run(sensor.async_added_to_hass())
@@ -328,7 +341,7 @@ def test_sensor_syncs_ingestion_rules_from_feature_states(monkeypatch) -> None:
         _sync_ingestion_rules,
     )
 
-    CalibratedLogisticRegressionSensor(hass, entry)
+    CalibratedLogisticRegressionSensor(hass, entry)._load_model()
 
     assert sync_call["source"] == "mindml:entry-1"
     assert sync_call["feature_states"] == {"sensor.a": "on", "sensor.b": "off"}
@@ -362,9 +375,368 @@ def test_sensor_surfaces_model_artifact_error_reason(monkeypatch) -> None:
     )
 
     sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor._apply_loaded_model(sensor._load_model())
     sensor._recompute_state(datetime.now())
 
     attrs = sensor.extra_state_attributes
     assert sensor.available is True
     assert attrs["model_artifact_error"] is not None
     assert attrs["unavailable_reason"] == "model_artifact_error"
+
+
+def test_sensor_computes_tree_contributions_lazily_at_configured_cadence(monkeypatch) -> None:
+    hass = MagicMock()
+    hass.states.get.side_effect = lambda entity_id: State(entity_id, "1")
+    predict_calls: list[tuple[bool, bool]] = []
+
+    class _Booster:
+        def __init__(self, *, model_str: str) -> None:
+            pass
+
+        def predict(self, rows, raw_score: bool = False, pred_contrib: bool = False):
+            predict_calls.append((raw_score, pred_contrib))
+            if pred_contrib:
+                return [[0.5, -0.25, 0.0]]
+            return [0.25]
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+        def load(self):
+            from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+            from custom_components.mindml.model_provider import ModelProviderResult
+
+            return ModelProviderResult(
+                model=LightGBMModelSpec(
+                    feature_names=["sensor.a", "sensor.b"],
+                    model_payload={"booster_model_str": "lazy-contrib-booster"},
+                ),
+                source="ml_data_layer",
+                artifact_error=None,
+                artifact_meta={},
+            )
+
+    monkeypatch.setitem(sys.modules, "lightgbm", types.SimpleNamespace(Booster=_Booster))
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteLightGBMModelProvider",
+        _Provider,
+    )
+    entry = _build_entry()
+    entry.options = {"contributions_every_n": 3, "contributions_min_interval_seconds": 0}
+
+    executor_jobs: list[object] = []
+    background: list = []
+
+    async def _executor_job(func, *args):
+        executor_jobs.append(func)
+        return func(*args)
+
+    hass.async_add_executor_job = _executor_job
+    hass.async_create_background_task = lambda coro, name: background.append(coro)
+
+    def _recompute(seconds: int) -> None:
+        now = datetime.now(UTC) + timedelta(seconds=seconds)
+        asyncio.run(sensor._async_recompute_state(now))
+        while background:
+            asyncio.run(background.pop(0))
+
+    sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    sensor.async_write_ha_state = MagicMock()
+    sensor._apply_loaded_model(sensor._load_model())
+    _recompute(0)
+    # The contribution pass ran in the executor, not while reading attributes.
+    assert predict_calls == [(True, False), (False, True)]
+    assert len(executor_jobs) == 1
+
+    predict_calls.clear()
+    attrs = sensor.extra_state_attributes
+    assert predict_calls == []
+    assert attrs["feature_contributions"] == {"sensor.a": 0.5, "sensor.b": -0.25}
+    assert attrs["feature_contributions_computed_at"] is not None
+
+    _recompute(1)
+    _recompute(2)
+    assert predict_calls == [(True, False), (True, False)]
+    assert sensor.extra_state_attributes["feature_contributions_age_seconds"] >= 0
+
+    _recompute(3)
+    assert predict_calls[-1] == (False, True)
+    sensor.async_write_ha_state.assert_called()
+
+
+@pytest.mark.parametrize(
+    ("every_n", "min_interval", "pending", "age_seconds", "due"),
+    [
+        # Enough updates, but the minimum interval has not passed.
+        (3, 60, 5, 30, False),
+        (3, 60, 5, 60, True),
+        (3, 60, 2, 120, False),
+        (3, 0, 3, 1, True),
+        (0, 60, 1, 30, False),
+        (0, 60, 1, 60, True),
+        # Both at 0 turns the contribution pass off.
+        (0, 0, 50, 3600, False),
+    ],
+)
+def test_contribution_cadence_enforces_minimum_interval(
+    every_n: int, min_interval: float, pending: int, age_seconds: float, due: bool
+) -> None:
+    entry = _build_entry()
+    entry.options = {
+        "contributions_every_n": every_n,
+        "contributions_min_interval_seconds": min_interval,
+    }
+    sensor = CalibratedLogisticRegressionSensor(MagicMock(), entry)
+    sensor._runtime = MagicMock()
+    now = datetime.now(UTC)
+    sensor._feature_contributions_computed_at = now - timedelta(seconds=age_seconds)
+    sensor._contributions_pending_recomputes = pending
+
+    assert sensor._feature_contributions_due(now) is due
+
+
+def test_sensor_loads_model_in_executor_after_being_added(monkeypatch) -> None:
+    hass = MagicMock()
+    hass.states.get.side_effect = lambda entity_id: State(entity_id, "1")
+    executor_jobs: list[object] = []
+    background: list[object] = []
+
+    async def _executor_job(func, *args):
+        executor_jobs.append(func)
+        return func(*args)
+
+    def _background_task(coro, name):
+        background.append(coro)
+        return MagicMock()
+
+    hass.async_add_executor_job = _executor_job
+    hass.async_create_background_task = _background_task
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+        def load(self):
+            from custom_components.mindml.lightgbm_inference import LightGBMModelSpec
+            from custom_components.mindml.model_provider import ModelProviderResult
+
+            return ModelProviderResult(
+                model=LightGBMModelSpec(
+                    feature_names=["sensor.a", "sensor.b"],
+                    model_payload={"intercept": 0.0, "weights": [1.0, 1.0]},
+                ),
+                source="ml_data_layer",
+                artifact_error=None,
+                artifact_meta={},
+            )
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteLightGBMModelProvider",
+        _Provider,
+    )
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.sync_ingestion_rules",
+        lambda **kwargs: 0,
+    )
+
+    sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor.async_get_last_state = AsyncMock(return_value=None)
+
+    async def _add_and_load() -> None:
+        await sensor.async_added_to_hass()
+        assert sensor.extra_state_attributes["unavailable_reason"] == "model_loading"
+        assert sensor.native_value is None
+        assert len(background) == 1
+        await background[0]
+
+    asyncio.run(_add_and_load())
+
+    assert executor_jobs == [sensor._load_model]
+    assert sensor.extra_state_attributes["model_source"] == "ml_data_layer"
+    assert sensor.extra_state_attributes["unavailable_reason"] is None
+    assert sensor.native_value is not None
+
+
+def test_sensor_hot_swaps_model_when_artifact_changes(monkeypatch) -> None:
+    hass = MagicMock()
+    hass.states.get.side_effect = lambda entity_id: State(entity_id, "1")
+
+    async def _executor_job(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = _executor_job
+    loads: list[ModelProviderResult] = [
+        ModelProviderResult(
+            model=LightGBMModelSpec(
+                feature_names=["sensor.a", "sensor.b"],
+                model_payload={"intercept": 0.0, "weights": [0.0, 0.0]},
+            ),
+            source="ml_data_layer",
+            artifact_error=None,
+            artifact_meta={"created_at_utc": "2026-02-25T00:00:00+00:00"},
+        ),
+        ModelProviderResult(
+            model=LightGBMModelSpec(
+                feature_names=["sensor.a", "sensor.b"],
+                model_payload={"intercept": 1.0, "weights": [0.0, 0.0]},
+            ),
+            source="ml_data_layer",
+            artifact_error=None,
+            artifact_meta={"created_at_utc": "2026-02-26T00:00:00+00:00"},
+        ),
+        ModelProviderResult(
+            model=LightGBMModelSpec(feature_names=["sensor.a", "sensor.b"], model_payload={}),
+            source="manual",
+            artifact_error="artifact_json is not valid JSON",
+            artifact_meta={},
+        ),
+    ]
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            self.kwargs = kwargs
+
+        def load(self):
+            return loads.pop(0)
+
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.SqliteLightGBMModelProvider",
+        _Provider,
+    )
+    monkeypatch.setattr(
+        "custom_components.mindml.sensor.sync_ingestion_rules",
+        lambda **kwargs: 0,
+    )
+
+    sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    monkeypatch.setattr(sensor._artifact_change_detector, "check", lambda: True)
+    sensor._apply_loaded_model(sensor._load_model())
+    sensor._recompute_state(datetime.now(UTC))
+    assert sensor.native_value == 50.0
+    first_runtime = sensor._runtime
+
+    asyncio.run(sensor._async_reload_model_if_changed())
+
+    assert sensor._runtime is not first_runtime
+    assert sensor.native_value > 50.0
+    assert sensor.extra_state_attributes["model_artifact_meta"]["created_at_utc"] == (
+        "2026-02-26T00:00:00+00:00"
+    )
+
+    swapped_runtime = sensor._runtime
+    asyncio.run(sensor._async_reload_model_if_changed())
+
+    assert sensor._runtime is swapped_runtime
+    assert sensor.extra_state_attributes["model_reload_error"] == "artifact_json is not valid JSON"
+
+
+def test_rejected_or_abandoned_model_loads_close_their_runtime(monkeypatch) -> None:
+    hass = MagicMock()
+    hass.states.get.side_effect = lambda entity_id: State(entity_id, "1")
+
+    async def _executor_job(func, *args):
+        return func(*args)
+
+    hass.async_add_executor_job = _executor_job
+    closed: list[object] = []
+    monkeypatch.setattr(sensor_module._ModelRuntime, "close", lambda runtime: closed.append(runtime))
+    ml_model = ModelProviderResult(
+        model=LightGBMModelSpec(
+            feature_names=["sensor.a", "sensor.b"],
+            model_payload={"intercept": 0.0, "weights": [0.0, 0.0]},
+        ),
+        source="ml_data_layer",
+        artifact_error=None,
+        artifact_meta={},
+    )
+    manual_model = ModelProviderResult(
+        model=LightGBMModelSpec(feature_names=["sensor.a", "sensor.b"], model_payload={}),
+        source="manual",
+        artifact_error="artifact_json is not valid JSON",
+        artifact_meta={},
+    )
+    loads = [ml_model, manual_model, ml_model]
+
+    class _Provider:
+        def __init__(self, **kwargs):
+            pass
+
+        def load(self):
+            return loads.pop(0)
+
+    monkeypatch.setattr("custom_components.mindml.sensor.SqliteLightGBMModelProvider", _Provider)
+    monkeypatch.setattr("custom_components.mindml.sensor.sync_ingestion_rules", lambda **kwargs: 0)
+
+    sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor.async_write_ha_state = MagicMock()
+    monkeypatch.setattr(sensor._artifact_change_detector, "check", lambda: True)
+    sensor._apply_loaded_model(sensor._load_model())
+    current = sensor._runtime
+
+    asyncio.run(sensor._async_reload_model_if_changed())
+    assert sensor._runtime is current
+    assert len(closed) == 1 and closed[0] is not current
+
+    sensor._close_runtime()
+    asyncio.run(sensor._async_reload_model_if_changed())
+    assert sensor._runtime is current
+    assert len(closed) == 3 and closed[1] is current and closed[2] is not current
+
+
+def test_cancelled_model_load_closes_runtime_when_executor_finishes(monkeypatch) -> None:
+    hass = MagicMock()
+    closed: list[object] = []
+    monkeypatch.setattr(sensor_module._ModelRuntime, "close", lambda runtime: closed.append(runtime))
+    sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+
+    async def _scenario() -> None:
+        loop = asyncio.get_running_loop()
+        release = asyncio.Event()
+
+        async def _executor_job(func, *args):
+            await release.wait()
+            return func(*args)
+
+        hass.async_add_executor_job = _executor_job
+        task = loop.create_task(sensor._async_load_model())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+        assert closed == []
+        release.set()
+        for _ in range(5):
+            await asyncio.sleep(0)
+
+    asyncio.run(_scenario())
+    assert len(closed) == 1
+    assert sensor._runtime is None
+
+
+def test_sensor_skips_inference_when_snapshot_vector_is_unchanged(monkeypatch) -> None:
+    hass = MagicMock()
+    hass.states.get.side_effect = lambda entity_id: State(entity_id, "1")
+    sensor = CalibratedLogisticRegressionSensor(hass, _build_entry())
+    sensor._apply_loaded_model(sensor._load_model())
+    vector = FeatureVectorResult(
+        feature_values={"sensor.a": 1.0, "sensor.b": 1.0},
+        missing_features=[],
+        mapped_state_values={},
+    )
+    sensor._runtime.feature_provider = types.SimpleNamespace(load=lambda: vector)
+    calls: list[object] = []
+    original = sensor_module.run_lightgbm_inference
+
+    def _counting_inference(**kwargs):
+        calls.append(kwargs)
+        return original(**kwargs)
+
+    monkeypatch.setattr(sensor_module, "run_lightgbm_inference", _counting_inference)
+
+    sensor._recompute_state(datetime.now(UTC))
+    native_value = sensor.native_value
+    sensor._recompute_state(datetime.now(UTC))
+
+    assert len(calls) == 1
+    assert sensor.native_value == native_value
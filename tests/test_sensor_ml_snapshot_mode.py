@@ -117,6 +117,7 @@ def test_sensor_can_use_ml_snapshot_feature_source(monkeypatch) -> None:
     entry.options = {}
 
     sensor = CalibratedLogisticRegressionSensor(hass, entry)
+    sensor._apply_loaded_model(sensor._load_model())
     sensor._recompute_state(datetime.now())
 
     attrs = sensor.extra_state_attributes
@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import sqlite3
+from pathlib import Path
+
+from custom_components.mindml import snapshot_coordinator
+from custom_components.mindml.feature_provider import SqliteSnapshotFeatureProvider
+
+
+def _write_snapshot(db_path: Path) -> sqlite3.Connection:
+    writer = sqlite3.connect(db_path)
+    writer.execute("CREATE TABLE snapshot (feature_name TEXT, feature_value TEXT)")
+    writer.executemany(
+        "INSERT INTO snapshot(feature_name, feature_value) VALUES (?, ?)",
+        [("a", "1"), ("b", "2"), ("c", "3")],
+    )
+    writer.commit()
+    return writer
+
+
+def test_providers_on_same_view_share_one_query_per_change(tmp_path: Path, monkeypatch) -> None:
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    writer = _write_snapshot(db_path)
+    queries: list[str] = []
+    original_build = snapshot_coordinator.SnapshotCoordinator._build_query
+
+    def _counting_build(self):
+        query = original_build(self)
+        queries.append(query[0])
+        return query
+
+    monkeypatch.setattr(snapshot_coordinator.SnapshotCoordinator, "_build_query", _counting_build)
+    first = SqliteSnapshotFeatureProvider(
+        db_path=str(db_path), snapshot_view="snapshot", required_features=["a", "b"]
+    )
+    second = SqliteSnapshotFeatureProvider(
+        db_path=str(db_path), snapshot_view="snapshot", required_features=["b", "c"]
+    )
+    try:
+        first_coordinator = first._coordinator
+        assert first_coordinator is second._coordinator
+        assert first.load().feature_values == {"a": 1.0, "b": 2.0}
+        assert second.load().feature_values == {"b": 2.0, "c": 3.0}
+        values = first._coordinator.snapshot()
+        assert dict(values) == {"a": 1.0, "b": 2.0, "c": 3.0}
+        assert len(queries) == 1
+
+        writer.execute("UPDATE snapshot SET feature_value = '5' WHERE feature_name = 'b'")
+        writer.commit()
+        assert second.load().feature_values == {"b": 5.0, "c": 3.0}
+        assert first.load().feature_values == {"a": 1.0, "b": 5.0}
+        assert first._coordinator.snapshot() is not values
+    finally:
+        first.close()
+        second.close()
+        writer.close()
+
+    assert all(
+        coordinator is not first_coordinator
+        for coordinator in snapshot_coordinator._COORDINATORS.values()
+    )
+
+
+def test_coordinator_retries_after_a_failed_read(tmp_path: Path) -> None:
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    writer = _write_snapshot(db_path)
+    provider = SqliteSnapshotFeatureProvider(
+        db_path=str(db_path), snapshot_view="missing_view", required_features=["a"]
+    )
+    try:
+        for _ in range(2):
+            try:
+                provider.load()
+            except sqlite3.OperationalError:
+                pass
+            else:  # pragma: no cover
+                raise AssertionError("expected the missing view to fail")
+        writer.execute("CREATE VIEW missing_view AS SELECT * FROM snapshot")
+        writer.commit()
+        assert provider.load().feature_values == {"a": 1.0}
+    finally:
+        provider.close()
+        writer.close()
@@ -0,0 +1,66 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+import sys
+from pathlib import Path
+
+import pytest
+
+from custom_components.mindml.snapshot_watcher import SnapshotFileWatcher
+
+pytestmark = pytest.mark.skipif(
+    not sys.platform.startswith("linux"), reason="inotify is Linux-only"
+)
+
+
+def test_snapshot_watcher_fires_once_per_burst_of_db_writes(tmp_path: Path) -> None:
+    db_path = tmp_path / "ha_ml_data_layer.db"
+    writer = sqlite3.connect(db_path)
+    writer.execute("PRAGMA journal_mode = WAL")
+    writer.execute("CREATE TABLE snapshot (feature_name TEXT, feature_value TEXT)")
+    writer.commit()
+    (tmp_path / "unrelated.txt").write_text("x")
+
+    async def _run() -> int:
+        loop = asyncio.get_running_loop()
+        fired: list[None] = []
+        watcher = SnapshotFileWatcher.start(
+            loop=loop,
+            db_path=str(db_path),
+            callback=lambda: fired.append(None),
+            debounce_seconds=0.05,
+        )
+        assert watcher is not None
+        try:
+            (tmp_path / "unrelated.txt").write_text("y")
+            await asyncio.sleep(0.15)
+            assert fired == []
+
+            for index in range(5):
+                writer.execute(
+                    "INSERT INTO snapshot(feature_name, feature_value) VALUES ('a', ?)",
+                    (str(index),),
+                )
+                writer.commit()
+            await asyncio.sleep(0.3)
+            return len(fired)
+        finally:
+            watcher.close()
+
+    try:
+        assert asyncio.run(_run()) == 1
+    finally:
+        writer.close()
+
+
+def test_snapshot_watcher_returns_none_for_missing_directory(tmp_path: Path) -> None:
+    async def _run() -> SnapshotFileWatcher | None:
+        return SnapshotFileWatcher.start(
+            loop=asyncio.get_running_loop(),
+            db_path=str(tmp_path / "missing" / "ha_ml_data_layer.db"),
+            callback=lambda: None,
+            debounce_seconds=0.05,
+        )
+
+    assert asyncio.run(_run()) is None
@@ -0,0 +1,212 @@
+"""Unit tests for EntityTimingTracker."""
+
+from __future__ import annotations
+
+import math
+import time
+from unittest.mock import MagicMock
+
+import pytest
+
+from custom_components.mindml.feature_provider import FeaturePlan, RealtimeHistoryFeatureProvider
+from custom_components.mindml.incremental import build_incremental_scorer
+from custom_components.mindml.lightgbm_inference import (
+    INFERENCE_BACKEND_NATIVE,
+    LightGBMModelSpec,
+    run_lightgbm_inference,
+)
+from custom_components.mindml.state_timing import EntityTimingTracker
+
+MOTION = "binary_sensor.bedroom_motion"
+DOOR = "binary_sensor.front_door"
+
+
+def test_only_timing_feature_names_are_tracked() -> None:
+    tracker = EntityTimingTracker()
+    new_entities = tracker.add_features(
+        [
+            "event_count_1h",
+            MOTION,
+            f"{MOTION}__seconds_since_on",
+            f"{MOTION}__activity_15m",
+            f"{DOOR}__minutes_on_1h",
+            f"{DOOR}__minutes_on_1h",
+        ]
+    )
+
+    assert new_entities == [MOTION, DOOR]
+    assert tracker.feature_names == (
+        f"{MOTION}__seconds_since_on",
+        f"{MOTION}__activity_15m",
+        f"{DOOR}__minutes_on_1h",
+    )
+    assert tracker.add_features([f"{MOTION}__seconds_since_change"]) == []
+
+
+def test_seconds_since_state_and_change() -> None:
+    tracker = EntityTimingTracker(
+        [f"{MOTION}__seconds_since_on", f"{MOTION}__seconds_since_change"]
+    )
+    now = time.time()
+    features = tracker.compute_features([])
+    assert math.isnan(features[f"{MOTION}__seconds_since_on"])
+    assert math.isnan(features[f"{MOTION}__seconds_since_change"])
+
+    tracker.seed(MOTION, "off", now - 600)
+    features = tracker.compute_features([])
+    assert math.isnan(features[f"{MOTION}__seconds_since_on"])
+    assert features[f"{MOTION}__seconds_since_change"] == pytest.approx(600, abs=1)
+
+    tracker.record_state(MOTION, "on", now - 120)
+    tracker.record_state(MOTION, "on", now - 60)  # attribute-only update
+    tracker.record_state(MOTION, "off", now - 30)
+    features = tracker.compute_features([])
+    assert features[f"{MOTION}__seconds_since_on"] == pytest.approx(120, abs=1)
+    assert features[f"{MOTION}__seconds_since_change"] == pytest.approx(30, abs=1)
+
+
+def test_minutes_in_state_over_window_clips_intervals() -> None:
+    tracker = EntityTimingTracker([f"{DOOR}__minutes_on_1h", f"{DOOR}__minutes_on_15m"])
+    now = time.time()
+    tracker.seed(DOOR, "on", now - 7200)
+    # Open for the first 30 minutes of the hour, then closed, then open again.
+    tracker.record_state(DOOR, "off", now - 1800)
+    tracker.record_state(DOOR, "on", now - 300)
+
+    features = tracker.compute_features([])
+
+    assert features[f"{DOOR}__minutes_on_1h"] == pytest.approx(35, abs=0.05)
+    assert features[f"{DOOR}__minutes_on_15m"] == pytest.approx(5, abs=0.05)
+
+
+def test_minutes_in_state_drops_intervals_that_left_the_window() -> None:
+    tracker = EntityTimingTracker([f"{DOOR}__minutes_open_15m"])
+    now = time.time()
+    for offset in range(0, 3600, 120):
+        tracker.record_state(DOOR, "open", now - 3600 + offset)
+        tracker.record_state(DOOR, "closed", now - 3600 + offset + 60)
+
+    features = tracker.compute_features([])
+
+    duration = tracker._entities[DOOR].durations[0]
+    assert len(duration.intervals) <= 8
+    assert features[f"{DOOR}__minutes_open_15m"] == pytest.approx(7, abs=0.05)
+
+
+def test_activity_decays_with_half_life() -> None:
+    tracker = EntityTimingTracker([f"{MOTION}__activity_10m"])
+    now = time.time()
+    tracker.seed(MOTION, "off", now - 3600)
+    assert tracker.compute_features([])[f"{MOTION}__activity_10m"] == 0.0
+
+    tracker.record_state(MOTION, "on", now - 1200)
+    tracker.record_state(MOTION, "off", now - 600)
+
+    # One change two half-lives ago plus one change one half-life ago.
+    assert tracker.compute_features([])[f"{MOTION}__activity_10m"] == pytest.approx(
+        0.25 + 0.5, abs=0.01
+    )
+
+
+# One split on seconds since the door opened: up to a minute goes left, and
+# NaN (never opened) follows the missing-value direction, right.
+_DOOR_MODEL_STR = f"""tree
+version=v4
+num_class=1
+num_tree_per_iteration=1
+label_index=0
+max_feature_idx=0
+objective=binary sigmoid:1
+feature_names={DOOR}__seconds_since_on
+feature_infos=[0:3600]
+tree_sizes=0
+
+Tree=0
+num_leaves=2
+num_cat=0
+split_feature=0
+split_gain=1
+threshold=60
+decision_type=8
+left_child=-1
+right_child=-2
+leaf_value=2 -2
+leaf_weight=1 1
+leaf_count=50 50
+internal_value=0
+internal_weight=0
+internal_count=100
+is_linear=0
+shrinkage=1
+
+
+end of trees
+"""
+
+
+@pytest.mark.parametrize("incremental", [False, True])
+def test_unseen_state_is_scored_as_missing_not_zero(incremental: bool) -> None:
+    feature_name = f"{DOOR}__seconds_since_on"
+    tracker = EntityTimingTracker([feature_name])
+    tracker.seed(DOOR, "off", time.time() - 600)
+    hass = MagicMock()
+    hass.states.get.return_value = None
+    plan = FeaturePlan([feature_name])
+    provider = RealtimeHistoryFeatureProvider(
+        hass=hass,
+        required_features=[feature_name],
+        feature_types={},
+        state_mappings={},
+        history_feature_loader=tracker.compute_features,
+        feature_plan=plan,
+    )
+
+    vector = provider.load()
+    assert math.isnan(vector.ordered_row[0])
+    assert vector.missing_features == []
+
+    tree_model = LightGBMModelSpec(
+        feature_names=[feature_name], model_payload={"booster_model_str": _DOOR_MODEL_STR}
+    )
+    result = run_lightgbm_inference(
+        feature_values=vector.feature_values,
+        missing_features=vector.missing_features,
+        model=tree_model,
+        threshold=50.0,
+        backend=INFERENCE_BACKEND_NATIVE,
+        compute_contributions=not incremental,
+        incremental_scorer=build_incremental_scorer(tree_model) if incremental else None,
+        ordered_row=vector.ordered_row,
+    )
+    assert result.available is True
+    assert result.linear_score == pytest.approx(-2.0)
+
+    linear_model = LightGBMModelSpec(
+        feature_names=[feature_name], model_payload={"intercept": 0.0, "weights": [0.01]}
+    )
+    scorer = build_incremental_scorer(linear_model) if incremental else None
+    result = run_lightgbm_inference(
+        feature_values=vector.feature_values,
+        missing_features=vector.missing_features,
+        model=linear_model,
+        threshold=50.0,
+        incremental_scorer=scorer,
+        ordered_row=vector.ordered_row,
+    )
+    assert result.available is False
+    assert result.unavailable_reason == "missing_or_unmapped_features"
+
+    # Once the door opens, the linear score recovers from the NaN.
+    tracker.record_state(DOOR, "on", time.time() - 30)
+    vector = provider.load({feature_name})
+    result = run_lightgbm_inference(
+        feature_values=vector.feature_values,
+        missing_features=vector.missing_features,
+        model=linear_model,
+        threshold=50.0,
+        incremental_scorer=scorer,
+        changed_features={feature_name},
+        ordered_row=vector.ordered_row,
+    )
+    assert result.available is True
+    assert result.linear_score == pytest.approx(0.3, abs=0.02)
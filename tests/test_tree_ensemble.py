@@ -0,0 +1,211 @@
+from __future__ import annotations
+
+import math
+
+import pytest
+
+from custom_components.mindml.lightgbm_inference import (
+    INFERENCE_BACKEND_NATIVE,
+    LightGBMModelSpec,
+    run_lightgbm_inference,
+)
+from custom_components.mindml.tree_ensemble import OutputTransform, TreeEnsemble
+
+# Two numerical splits on feature 0 (NaN goes left), one categorical split on
+# feature 1 (categories 1 and 3 go left) and a constant single-leaf tree.
+_MODEL_STR = """tree
+version=v4
+num_class=1
+num_tree_per_iteration=1
+label_index=0
+max_feature_idx=1
+objective=binary sigmoid:1
+feature_names=a b
+feature_infos=[-1:1] 0:1:2:3
+tree_sizes=0 0 0
+
+Tree=0
+num_leaves=3
+num_cat=0
+split_feature=0 0
+split_gain=1 1
+threshold=0.5 -0.5
+decision_type=10 2
+left_child=1 -1
+right_child=-3 -2
+leaf_value=-1 0.25 2
+leaf_weight=1 1 1
+leaf_count=20 30 50
+internal_value=0 0
+internal_weight=0 0
+internal_count=100 50
+is_linear=0
+shrinkage=1
+
+
+Tree=1
+num_leaves=2
+num_cat=1
+split_feature=1
+split_gain=1
+threshold=0
+decision_type=1
+left_child=-1
+right_child=-2
+leaf_value=0.5 -0.5
+leaf_weight=1 1
+leaf_count=40 60
+internal_value=0
+internal_weight=0
+internal_count=100
+cat_boundaries=0 1
+cat_threshold=10
+is_linear=0
+shrinkage=0.1
+
+
+Tree=2
+num_leaves=1
+num_cat=0
+split_feature=
+split_gain=
+threshold=
+decision_type=
+left_child=
+right_child=
+leaf_value=0.125
+leaf_weight=
+leaf_count=
+internal_value=
+internal_weight=
+internal_count=
+is_linear=0
+shrinkage=1
+
+
+end of trees
+"""
+
+
+def test_tree_ensemble_parses_flat_node_tables() -> None:
+    ensemble = TreeEnsemble.from_model_str(model_str=_MODEL_STR)
+
+    assert ensemble.num_features == 2
+    assert ensemble.num_trees == 3
+    assert ensemble.transform.objective == "binary"
+
+
+def test_tree_ensemble_routes_numerical_and_categorical_splits() -> None:
+    ensemble = TreeEnsemble.from_model_str(model_str=_MODEL_STR)
+
+    assert ensemble.predict_raw_row([-1.0, 1.0]) == -1.0 + 0.5 + 0.125
+    assert ensemble.predict_raw_row([0.0, 2.0]) == 0.25 - 0.5 + 0.125
+    assert ensemble.predict_raw_row([0.9, 3.0]) == 2.0 + 0.5 + 0.125
+
+
+def test_tree_ensemble_follows_default_direction_for_missing_values() -> None:
+    ensemble = TreeEnsemble.from_model_str(model_str=_MODEL_STR)
+
+    # Root defaults left on NaN; the child has no missing handling so NaN -> 0.0.
+    assert ensemble.predict_raw_row([math.nan, math.nan]) == 0.25 - 0.5 + 0.125
+
+
+def test_tree_ensemble_contributions_sum_to_raw_score() -> None:
+    ensemble = TreeEnsemble.from_model_str(model_str=_MODEL_STR)
+    row = [0.0, 3.0]
+
+    contributions = ensemble.predict_contrib_row(row)
+
+    assert len(contributions) == 3
+    assert math.isclose(sum(contributions), ensemble.predict_raw_row(row))
+
+
+def test_output_transform_reads_objective_from_model_header() -> None:
+    transform = OutputTransform.from_model_str(
+        "tree\nobjective=binary sigmoid:2\naverage_output\ntree_sizes=1 1 1 1\n\nTree=0\n"
+    )
+
+    assert transform == OutputTransform(objective="binary", sigmoid=2.0, average_over=4)
+    assert math.isclose(transform(4.0), 1.0 / (1.0 + math.exp(-2.0)))
+    assert OutputTransform.from_model_str("serialized-booster") == OutputTransform()
+    assert OutputTransform(objective="regression")(3.5) == 3.5
+
+
+def test_tree_ensemble_rejects_non_model_text() -> None:
+    with pytest.raises(ValueError):
+        TreeEnsemble.from_model_str(model_str="serialized-booster")
+
+
+def test_native_backend_scores_booster_payload_without_lightgbm() -> None:
+    result = run_lightgbm_inference(
+        feature_values={"a": 0.9, "b": 3.0},
+        missing_features=[],
+        model=LightGBMModelSpec(
+            feature_names=["a", "b"],
+            model_payload={"booster_model_str": _MODEL_STR},
+        ),
+        threshold=50.0,
+        backend=INFERENCE_BACKEND_NATIVE,
+    )
+
+    assert result.available is True
+    assert math.isclose(result.linear_score, 2.625)
+    assert math.isclose(result.raw_probability, 1.0 / (1.0 + math.exp(-2.625)))
+    assert set(result.feature_contributions) == {"a", "b"}
+    assert result.decision == "positive"
+
+
+def test_native_backend_matches_lightgbm_booster() -> None:
+    lightgbm = pytest.importorskip("lightgbm")
+    np = pytest.importorskip("numpy")
+
+    rng = np.random.default_rng(7)
+    features = rng.normal(size=(1000, 4))
+    features[rng.random(features.shape) < 0.1] = np.nan
+    features[:, 3] = rng.integers(0, 8, size=1000)
+    labels = (np.nan_to_num(features[:, 0]) + (features[:, 3] % 2) > 0.5).astype(int)
+    booster = lightgbm.train(
+        {"objective": "binary", "num_leaves": 15, "min_data_in_leaf": 5, "verbose": -1},
+        lightgbm.Dataset(features, labels, categorical_feature=[3]),
+        num_boost_round=25,
+    )
+    ensemble = TreeEnsemble.from_model_str(model_str=booster.model_to_string())
+
+    rows = features[:200]
+    expected_raw = booster.predict(rows, raw_score=True)
+    expected_probability = booster.predict(rows)
+    expected_contrib = booster.predict(rows, pred_contrib=True)
+    for index, row in enumerate(rows.tolist()):
+        raw = ensemble.predict_raw_row(row)
+        assert math.isclose(raw, expected_raw[index], abs_tol=1e-12)
+        assert math.isclose(ensemble.transform(raw), expected_probability[index], abs_tol=1e-12)
+        for actual, expected in zip(ensemble.predict_contrib_row(row), expected_contrib[index]):
+            assert math.isclose(actual, expected, abs_tol=1e-9)
+
+
+def test_single_pass_inference_matches_lightgbm_probability() -> None:
+    lightgbm = pytest.importorskip("lightgbm")
+    np = pytest.importorskip("numpy")
+
+    rng = np.random.default_rng(3)
+    features = rng.normal(size=(500, 3))
+    labels = (features[:, 0] - features[:, 2] > 0).astype(int)
+    booster = lightgbm.train(
+        {"objective": "binary", "num_leaves": 7, "verbose": -1},
+        lightgbm.Dataset(features, labels),
+        num_boost_round=10,
+    )
+    row = features[0].tolist()
+
+    result = run_lightgbm_inference(
+        feature_values=dict(zip(["a", "b", "c"], row)),
+        missing_features=[],
+        model=LightGBMModelSpec(
+            feature_names=["a", "b", "c"],
+            model_payload={"booster_model_str": booster.model_to_string()},
+        ),
+        threshold=50.0,
+    )
+
+    assert math.isclose(result.linear_score, booster.predict([row], raw_score=True)[0], abs_tol=1e-12)
+    assert math.isclose(result.raw_probability, booster.predict([row])[0], abs_tol=1e-12)